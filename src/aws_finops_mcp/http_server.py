@@ -8,6 +8,7 @@ This server is compatible with Amazon Bedrock AgentCore Runtime requirements:
 - Supports OAuth authentication (401 with WWW-Authenticate header)
 """
 
+import inspect
 import json
 import logging
 import os
@@ -15,8 +16,10 @@ from http.server import BaseHTTPRequestHandler, HTTPServer
 from typing import Any
 from collections import defaultdict
 
+from . import server
 from .server import mcp
 from .session import get_aws_session
+from .utils.serialization import dumps_json
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -101,7 +104,7 @@ class MCPHTTPHandler(BaseHTTPRequestHandler):
                 self.send_response(200)
                 self.send_header("Content-Type", "application/json")
                 self.end_headers()
-                self.wfile.write(json.dumps(result, indent=2).encode())
+                self.wfile.write(dumps_json(result, indent=True))
 
             except json.JSONDecodeError:
                 self.send_error_response(400, "Invalid JSON")
@@ -246,9 +249,6 @@ class MCPHTTPHandler(BaseHTTPRequestHandler):
 
     def _execute_tool(self, tool_name: str, arguments: dict[str, Any], session_id: str) -> dict[str, Any]:
         """Execute MCP tool with session support."""
-        # Import server module to get tool functions
-        from . import server
-
         # Get the tool function
         if not hasattr(server, tool_name):
             raise ValueError(f"Tool '{tool_name}' not found")
@@ -275,9 +275,6 @@ class MCPHTTPHandler(BaseHTTPRequestHandler):
 
     def _get_available_tools(self) -> list[str]:
         """Get list of available tool names."""
-        from . import server
-        import inspect
-
         tools = []
         for name, obj in inspect.getmembers(server):
             if inspect.isfunction(obj) and not name.startswith("_") and name != "create_session":
@@ -287,9 +284,6 @@ class MCPHTTPHandler(BaseHTTPRequestHandler):
 
     def _get_available_tools_detailed(self) -> list[dict]:
         """Get detailed list of available tools with schemas (for tools/list)."""
-        from . import server
-        import inspect
-
         tools = []
         for name, obj in inspect.getmembers(server):
             if inspect.isfunction(obj) and not name.startswith("_") and name != "create_session":
@@ -665,6 +665,7 @@ def find_target_groups_with_high_response_time(
 def get_cost_by_region(
     start_date: str | None = None,
     end_date: str | None = None,
+    top_k: int | None = None,
     profile_name: str | None = None,
     role_arn: str | None = None,
     access_key: str | None = None,
@@ -676,6 +677,7 @@ def get_cost_by_region(
     Args:
         start_date: Start date in YYYY-MM-DD format (default: first day of last month)
         end_date: End date in YYYY-MM-DD format (default: first day of current month)
+        top_k: Only return the top_k most expensive entries (optional)
         profile_name: AWS profile name (optional)
         role_arn: IAM role ARN to assume (optional)
         access_key: AWS access key ID (optional)
@@ -686,13 +688,14 @@ def get_cost_by_region(
         Dictionary with cost breakdown by region
     """
     session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token, "us-east-1")
-    return cost_explorer.get_cost_by_region(session, "us-east-1", start_date, end_date)
+    return cost_explorer.get_cost_by_region(session, "us-east-1", start_date, end_date, top_k)
 
 
 @register_tool("get_cost_by_service")
 def get_cost_by_service(
     start_date: str | None = None,
     end_date: str | None = None,
+    top_k: int | None = None,
     profile_name: str | None = None,
     role_arn: str | None = None,
     access_key: str | None = None,
@@ -704,6 +707,7 @@ def get_cost_by_service(
     Args:
         start_date: Start date in YYYY-MM-DD format (default: first day of last month)
         end_date: End date in YYYY-MM-DD format (default: first day of current month)
+        top_k: Only return the top_k most expensive entries (optional)
         profile_name: AWS profile name (optional)
         role_arn: IAM role ARN to assume (optional)
         access_key: AWS access key ID (optional)
@@ -714,13 +718,14 @@ def get_cost_by_service(
         Dictionary with cost breakdown by service
     """
     session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token, "us-east-1")
-    return cost_explorer.get_cost_by_service(session, "us-east-1", start_date, end_date)
+    return cost_explorer.get_cost_by_service(session, "us-east-1", start_date, end_date, top_k)
 
 
 @register_tool("get_cost_by_region_and_service")
 def get_cost_by_region_and_service(
     start_date: str | None = None,
     end_date: str | None = None,
+    top_k: int | None = None,
     profile_name: str | None = None,
     role_arn: str | None = None,
     access_key: str | None = None,
@@ -732,6 +737,7 @@ def get_cost_by_region_and_service(
     Args:
         start_date: Start date in YYYY-MM-DD format (default: first day of last month)
         end_date: End date in YYYY-MM-DD format (default: first day of current month)
+        top_k: Only return the top_k most expensive entries (optional)
         profile_name: AWS profile name (optional)
         role_arn: IAM role ARN to assume (optional)
         access_key: AWS access key ID (optional)
@@ -742,7 +748,37 @@ def get_cost_by_region_and_service(
         Dictionary with cost breakdown by region and service
     """
     session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token, "us-east-1")
-    return cost_explorer.get_cost_by_region_and_service(session, "us-east-1", start_date, end_date)
+    return cost_explorer.get_cost_by_region_and_service(session, "us-east-1", start_date, end_date, top_k)
+
+
+@register_tool("get_cost_breakdown")
+def get_cost_breakdown(
+    start_date: str | None = None,
+    end_date: str | None = None,
+    top_k: int | None = None,
+    profile_name: str | None = None,
+    role_arn: str | None = None,
+    access_key: str | None = None,
+    secret_access_key: str | None = None,
+    session_token: str | None = None,
+) -> list[dict[str, Any]]:
+    """Get cost by region, by service and by region and service from a single query.
+    
+    Args:
+        start_date: Start date in YYYY-MM-DD format (default: first day of last month)
+        end_date: End date in YYYY-MM-DD format (default: first day of current month)
+        top_k: Only return the top_k most expensive entries per breakdown (optional)
+        profile_name: AWS profile name (optional)
+        role_arn: IAM role ARN to assume (optional)
+        access_key: AWS access key ID (optional)
+        secret_access_key: AWS secret access key (optional)
+        session_token: AWS session token for temporary credentials (optional)
+    
+    Returns:
+        List with cost breakdowns by region, by service and by region and service
+    """
+    session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token, "us-east-1")
+    return cost_explorer.get_cost_breakdown(session, "us-east-1", start_date, end_date, top_k)
 
 
 @register_tool("get_daily_cost_trend")
@@ -1006,6 +1042,21 @@ def find_unused_sqs_queues(
     return messaging.find_unused_sqs_queues(session, region_name, period)
 
 
+@register_tool("find_unused_sqs_queues_all_regions")
+def find_unused_sqs_queues_all_regions(
+    regions: list[str] | None = None,
+    period: int = 90,
+    profile_name: str | None = None,
+    role_arn: str | None = None,
+    access_key: str | None = None,
+    secret_access_key: str | None = None,
+    session_token: str | None = None,
+) -> dict[str, Any]:
+    """Find SQS queues with no messages sent or received in several regions at once (default: all enabled regions)."""
+    session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token)
+    return messaging.find_unused_sqs_queues_all_regions(session, regions, period=period)
+
+
 @register_tool("find_unused_sns_topics")
 def find_unused_sns_topics(
     region_name: str = "us-east-1",
@@ -1021,6 +1072,21 @@ def find_unused_sns_topics(
     return messaging.find_unused_sns_topics(session, region_name, period)
 
 
+@register_tool("find_unused_sns_topics_all_regions")
+def find_unused_sns_topics_all_regions(
+    regions: list[str] | None = None,
+    period: int = 90,
+    profile_name: str | None = None,
+    role_arn: str | None = None,
+    access_key: str | None = None,
+    secret_access_key: str | None = None,
+    session_token: str | None = None,
+) -> dict[str, Any]:
+    """Find SNS topics with no subscriptions or no messages published in several regions at once (default: all enabled regions)."""
+    session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token)
+    return messaging.find_unused_sns_topics_all_regions(session, regions, period=period)
+
+
 @register_tool("find_unused_eventbridge_rules")
 def find_unused_eventbridge_rules(
     region_name: str = "us-east-1",
@@ -1036,6 +1102,21 @@ def find_unused_eventbridge_rules(
     return messaging.find_unused_eventbridge_rules(session, region_name, period)
 
 
+@register_tool("find_unused_eventbridge_rules_all_regions")
+def find_unused_eventbridge_rules_all_regions(
+    regions: list[str] | None = None,
+    period: int = 90,
+    profile_name: str | None = None,
+    role_arn: str | None = None,
+    access_key: str | None = None,
+    secret_access_key: str | None = None,
+    session_token: str | None = None,
+) -> dict[str, Any]:
+    """Find EventBridge rules with no invocations in several regions at once (default: all enabled regions)."""
+    session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token)
+    return messaging.find_unused_eventbridge_rules_all_regions(session, regions, period=period)
+
+
 # ============================================================================
 # DATABASE TOOLS
 # ============================================================================
@@ -1055,6 +1136,21 @@ def find_unused_dynamodb_tables(
     return database.find_unused_dynamodb_tables(session, region_name, period)
 
 
+@register_tool("find_unused_dynamodb_tables_all_regions")
+def find_unused_dynamodb_tables_all_regions(
+    regions: list[str] | None = None,
+    period: int = 90,
+    profile_name: str | None = None,
+    role_arn: str | None = None,
+    access_key: str | None = None,
+    secret_access_key: str | None = None,
+    session_token: str | None = None,
+) -> dict[str, Any]:
+    """Find DynamoDB tables with no read/write activity in several regions at once (default: all enabled regions)."""
+    session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token)
+    return database.find_unused_dynamodb_tables_all_regions(session, regions, period=period)
+
+
 @register_tool("find_underutilized_dynamodb_tables")
 def find_underutilized_dynamodb_tables(
     region_name: str = "us-east-1",
@@ -1070,6 +1166,21 @@ def find_underutilized_dynamodb_tables(
     return database.find_underutilized_dynamodb_tables(session, region_name, period)
 
 
+@register_tool("find_underutilized_dynamodb_tables_all_regions")
+def find_underutilized_dynamodb_tables_all_regions(
+    regions: list[str] | None = None,
+    period: int = 30,
+    profile_name: str | None = None,
+    role_arn: str | None = None,
+    access_key: str | None = None,
+    secret_access_key: str | None = None,
+    session_token: str | None = None,
+) -> dict[str, Any]:
+    """Find DynamoDB tables with low capacity utilization in several regions at once (default: all enabled regions)."""
+    session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token)
+    return database.find_underutilized_dynamodb_tables_all_regions(session, regions, period=period)
+
+
 # ============================================================================
 # MONITORING TOOLS
 # ============================================================================
@@ -1213,6 +1324,7 @@ def find_underutilized_lambda_functions(
 @register_tool("get_savings_plans_recommendations")
 def get_savings_plans_recommendations(
     region_name: str = "us-east-1",
+    bust_cache: bool = False,
     profile_name: str | None = None,
     role_arn: str | None = None,
     access_key: str | None = None,
@@ -1221,13 +1333,14 @@ def get_savings_plans_recommendations(
 ) -> dict[str, Any]:
     """Get Savings Plans recommendations from AWS Cost Explorer."""
     session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token, region_name)
-    return cost_savings.get_savings_plans_recommendations(session, region_name)
+    return cost_savings.get_savings_plans_recommendations(session, region_name, bust_cache=bust_cache)
 
 
 @register_tool("get_reserved_instance_recommendations")
 def get_reserved_instance_recommendations(
     region_name: str = "us-east-1",
     service: str = "EC2",
+    bust_cache: bool = False,
     profile_name: str | None = None,
     role_arn: str | None = None,
     access_key: str | None = None,
@@ -1236,12 +1349,13 @@ def get_reserved_instance_recommendations(
 ) -> dict[str, Any]:
     """Get Reserved Instance purchase recommendations from AWS Cost Explorer."""
     session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token, region_name)
-    return cost_savings.get_reserved_instance_recommendations(session, region_name, service)
+    return cost_savings.get_reserved_instance_recommendations(session, region_name, service, bust_cache=bust_cache)
 
 
 @register_tool("analyze_reserved_instance_utilization")
 def analyze_reserved_instance_utilization(
     region_name: str = "us-east-1",
+    bust_cache: bool = False,
     profile_name: str | None = None,
     role_arn: str | None = None,
     access_key: str | None = None,
@@ -1250,7 +1364,7 @@ def analyze_reserved_instance_utilization(
 ) -> dict[str, Any]:
     """Analyze Reserved Instance utilization and coverage."""
     session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token, region_name)
-    return cost_savings.analyze_reserved_instance_utilization(session, region_name)
+    return cost_savings.analyze_reserved_instance_utilization(session, region_name, bust_cache=bust_cache)
 
 
 # ============================================================================
@@ -1271,6 +1385,20 @@ def get_ebs_volume_type_recommendations(
     return cost_storage.get_ebs_volume_type_recommendations(session, region_name)
 
 
+@register_tool("get_ebs_volume_type_recommendations_all_regions")
+def get_ebs_volume_type_recommendations_all_regions(
+    regions: list[str] | None = None,
+    profile_name: str | None = None,
+    role_arn: str | None = None,
+    access_key: str | None = None,
+    secret_access_key: str | None = None,
+    session_token: str | None = None,
+) -> dict[str, Any]:
+    """Get recommendations for optimizing EBS volume types based on usage patterns in several regions at once (default: all enabled regions)."""
+    session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token)
+    return cost_storage.get_ebs_volume_type_recommendations_all_regions(session, regions)
+
+
 @register_tool("get_snapshot_lifecycle_recommendations")
 def get_snapshot_lifecycle_recommendations(
     region_name: str = "us-east-1",
@@ -1286,6 +1414,21 @@ def get_snapshot_lifecycle_recommendations(
     return cost_storage.get_snapshot_lifecycle_recommendations(session, region_name, retention_days)
 
 
+@register_tool("get_snapshot_lifecycle_recommendations_all_regions")
+def get_snapshot_lifecycle_recommendations_all_regions(
+    regions: list[str] | None = None,
+    retention_days: int = 30,
+    profile_name: str | None = None,
+    role_arn: str | None = None,
+    access_key: str | None = None,
+    secret_access_key: str | None = None,
+    session_token: str | None = None,
+) -> dict[str, Any]:
+    """Get recommendations for snapshot lifecycle management and cleanup in several regions at once (default: all enabled regions)."""
+    session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token)
+    return cost_storage.get_snapshot_lifecycle_recommendations_all_regions(session, regions, retention_days=retention_days)
+
+
 # ============================================================================
 # COST NETWORK TOOLS
 # ============================================================================
@@ -1293,6 +1436,7 @@ def get_snapshot_lifecycle_recommendations(
 @register_tool("analyze_data_transfer_costs")
 def analyze_data_transfer_costs(
     region_name: str = "us-east-1",
+    bust_cache: bool = False,
     profile_name: str | None = None,
     role_arn: str | None = None,
     access_key: str | None = None,
@@ -1301,7 +1445,7 @@ def analyze_data_transfer_costs(
 ) -> dict[str, Any]:
     """Analyze data transfer costs using AWS Cost Explorer."""
     session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token, region_name)
-    return cost_network.analyze_data_transfer_costs(session, region_name)
+    return cost_network.analyze_data_transfer_costs(session, region_name, bust_cache=bust_cache)
 
 
 @register_tool("get_nat_gateway_optimization_recommendations")
@@ -1318,6 +1462,20 @@ def get_nat_gateway_optimization_recommendations(
     return cost_network.get_nat_gateway_optimization_recommendations(session, region_name)
 
 
+@register_tool("get_nat_gateway_optimization_recommendations_all_regions")
+def get_nat_gateway_optimization_recommendations_all_regions(
+    regions: list[str] | None = None,
+    profile_name: str | None = None,
+    role_arn: str | None = None,
+    access_key: str | None = None,
+    secret_access_key: str | None = None,
+    session_token: str | None = None,
+) -> dict[str, Any]:
+    """Get recommendations for optimizing NAT Gateway costs in several regions at once (default: all enabled regions)."""
+    session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token)
+    return cost_network.get_nat_gateway_optimization_recommendations_all_regions(session, regions)
+
+
 # ============================================================================
 # UPGRADE DATABASE TOOLS
 # ============================================================================
@@ -1600,6 +1758,21 @@ def find_untagged_resources(
     return governance.find_untagged_resources(session, region_name, required_tags)
 
 
+@register_tool("find_untagged_resources_all_regions")
+def find_untagged_resources_all_regions(
+    regions: list[str] | None = None,
+    required_tags: list[str] | None = None,
+    profile_name: str | None = None,
+    role_arn: str | None = None,
+    access_key: str | None = None,
+    secret_access_key: str | None = None,
+    session_token: str | None = None,
+) -> dict[str, Any]:
+    """Find AWS resources missing required tags in several regions at once (default: all enabled regions)."""
+    session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token)
+    return governance.find_untagged_resources_all_regions(session, regions, required_tags=required_tags)
+
+
 @register_tool("analyze_tag_compliance")
 def analyze_tag_compliance(
     region_name: str = "us-east-1",
@@ -1615,6 +1788,21 @@ def analyze_tag_compliance(
     return governance.analyze_tag_compliance(session, region_name, required_tags)
 
 
+@register_tool("analyze_tag_compliance_all_regions")
+def analyze_tag_compliance_all_regions(
+    regions: list[str] | None = None,
+    required_tags: list[str] | None = None,
+    profile_name: str | None = None,
+    role_arn: str | None = None,
+    access_key: str | None = None,
+    secret_access_key: str | None = None,
+    session_token: str | None = None,
+) -> dict[str, Any]:
+    """Analyze tag compliance across AWS resources in several regions at once (default: all enabled regions)."""
+    session = create_session(profile_name, role_arn, access_key, secret_access_key, session_token)
+    return governance.analyze_tag_compliance_all_regions(session, regions, required_tags=required_tags)
+
+
 @register_tool("generate_cost_allocation_report")
 def generate_cost_allocation_report(
     region_name: str = "us-east-1",
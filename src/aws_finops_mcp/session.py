@@ -10,10 +10,20 @@ Provides flexible AWS authentication methods including:
 
 import boto3
 import logging
+import threading
 from typing import Any
 
+from .utils.aws_clients import DEFAULT_CLIENT_CONFIG
+
 logger = logging.getLogger(__name__)
 
+# Profile and default-chain sessions are reused across tool calls while their
+# credentials stay the same, so the clients cached on them (see
+# utils.aws_clients) are not rebuilt for every call. Credentials are resolved
+# again on each call, so rotated keys or a new account get a new session.
+_shared_sessions: dict[tuple[str | None, str], tuple[str, boto3.Session]] = {}
+_sessions_lock = threading.Lock()
+
 
 def get_aws_session(
     profile_name: str | None = None,
@@ -42,8 +52,7 @@ def get_aws_session(
     """
     try:
         if profile_name:
-            logger.info("Creating AWS session with profile authentication")
-            return boto3.Session(profile_name=profile_name, region_name=region_name)
+            return _get_shared_session(profile_name, region_name)
 
         elif role_arn:
             logger.info("Creating AWS session with assumed role")
@@ -67,17 +76,43 @@ def get_aws_session(
             )
 
         else:
-            logger.info("Creating AWS session with default credentials")
-            return boto3.Session(region_name=region_name)
+            return _get_shared_session(None, region_name)
 
     except Exception as e:
         logger.error(f"Failed to create AWS session: {str(e)}")
         raise
 
 
+def _get_shared_session(profile_name: str | None, region_name: str) -> boto3.Session:
+    """Return the shared session for a profile (or the default chain).
+
+    A fresh session resolves the current credentials; the shared one is
+    kept only while it was built for the same access key.
+    """
+    if profile_name:
+        logger.info("Creating AWS session with profile authentication")
+        session = boto3.Session(profile_name=profile_name, region_name=region_name)
+    else:
+        logger.info("Creating AWS session with default credentials")
+        session = boto3.Session(region_name=region_name)
+
+    credentials = session.get_credentials()
+    if credentials is None:
+        return session
+    access_key = credentials.get_frozen_credentials().access_key
+
+    key = (profile_name, region_name)
+    with _sessions_lock:
+        shared = _shared_sessions.get(key)
+        if shared is not None and shared[0] == access_key:
+            return shared[1]
+        _shared_sessions[key] = (access_key, session)
+    return session
+
+
 def _create_assumed_role_session(role_arn: str, region: str) -> boto3.Session:
     """Create session using assumed role credentials."""
-    sts_client = boto3.client("sts", region_name=region)
+    sts_client = boto3.client("sts", region_name=region, config=DEFAULT_CLIENT_CONFIG)
 
     response = sts_client.assume_role(
         RoleArn=role_arn, RoleSessionName="AWSFinOpsMCPSession", DurationSeconds=3600
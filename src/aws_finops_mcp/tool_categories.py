@@ -33,14 +33,18 @@ TOOL_CATEGORIES = {
         "get_cost_by_region",
         "get_cost_by_service",
         "get_cost_by_region_and_service",
+        "get_cost_breakdown",
         "get_daily_cost_trend",
         "get_savings_plans_recommendations",
         "get_reserved_instance_recommendations",
         "analyze_reserved_instance_utilization",
         "get_ebs_volume_type_recommendations",
+        "get_ebs_volume_type_recommendations_all_regions",
         "get_snapshot_lifecycle_recommendations",
+        "get_snapshot_lifecycle_recommendations_all_regions",
         "analyze_data_transfer_costs",
         "get_nat_gateway_optimization_recommendations",
+        "get_nat_gateway_optimization_recommendations_all_regions",
     ],
     "application": [
         "find_target_groups_with_high_error_rate",
@@ -75,12 +79,17 @@ TOOL_CATEGORIES = {
     ],
     "messaging": [
         "find_unused_sqs_queues",
+        "find_unused_sqs_queues_all_regions",
         "find_unused_sns_topics",
+        "find_unused_sns_topics_all_regions",
         "find_unused_eventbridge_rules",
+        "find_unused_eventbridge_rules_all_regions",
     ],
     "database": [
         "find_unused_dynamodb_tables",
+        "find_unused_dynamodb_tables_all_regions",
         "find_underutilized_dynamodb_tables",
+        "find_underutilized_dynamodb_tables_all_regions",
     ],
     "monitoring": [
         "find_unused_cloudwatch_alarms",
@@ -103,7 +112,9 @@ TOOL_CATEGORIES = {
     ],
     "governance": [
         "find_untagged_resources",
+        "find_untagged_resources_all_regions",
         "analyze_tag_compliance",
+        "analyze_tag_compliance_all_regions",
         "generate_cost_allocation_report",
     ],
 }
@@ -33,14 +33,19 @@ from .containers import (
 # New messaging tools
 from .messaging import (
     find_unused_sqs_queues,
+    find_unused_sqs_queues_all_regions,
     find_unused_sns_topics,
+    find_unused_sns_topics_all_regions,
     find_unused_eventbridge_rules,
+    find_unused_eventbridge_rules_all_regions,
 )
 
 # New database tools
 from .database import (
     find_unused_dynamodb_tables,
+    find_unused_dynamodb_tables_all_regions,
     find_underutilized_dynamodb_tables,
+    find_underutilized_dynamodb_tables_all_regions,
 )
 
 # New monitoring tools
@@ -72,13 +77,16 @@ from .cost_savings import (
 # New cost storage tools
 from .cost_storage import (
     get_ebs_volume_type_recommendations,
+    get_ebs_volume_type_recommendations_all_regions,
     get_snapshot_lifecycle_recommendations,
+    get_snapshot_lifecycle_recommendations_all_regions,
 )
 
 # New cost network tools
 from .cost_network import (
     analyze_data_transfer_costs,
     get_nat_gateway_optimization_recommendations,
+    get_nat_gateway_optimization_recommendations_all_regions,
 )
 
 # New upgrade database tools
@@ -121,7 +129,9 @@ from .security import (
 # New governance tools
 from .governance import (
     find_untagged_resources,
+    find_untagged_resources_all_regions,
     analyze_tag_compliance,
+    analyze_tag_compliance_all_regions,
     generate_cost_allocation_report,
 )
 
@@ -185,11 +195,16 @@ __all__ = [
     "find_unused_launch_templates",
     # New messaging tools
     "find_unused_sqs_queues",
+    "find_unused_sqs_queues_all_regions",
     "find_unused_sns_topics",
+    "find_unused_sns_topics_all_regions",
     "find_unused_eventbridge_rules",
+    "find_unused_eventbridge_rules_all_regions",
     # New database tools
     "find_unused_dynamodb_tables",
+    "find_unused_dynamodb_tables_all_regions",
     "find_underutilized_dynamodb_tables",
+    "find_underutilized_dynamodb_tables_all_regions",
     # New monitoring tools
     "find_unused_cloudwatch_alarms",
     "find_orphaned_cloudwatch_dashboards",
@@ -206,10 +221,13 @@ __all__ = [
     "analyze_reserved_instance_utilization",
     # New cost storage tools
     "get_ebs_volume_type_recommendations",
+    "get_ebs_volume_type_recommendations_all_regions",
     "get_snapshot_lifecycle_recommendations",
+    "get_snapshot_lifecycle_recommendations_all_regions",
     # New cost network tools
     "analyze_data_transfer_costs",
     "get_nat_gateway_optimization_recommendations",
+    "get_nat_gateway_optimization_recommendations_all_regions",
     # New upgrade database tools
     "find_outdated_rds_engine_versions",
     "find_outdated_elasticache_engine_versions",
@@ -234,6 +252,8 @@ __all__ = [
     "find_overly_permissive_security_groups",
     # New governance tools
     "find_untagged_resources",
+    "find_untagged_resources_all_regions",
     "analyze_tag_compliance",
+    "analyze_tag_compliance_all_regions",
     "generate_cost_allocation_report",
 ]
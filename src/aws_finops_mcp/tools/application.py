@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+from ..utils.aws_clients import get_client
 from ..utils.helpers import fields_to_headers
 
 logger = logging.getLogger(__name__)
@@ -13,11 +14,11 @@ def find_target_groups_with_high_error_rate(
     session: Any, region_name: str, period: int, error_threshold: float = 5.0
 ) -> dict[str, Any]:
     """Find target groups with high error rates."""
-    elb_client = session.client("elbv2", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    elb_client = get_client(session, "elbv2", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     
     high_error_tgs = []
     response = elb_client.describe_target_groups()
@@ -109,11 +110,11 @@ def find_target_groups_with_high_response_time(
     session: Any, region_name: str, period: int, response_time_threshold: float = 1.0
 ) -> dict[str, Any]:
     """Find target groups with high response times."""
-    elb_client = session.client("elbv2", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    elb_client = get_client(session, "elbv2", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     
     high_response_tgs = []
     response = elb_client.describe_target_groups()
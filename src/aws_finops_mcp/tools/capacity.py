@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+from ..utils.aws_clients import get_client
 from ..utils.helpers import fields_to_headers, safe_float
 from ..utils.metrics import calculate_metrics, get_metric_statistics
 
@@ -14,11 +15,11 @@ def find_underutilized_ec2_instances(
     session: Any, region_name: str, period: int, max_results: int = 100
 ) -> dict[str, Any]:
     """Find EC2 instances with low CPU and memory utilization."""
-    ec2_client = session.client("ec2", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     
     # Get running instances
     response = ec2_client.describe_instances(
@@ -121,11 +122,11 @@ def find_overutilized_ec2_instances(
     session: Any, region_name: str, period: int, max_results: int = 100
 ) -> dict[str, Any]:
     """Find EC2 instances with high CPU or memory utilization."""
-    ec2_client = session.client("ec2", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     
     # Get running instances
     response = ec2_client.describe_instances(
@@ -225,11 +226,11 @@ def find_underutilized_rds_instances(
     session: Any, region_name: str, period: int, max_results: int = 100
 ) -> dict[str, Any]:
     """Find RDS instances with low CPU utilization."""
-    rds_client = session.client("rds", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    rds_client = get_client(session, "rds", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     
     # Get all RDS instances
     response = rds_client.describe_db_instances(MaxRecords=max_results)
@@ -292,11 +293,11 @@ def find_overutilized_rds_instances(
     session: Any, region_name: str, period: int, max_results: int = 100
 ) -> dict[str, Any]:
     """Find RDS instances with high CPU utilization."""
-    rds_client = session.client("rds", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    rds_client = get_client(session, "rds", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     
     # Get all RDS instances
     response = rds_client.describe_db_instances(MaxRecords=max_results)
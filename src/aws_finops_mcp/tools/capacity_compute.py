@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+from ..utils.aws_clients import get_client
 from ..utils.helpers import fields_to_headers
 
 logger = logging.getLogger(__name__)
@@ -22,11 +23,11 @@ def find_underutilized_lambda_functions(
     Returns:
         Dictionary with underutilized Lambda functions
     """
-    lambda_client = session.client("lambda", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    lambda_client = get_client(session, "lambda", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     output_data = []
     
     logger.info(f"Finding underutilized Lambda functions in {region_name}")
@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+from ..utils.aws_clients import get_client
 from ..utils.helpers import fields_to_headers
 
 logger = logging.getLogger(__name__)
@@ -22,20 +23,26 @@ def find_overutilized_dynamodb_tables(
     Returns:
         Dictionary with overutilized DynamoDB tables
     """
-    dynamodb_client = session.client("dynamodb", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    dynamodb_client = get_client(session, "dynamodb", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     output_data = []
     
     logger.info(f"Finding overutilized DynamoDB tables in {region_name}")
     
     try:
         # Get all tables
-        tables_response = dynamodb_client.list_tables()
+        table_names = [
+            table_name
+            for page in dynamodb_client.get_paginator("list_tables").paginate(
+                PaginationConfig={"PageSize": 100}
+            )
+            for table_name in page.get("TableNames", [])
+        ]
         
-        for table_name in tables_response.get("TableNames", []):
+        for table_name in table_names:
             try:
                 # Get table details
                 table_response = dynamodb_client.describe_table(TableName=table_name)
@@ -156,11 +163,11 @@ def find_underutilized_elasticache_clusters(
     Returns:
         Dictionary with underutilized ElastiCache clusters
     """
-    elasticache_client = session.client("elasticache", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    elasticache_client = get_client(session, "elasticache", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     output_data = []
     
     logger.info(f"Finding underutilized ElastiCache clusters in {region_name}")
@@ -263,11 +270,11 @@ def find_overutilized_elasticache_clusters(
     Returns:
         Dictionary with overutilized ElastiCache clusters
     """
-    elasticache_client = session.client("elasticache", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    elasticache_client = get_client(session, "elasticache", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     output_data = []
     
     logger.info(f"Finding overutilized ElastiCache clusters in {region_name}")
@@ -378,35 +385,51 @@ def find_underutilized_ecs_services(
     Returns:
         Dictionary with underutilized ECS services
     """
-    ecs_client = session.client("ecs", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    ecs_client = get_client(session, "ecs", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     output_data = []
     
     logger.info(f"Finding underutilized ECS services in {region_name}")
     
     try:
         # Get all clusters
-        clusters_response = ecs_client.list_clusters()
+        cluster_arns = [
+            cluster_arn
+            for page in ecs_client.get_paginator("list_clusters").paginate(
+                PaginationConfig={"PageSize": 100}
+            )
+            for cluster_arn in page.get("clusterArns", [])
+        ]
         
-        for cluster_arn in clusters_response.get("clusterArns", []):
+        for cluster_arn in cluster_arns:
             cluster_name = cluster_arn.split("/")[-1]
             
             # Get services in cluster
-            services_response = ecs_client.list_services(cluster=cluster_arn)
+            service_arns = [
+                service_arn
+                for page in ecs_client.get_paginator("list_services").paginate(
+                    cluster=cluster_arn, PaginationConfig={"PageSize": 100}
+                )
+                for service_arn in page.get("serviceArns", [])
+            ]
             
-            if not services_response.get("serviceArns"):
+            if not service_arns:
                 continue
             
-            # Describe services
-            services_details = ecs_client.describe_services(
-                cluster=cluster_arn,
-                services=services_response["serviceArns"]
-            )
+            # Describe services (DescribeServices accepts at most 10 per call)
+            services = [
+                service
+                for offset in range(0, len(service_arns), 10)
+                for service in ecs_client.describe_services(
+                    cluster=cluster_arn,
+                    services=service_arns[offset:offset + 10],
+                ).get("services", [])
+            ]
             
-            for service in services_details.get("services", []):
+            for service in services:
                 service_name = service["serviceName"]
                 
                 # Check CPU utilization
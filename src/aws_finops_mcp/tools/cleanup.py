@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+from ..utils.aws_clients import get_client
 from ..utils.helpers import fields_to_headers
 
 logger = logging.getLogger(__name__)
@@ -13,11 +14,11 @@ def find_unused_lambda_functions(
     session: Any, region_name: str, period: int, max_results: int = 100
 ) -> dict[str, Any]:
     """Find Lambda functions with no invocations in the specified period."""
-    lambda_client = session.client("lambda", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    lambda_client = get_client(session, "lambda", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     output_data = []
     
     # Get all Lambda functions
@@ -106,7 +107,7 @@ def find_unused_lambda_functions(
 
 def find_unused_elastic_ips(session: Any, region_name: str) -> dict[str, Any]:
     """Find unattached Elastic IPs."""
-    ec2_client = session.client("ec2", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
     
     elastic_ips = ec2_client.describe_addresses()["Addresses"]
     unused_elastic_ips = [
@@ -175,8 +176,8 @@ def find_unused_amis(
     session: Any, region_name: str, period: int, max_results: int = 100
 ) -> dict[str, Any]:
     """Find AMIs not used by any EC2 instances, ASGs, or Spot Fleet Requests."""
-    ec2_client = session.client("ec2", region_name=region_name)
-    asg_client = session.client("autoscaling", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
+    asg_client = get_client(session, "autoscaling", region_name)
     
     cutoff_date = datetime.now() - timedelta(days=period)
     
@@ -424,11 +425,11 @@ def find_unused_load_balancers(
     session: Any, region_name: str, period: int
 ) -> dict[str, Any]:
     """Find load balancers with no traffic in the specified period."""
-    elb_client = session.client("elbv2", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    elb_client = get_client(session, "elbv2", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     unused_elbs = []
     
     response = elb_client.describe_load_balancers()
@@ -578,11 +579,11 @@ def find_unused_target_groups(
     Returns:
         Dictionary with unused target groups
     """
-    elb_client = session.client("elbv2", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    elb_client = get_client(session, "elbv2", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     
     unused_tgs = []
     next_token = None
@@ -753,7 +754,7 @@ def find_unused_log_groups(
     This function checks the most recent log stream's lastIngestionTime
     to accurately determine if a log group is unused.
     """
-    logs_client = session.client("logs", region_name=region_name)
+    logs_client = get_client(session, "logs", region_name)
     
     threshold = datetime.now() - timedelta(days=period)
     unused_log_groups = []
@@ -895,7 +896,7 @@ def find_unused_snapshots(
     session: Any, region_name: str, period: int, max_results: int = 100
 ) -> dict[str, Any]:
     """Find EBS snapshots not associated with any AMI or volume."""
-    ec2_client = session.client("ec2", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
     
     cutoff_date = datetime.now(tz=None) - timedelta(days=period)
     
@@ -1006,11 +1007,11 @@ def find_unused_security_groups(
     session: Any, region_name: str, max_results: int = 100
 ) -> dict[str, Any]:
     """Find security groups not attached to any resources."""
-    ec2_client = session.client("ec2", region_name=region_name)
-    lambda_client = session.client("lambda", region_name=region_name)
-    elb_client = session.client("elbv2", region_name=region_name)
-    rds_client = session.client("rds", region_name=region_name)
-    asg_client = session.client("autoscaling", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
+    lambda_client = get_client(session, "lambda", region_name)
+    elb_client = get_client(session, "elbv2", region_name)
+    rds_client = get_client(session, "rds", region_name)
+    asg_client = get_client(session, "autoscaling", region_name)
     
     # Get all security groups
     sg_dict = {}
@@ -1149,7 +1150,7 @@ def find_unused_volumes(
     Returns:
         Dictionary with unused EBS volumes
     """
-    ec2_client = session.client("ec2", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
     
     logger.info(f"Finding unused EBS volumes in {region_name}")
     
@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+from ..utils.aws_clients import get_client
 from ..utils.helpers import fields_to_headers
 
 logger = logging.getLogger(__name__)
@@ -27,7 +28,7 @@ def find_old_ecs_task_definitions(
     Returns:
         Dictionary with unused ECS task definition revisions
     """
-    ecs_client = session.client("ecs", region_name=region_name)
+    ecs_client = get_client(session, "ecs", region_name)
     
     output_data = []
     
@@ -195,7 +196,7 @@ def find_unused_ecr_images(
     Returns:
         Dictionary with unused ECR images
     """
-    ecr_client = session.client("ecr", region_name=region_name)
+    ecr_client = get_client(session, "ecr", region_name)
     
     cutoff_date = datetime.now() - timedelta(days=period)
     output_data = []
@@ -306,8 +307,8 @@ def find_unused_launch_templates(
     Returns:
         Dictionary with unused launch templates
     """
-    ec2_client = session.client("ec2", region_name=region_name)
-    asg_client = session.client("autoscaling", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
+    asg_client = get_client(session, "autoscaling", region_name)
     
     cutoff_date = datetime.now() - timedelta(days=period)
     output_data = []
@@ -421,9 +422,9 @@ def find_unused_ecs_clusters_and_services(
     Returns:
         Dictionary with unused ECS clusters and services
     """
-    ecs_client = session.client("ecs", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
-    events_client = session.client("events", region_name=region_name)
+    ecs_client = get_client(session, "ecs", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
+    events_client = get_client(session, "events", region_name)
     
     output_data = []
     
@@ -571,8 +572,8 @@ def _check_service_cloudwatch_activity(
     cloudwatch_client: Any, cluster_name: str, service_name: str, period: int
 ) -> bool:
     """Check if ECS service has recent CloudWatch activity."""
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     
     try:
         # Check CPU utilization
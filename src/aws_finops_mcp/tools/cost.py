@@ -1,8 +1,13 @@
 """Cost optimization tools using AWS Cost Optimization Hub."""
 
 import logging
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
+from ..utils.aws_clients import get_client
+from ..utils.concurrency import prefetch
 from ..utils.helpers import fields_to_headers
 
 logger = logging.getLogger(__name__)
@@ -31,105 +36,228 @@ RESOURCE_TYPES_CONFIG = {
     "NatGateway": {"id": 219, "name": "Cost_NatGateway"},
 }
 
+# Largest page size accepted by ListRecommendations
+MAX_RESULTS_PER_PAGE = 1000
+
+# Flattened (resource_type, id, name) view of RESOURCE_TYPES_CONFIG for iteration
+_RESOURCE_TYPES_FLAT: tuple[tuple[str, int, str], ...] = tuple(
+    (resource_type, config["id"], config["name"])
+    for resource_type, config in RESOURCE_TYPES_CONFIG.items()
+)
+
+# Output fields shared by every resource type; the same objects are
+# referenced from each result instead of being rebuilt per type
+_RESOURCE_FIELDS: dict[str, str] = {
+    "1": "RecommendationId",
+    "2": "AccountId",
+    "3": "Region",
+    "4": "ResourceId",
+    "5": "ResourceArn",
+    "6": "CurrentResourceType",
+    "7": "RecommendedResourceType",
+    "8": "EstimatedMonthlySavings",
+    "9": "EstimatedSavingsPercentage",
+    "10": "EstimatedMonthlyCost",
+    "11": "CurrencyCode",
+    "12": "ImplementationEffort",
+    "13": "RestartNeeded",
+    "14": "ActionType",
+    "15": "RollbackPossible",
+    "16": "CurrentResourceSummary",
+    "17": "RecommendedResourceSummary",
+    "18": "LastRefreshTimestamp",
+    "19": "RecommendationLookbackPeriodInDays",
+    "20": "Source",
+    "21": "Description",
+}
+_RESOURCE_HEADERS = fields_to_headers(_RESOURCE_FIELDS)
+
 
 def get_resource_fields() -> dict[str, str]:
     """Get standardized fields for all cost optimization resource types."""
-    return {
-        "1": "RecommendationId",
-        "2": "AccountId",
-        "3": "Region",
-        "4": "ResourceId",
-        "5": "ResourceArn",
-        "6": "CurrentResourceType",
-        "7": "RecommendedResourceType",
-        "8": "EstimatedMonthlySavings",
-        "9": "EstimatedSavingsPercentage",
-        "10": "EstimatedMonthlyCost",
-        "11": "CurrencyCode",
-        "12": "ImplementationEffort",
-        "13": "RestartNeeded",
-        "14": "ActionType",
-        "15": "RollbackPossible",
-        "16": "CurrentResourceSummary",
-        "17": "RecommendedResourceSummary",
-        "18": "LastRefreshTimestamp",
-        "19": "RecommendationLookbackPeriodInDays",
-        "20": "Source",
-        "21": "Description",
+    return _RESOURCE_FIELDS
+
+
+def iter_recommendations(
+    client: Any,
+    max_results: int = MAX_RESULTS_PER_PAGE,
+    region_filter: str | None = None,
+    resource_types: list[str] | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield recommendations from Cost Optimization Hub one page at a time.
+    
+    Region and resource type filters are applied server-side, so pages only
+    carry the recommendations the caller asked for. The next page is
+    requested in the background while the current one is being consumed.
+    """
+    filters: dict[str, list[str]] = {}
+    if region_filter:
+        filters["regions"] = [region_filter]
+    if resource_types:
+        filters["resourceTypes"] = resource_types
+    
+    params: dict[str, Any] = {
+        "includeAllRecommendations": True,
+        "orderBy": {"dimension": "ResourceType", "order": "Asc"},
     }
+    if filters:
+        params["filter"] = filters
+    
+    paginator = client.get_paginator("list_recommendations")
+    pages = paginator.paginate(**params, PaginationConfig={"PageSize": max_results})
+    
+    try:
+        # Fetch the next page while the caller works through the current one
+        for page in prefetch(pages):
+            yield from page.get("items", [])
+    except Exception as e:
+        logger.error(f"Error listing recommendations: {e}")
 
 
 def list_recommendations(
-    client: Any, max_results: int = 50, region_filter: str | None = None
+    client: Any,
+    max_results: int = MAX_RESULTS_PER_PAGE,
+    region_filter: str | None = None,
+    resource_types: list[str] | None = None,
 ) -> dict[str, Any]:
     """Retrieve detailed recommendations from Cost Optimization Hub."""
-    all_items = []
-    next_token = None
+    return {
+        "items": list(
+            iter_recommendations(client, max_results, region_filter, resource_types)
+        )
+    }
+
+
+@lru_cache(maxsize=256)
+def _format_timestamp(value: Any) -> str:
+    """Stringify a refresh timestamp once per distinct value.
     
-    while True:
-        params = {
-            "maxResults": max_results,
-            "includeAllRecommendations": True,
-            "orderBy": {"dimension": "ResourceType", "order": "Asc"},
-        }
-        
-        # Add region filter if specified
-        if region_filter:
-            params["filter"] = {"regions": [region_filter]}
-        
-        if next_token:
-            params["nextToken"] = next_token
-        
-        try:
-            response = client.list_recommendations(**params)
-            all_items.extend(response.get("items", []))
-            
-            next_token = response.get("nextToken")
-            if not next_token:
-                break
-        except Exception as e:
-            logger.error(f"Error listing recommendations: {e}")
-            break
+    Cost Optimization Hub tends to share refresh timestamps across a batch,
+    so most records reuse an already formatted string.
+    """
+    return str(value)
+
+
+@dataclass(slots=True, frozen=True)
+class Recommendation:
+    """A single Cost Optimization Hub recommendation.
+    
+    Records are kept as slotted objects while they are bucketed and only
+    projected to dicts when the tool result is built.
+    """
+    
+    recommendation_id: str
+    account_id: str
+    region: str
+    resource_id: str
+    resource_arn: str
+    current_resource_type: str
+    recommended_resource_type: str
+    estimated_monthly_savings: float
+    estimated_savings_percentage: float
+    estimated_monthly_cost: float
+    currency_code: str
+    implementation_effort: str
+    restart_needed: bool
+    action_type: str
+    rollback_possible: bool
+    current_resource_summary: str
+    recommended_resource_summary: str
+    last_refresh_timestamp: Any
+    recommendation_lookback_period_in_days: int
+    source: str
+    resource_type: str
+    
+    @classmethod
+    def from_item(cls, item: dict[str, Any], resource_type: str) -> "Recommendation":
+        """Build a record from a Cost Optimization Hub API item."""
+        return cls(
+            item.get("recommendationId", ""),
+            item.get("accountId", ""),
+            item.get("region", ""),
+            item.get("resourceId", ""),
+            item.get("resourceArn", ""),
+            item.get("currentResourceType", ""),
+            item.get("recommendedResourceType", ""),
+            item.get("estimatedMonthlySavings", 0),
+            item.get("estimatedSavingsPercentage", 0),
+            item.get("estimatedMonthlyCost", 0),
+            item.get("currencyCode", "USD"),
+            item.get("implementationEffort", ""),
+            item.get("restartNeeded", False),
+            item.get("actionType", ""),
+            item.get("rollbackPossible", False),
+            item.get("currentResourceSummary", ""),
+            item.get("recommendedResourceSummary", ""),
+            item.get("lastRefreshTimestamp", ""),
+            item.get("recommendationLookbackPeriodInDays", 0),
+            item.get("source", ""),
+            resource_type,
+        )
     
-    return {"items": all_items}
+    def to_dict(self) -> dict[str, Any]:
+        """Project the record onto the output fields."""
+        return {
+            "RecommendationId": self.recommendation_id,
+            "AccountId": self.account_id,
+            "Region": self.region,
+            "ResourceId": self.resource_id,
+            "ResourceArn": self.resource_arn,
+            "CurrentResourceType": self.current_resource_type,
+            "RecommendedResourceType": self.recommended_resource_type,
+            "EstimatedMonthlySavings": self.estimated_monthly_savings,
+            "EstimatedSavingsPercentage": self.estimated_savings_percentage,
+            "EstimatedMonthlyCost": self.estimated_monthly_cost,
+            "CurrencyCode": self.currency_code,
+            "ImplementationEffort": self.implementation_effort,
+            "RestartNeeded": self.restart_needed,
+            "ActionType": self.action_type,
+            "RollbackPossible": self.rollback_possible,
+            "CurrentResourceSummary": self.current_resource_summary,
+            "RecommendedResourceSummary": self.recommended_resource_summary,
+            "LastRefreshTimestamp": _format_timestamp(self.last_refresh_timestamp),
+            "RecommendationLookbackPeriodInDays": self.recommendation_lookback_period_in_days,
+            "Source": self.source,
+            "Description": f"Cost optimization: {self.action_type} for {self.resource_type}",
+        }
 
 
 def process_recommendations_by_resource_type(
     recommendations: dict[str, Any], resource_type: str
 ) -> list[dict[str, Any]]:
     """Process recommendations for a specific resource type."""
-    filtered_recommendations = []
+    return [
+        Recommendation.from_item(item, resource_type).to_dict()
+        for item in recommendations.get("items", [])
+        if item.get("currentResourceType") == resource_type
+    ]
+
+
+def bucket_recommendations(
+    items: Iterable[dict[str, Any]]
+) -> dict[str, list[Recommendation]]:
+    """Group recommendations by resource type in a single pass.
     
-    for item in recommendations.get("items", []):
-        if item.get("currentResourceType") == resource_type:
-            recommendation = {
-                "RecommendationId": item.get("recommendationId", ""),
-                "AccountId": item.get("accountId", ""),
-                "Region": item.get("region", ""),
-                "ResourceId": item.get("resourceId", ""),
-                "ResourceArn": item.get("resourceArn", ""),
-                "CurrentResourceType": item.get("currentResourceType", ""),
-                "RecommendedResourceType": item.get("recommendedResourceType", ""),
-                "EstimatedMonthlySavings": item.get("estimatedMonthlySavings", 0),
-                "EstimatedSavingsPercentage": item.get("estimatedSavingsPercentage", 0),
-                "EstimatedMonthlyCost": item.get("estimatedMonthlyCost", 0),
-                "CurrencyCode": item.get("currencyCode", "USD"),
-                "ImplementationEffort": item.get("implementationEffort", ""),
-                "RestartNeeded": item.get("restartNeeded", False),
-                "ActionType": item.get("actionType", ""),
-                "RollbackPossible": item.get("rollbackPossible", False),
-                "CurrentResourceSummary": item.get("currentResourceSummary", ""),
-                "RecommendedResourceSummary": item.get("recommendedResourceSummary", ""),
-                "LastRefreshTimestamp": str(item.get("lastRefreshTimestamp", "")),
-                "RecommendationLookbackPeriodInDays": item.get(
-                    "recommendationLookbackPeriodInDays", 0
-                ),
-                "Source": item.get("source", ""),
-                "Description": f"Cost optimization: {item.get('actionType', '')} for {resource_type}",
-            }
-            filtered_recommendations.append(recommendation)
+    Items are consumed as they arrive, so a generator such as
+    iter_recommendations() never has to be materialized in full.
     
-    return filtered_recommendations
+    Args:
+        items: Cost Optimization Hub recommendation items
+        
+    Returns:
+        Dictionary mapping each known resource type to its records
+    """
+    buckets: dict[str, list[Recommendation]] = {
+        resource_type: [] for resource_type in RESOURCE_TYPES_CONFIG
+    }
+    
+    for item in items:
+        resource_type = item.get("currentResourceType")
+        bucket = buckets.get(resource_type)
+        if bucket is not None:
+            bucket.append(Recommendation.from_item(item, resource_type))
+    
+    return buckets
 
 
 def get_cost_optimization_recommendations(
@@ -147,43 +275,44 @@ def get_cost_optimization_recommendations(
     """
     try:
         # Cost Optimization Hub is only available in us-east-1
-        client = session.client("cost-optimization-hub", region_name="us-east-1")
-        
-        # Get all recommendations
-        recommendations = list_recommendations(
-            client, max_results=50, region_filter=region_name
-        )
+        client = get_client(session, "cost-optimization-hub", "us-east-1")
         
         fields = get_resource_fields()
+        headers = _RESOURCE_HEADERS
         
-        # If specific resource type requested, return only that
+        # If specific resource type requested, only fetch and return that
         if resource_type and resource_type in RESOURCE_TYPES_CONFIG:
             config = RESOURCE_TYPES_CONFIG[resource_type]
-            filtered_recommendations = process_recommendations_by_resource_type(
-                recommendations, resource_type
+            buckets = bucket_recommendations(
+                iter_recommendations(
+                    client, region_filter=region_name, resource_types=[resource_type]
+                )
             )
+            filtered_recommendations = [rec.to_dict() for rec in buckets[resource_type]]
             
             return {
                 "id": config["id"],
                 "name": config["name"],
                 "fields": fields,
-                "headers": fields_to_headers(fields),
+                "headers": headers,
                 "count": len(filtered_recommendations),
                 "resource": filtered_recommendations,
             }
         
-        # Otherwise, return all resource types
+        # Otherwise, stream all recommendations straight into per-type buckets
+        buckets = bucket_recommendations(
+            iter_recommendations(client, region_filter=region_name)
+        )
+        
         results = []
-        for resource_type, config in RESOURCE_TYPES_CONFIG.items():
-            filtered_recommendations = process_recommendations_by_resource_type(
-                recommendations, resource_type
-            )
+        for rt, resource_id, resource_name in _RESOURCE_TYPES_FLAT:
+            filtered_recommendations = [rec.to_dict() for rec in buckets[rt]]
             
             resource_obj = {
-                "id": config["id"],
-                "name": config["name"],
+                "id": resource_id,
+                "name": resource_name,
                 "fields": fields,
-                "headers": fields_to_headers(fields),
+                "headers": headers,
                 "count": len(filtered_recommendations),
                 "resource": filtered_recommendations,
             }
@@ -1,19 +1,304 @@
 """Cost Explorer tools for AWS cost analysis."""
 
 import logging
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import date, timedelta
+from functools import lru_cache
+from heapq import nlargest
+from operator import itemgetter
 from typing import Any
 
-from ..utils.helpers import fields_to_headers
+from ..utils.aws_clients import get_client
+from ..utils.helpers import fields_to_headers, iter_token_pages
 
 logger = logging.getLogger(__name__)
 
+_CURRENCY = "USD"
+
+_REGION_FIELDS = {
+    "1": "Region",
+    "2": "Cost",
+    "3": "Currency",
+    "4": "Period",
+    "5": "Description",
+}
+_REGION_HEADERS = fields_to_headers(_REGION_FIELDS)
+
+_SERVICE_FIELDS = {
+    "1": "Service",
+    "2": "Cost",
+    "3": "Currency",
+    "4": "Period",
+    "5": "Description",
+}
+_SERVICE_HEADERS = fields_to_headers(_SERVICE_FIELDS)
+
+_REGION_SERVICE_FIELDS = {
+    "1": "Region",
+    "2": "Service",
+    "3": "Cost",
+    "4": "Currency",
+    "5": "Period",
+    "6": "Description",
+}
+_REGION_SERVICE_HEADERS = fields_to_headers(_REGION_SERVICE_FIELDS)
+
+_DAILY_FIELDS = {
+    "1": "Date",
+    "2": "Cost",
+    "3": "Currency",
+    "4": "Description",
+}
+_DAILY_HEADERS = fields_to_headers(_DAILY_FIELDS)
+
+
+@lru_cache(maxsize=8)
+def _month_range_for(today_date: date) -> tuple[str, str]:
+    """Get the default (start, end) dates for a given day.
+    
+    The range covers the whole previous month: from the first day of last
+    month up to (exclusive) the first day of the current month. Cached per
+    day because the answer only changes when the date does.
+    
+    Args:
+        today_date: Reference date (normally date.today())
+        
+    Returns:
+        Tuple of (start_date, end_date) in YYYY-MM-DD format
+    """
+    first_day_current_month = today_date.replace(day=1)
+    last_day_previous_month = first_day_current_month - timedelta(days=1)
+    first_day_previous_month = last_day_previous_month.replace(day=1)
+    
+    return (
+        first_day_previous_month.strftime("%Y-%m-%d"),
+        first_day_current_month.strftime("%Y-%m-%d"),
+    )
+
+
+def _to_cents(amount: str) -> int:
+    """Convert a Cost Explorer amount string to whole cents."""
+    return round(float(amount) * 100)
+
+
+def _cost_stats(costs: list[float]) -> tuple[float, float, float, float]:
+    """Compute (total, average, max, min) for a series of costs.
+    
+    Args:
+        costs: Numeric cost values
+        
+    Returns:
+        Tuple of (total, average, maximum, minimum); all zero for an empty series
+    """
+    if not costs:
+        return 0.0, 0.0, 0.0, 0.0
+    
+    total = sum(costs)
+    return total, total / len(costs), max(costs), min(costs)
+
+
+# Plain subscripts measured faster than a chain of itemgetters for the nested
+# amount lookup, so only the flat Keys access goes through one
+_GET_KEYS = itemgetter("Keys")
+
+# (time period start, group keys, cost in cents) for every returned group
+_CostGroups = tuple[list[str], list[list[str]], list[int]]
+
+
+def _extract_groups(results_by_time: list[dict[str, Any]]) -> _CostGroups:
+    """Parse Cost Explorer groups into parallel lists, one period at a time.
+    
+    Each period's groups are appended with bulk extend() calls.
+    
+    Args:
+        results_by_time: ResultsByTime list from a get_cost_and_usage response
+        
+    Returns:
+        Tuple of (time period starts, group keys, costs in cents)
+    """
+    periods = []
+    keys_list = []
+    cents = []
+    for time_period in results_by_time:
+        groups = time_period["Groups"]
+        periods.extend([time_period["TimePeriod"]["Start"]] * len(groups))
+        keys_list.extend(map(_GET_KEYS, groups))
+        cents.extend([
+            _to_cents(group["Metrics"]["UnblendedCost"]["Amount"])
+            for group in groups
+        ])
+    
+    return periods, keys_list, cents
+
+
+def _fold_groups(groups: _CostGroups, key_index: int) -> _CostGroups:
+    """Collapse multi-dimension groups onto one of their dimensions.
+    
+    Costs are summed per time period, so folding a REGION x SERVICE result on
+    the region key gives the same rows as a REGION-only query.
+    
+    Args:
+        groups: Parsed groups from _extract_groups()
+        key_index: Position of the dimension to keep in each group's keys
+        
+    Returns:
+        Parsed groups keyed by the single remaining dimension
+    """
+    totals: defaultdict[tuple[str, str], int] = defaultdict(int)
+    for period_start, keys, cost in zip(*groups):
+        totals[period_start, keys[key_index]] += cost
+    
+    return (
+        [period_start for period_start, _ in totals],
+        [[key] for _, key in totals],
+        list(totals.values()),
+    )
+
+
+def _rank_groups(
+    groups: _CostGroups, top_k: int | None = None
+) -> tuple[list[tuple[list[str], float]], float]:
+    """Order parsed Cost Explorer groups by cost, highest first.
+    
+    Zero-cost groups are dropped and only the surviving indices are sorted, so
+    output records are only built for groups that are actually returned.
+    Totals are summed in cents so they do not pick up float drift across
+    many groups.
+    
+    Args:
+        groups: Parsed groups from _extract_groups() or _fold_groups()
+        top_k: Only keep the top_k most expensive groups (default: keep all)
+        
+    Returns:
+        Tuple of ((group keys, rounded cost) pairs sorted by cost descending,
+        total cost across all groups including any beyond top_k)
+    """
+    _, keys_list, cents = groups
+    positive = (i for i, cost in enumerate(cents) if cost > 0)
+    if top_k is not None:
+        order = nlargest(top_k, positive, key=cents.__getitem__)
+    else:
+        order = sorted(positive, key=cents.__getitem__, reverse=True)
+    
+    total_cents = sum(cost for cost in cents if cost > 0)
+    return [(keys_list[i], cents[i] / 100) for i in order], total_cents / 100
+
+
+def _query_costs(
+    session: Any, start_date: str, end_date: str, dimensions: list[str]
+) -> _CostGroups:
+    """Run a monthly UnblendedCost query grouped by the given dimensions.
+    
+    Args:
+        session: Boto3 session
+        start_date: Start date in YYYY-MM-DD format
+        end_date: End date in YYYY-MM-DD format
+        dimensions: Cost Explorer dimensions to group by (e.g. ["REGION"])
+        
+    Returns:
+        Parsed groups from _extract_groups()
+    """
+    # Create Cost Explorer client (always use us-east-1)
+    ce_client = get_client(session, "ce", "us-east-1")
+    
+    pages = iter_token_pages(
+        ce_client.get_cost_and_usage,
+        TimePeriod={"Start": start_date, "End": end_date},
+        Granularity="MONTHLY",
+        Metrics=["UnblendedCost"],
+        GroupBy=[{"Type": "DIMENSION", "Key": dimension} for dimension in dimensions],
+    )
+    # Grouped results are split across pages once they exceed one page
+    return _extract_groups(
+        [time_period for page in pages for time_period in page["ResultsByTime"]]
+    )
+
+
+def _region_result(groups: _CostGroups, period: str, top_k: int | None) -> dict[str, Any]:
+    """Build the Cost by Region result from REGION-keyed groups."""
+    regions = []
+    ranked, total_cost = _rank_groups(groups, top_k)
+    for keys, cost in ranked:
+        region = keys[0] if keys[0] else "No Region"
+        regions.append({
+            "Region": region,
+            "Cost": cost,
+            "Currency": _CURRENCY,
+            "Period": period,
+            "Description": f"Total cost for {region} region",
+        })
+    
+    return {
+        "id": 301,
+        "name": "Cost by Region",
+        "fields": _REGION_FIELDS,
+        "headers": _REGION_HEADERS,
+        "count": len(regions),
+        "total_cost": total_cost,
+        "resource": regions,
+    }
+
+
+def _service_result(groups: _CostGroups, period: str, top_k: int | None) -> dict[str, Any]:
+    """Build the Cost by Service result from SERVICE-keyed groups."""
+    services = []
+    ranked, total_cost = _rank_groups(groups, top_k)
+    for keys, cost in ranked:
+        service = keys[0] if keys[0] else "No Service"
+        services.append({
+            "Service": service,
+            "Cost": cost,
+            "Currency": _CURRENCY,
+            "Period": period,
+            "Description": f"Total cost for {service}",
+        })
+    
+    return {
+        "id": 302,
+        "name": "Cost by Service",
+        "fields": _SERVICE_FIELDS,
+        "headers": _SERVICE_HEADERS,
+        "count": len(services),
+        "total_cost": total_cost,
+        "resource": services,
+    }
+
+
+def _region_service_result(
+    groups: _CostGroups, period: str, top_k: int | None
+) -> dict[str, Any]:
+    """Build the Cost by Region and Service result from REGION x SERVICE groups."""
+    region_services = []
+    ranked, total_cost = _rank_groups(groups, top_k)
+    for keys, cost in ranked:
+        region = keys[0] if keys[0] else "No Region"
+        service = keys[1] if len(keys) > 1 and keys[1] else "No Service"
+        region_services.append({
+            "Region": region,
+            "Service": service,
+            "Cost": cost,
+            "Currency": _CURRENCY,
+            "Period": period,
+            "Description": f"{service} cost in {region}",
+        })
+    
+    return {
+        "id": 303,
+        "name": "Cost by Region and Service",
+        "fields": _REGION_SERVICE_FIELDS,
+        "headers": _REGION_SERVICE_HEADERS,
+        "count": len(region_services),
+        "total_cost": total_cost,
+        "resource": region_services,
+    }
+
 
 def get_cost_by_region(
     session: Any,
     region_name: str,
     start_date: str | None = None,
     end_date: str | None = None,
+    top_k: int | None = None,
 ) -> dict[str, Any]:
     """Get cost breakdown by region for the specified period.
     
@@ -22,73 +307,20 @@ def get_cost_by_region(
         region_name: AWS region (Cost Explorer is global, but session needs region)
         start_date: Start date in YYYY-MM-DD format (default: first day of last month)
         end_date: End date in YYYY-MM-DD format (default: first day of current month)
+        top_k: Only return the top_k most expensive entries (default: all)
     
     Returns:
         Dictionary with cost breakdown by region
     """
     # Calculate date range if not provided
     if not start_date or not end_date:
-        today = datetime.now()
-        first_day_current_month = today.replace(day=1)
-        last_day_previous_month = first_day_current_month - timedelta(days=1)
-        first_day_previous_month = last_day_previous_month.replace(day=1)
-        
-        start_date = first_day_previous_month.strftime("%Y-%m-%d")
-        end_date = first_day_current_month.strftime("%Y-%m-%d")
+        start_date, end_date = _month_range_for(date.today())
     
     logger.info(f"Getting cost breakdown for period {start_date} to {end_date}")
     
-    # Create Cost Explorer client (always use us-east-1)
-    ce_client = session.client("ce", region_name="us-east-1")
-    
     try:
-        # Query Cost Explorer API for regions
-        region_response = ce_client.get_cost_and_usage(
-            TimePeriod={"Start": start_date, "End": end_date},
-            Granularity="MONTHLY",
-            Metrics=["UnblendedCost"],
-            GroupBy=[{"Type": "DIMENSION", "Key": "REGION"}],
-        )
-        
-        # Process response to extract region-wise costs
-        regions = []
-        for time_period in region_response["ResultsByTime"]:
-            for group in time_period["Groups"]:
-                region = group["Keys"][0] if group["Keys"][0] else "No Region"
-                cost = round(float(group["Metrics"]["UnblendedCost"]["Amount"]), 2)
-                
-                if cost > 0:
-                    regions.append({
-                        "Region": region,
-                        "Cost": cost,
-                        "Currency": "USD",
-                        "Period": f"{start_date} to {end_date}",
-                        "Description": f"Total cost for {region} region",
-                    })
-        
-        # Sort by cost descending
-        regions.sort(key=lambda x: x["Cost"], reverse=True)
-        
-        # Calculate total
-        total_cost = sum(r["Cost"] for r in regions)
-        
-        fields = {
-            "1": "Region",
-            "2": "Cost",
-            "3": "Currency",
-            "4": "Period",
-            "5": "Description",
-        }
-        
-        return {
-            "id": 301,
-            "name": "Cost by Region",
-            "fields": fields,
-            "headers": fields_to_headers(fields),
-            "count": len(regions),
-            "total_cost": total_cost,
-            "resource": regions,
-        }
+        groups = _query_costs(session, start_date, end_date, ["REGION"])
+        return _region_result(groups, f"{start_date} to {end_date}", top_k)
         
     except Exception as e:
         logger.error(f"Error getting cost by region: {e}")
@@ -100,6 +332,7 @@ def get_cost_by_service(
     region_name: str,
     start_date: str | None = None,
     end_date: str | None = None,
+    top_k: int | None = None,
 ) -> dict[str, Any]:
     """Get cost breakdown by service for the specified period.
     
@@ -108,73 +341,20 @@ def get_cost_by_service(
         region_name: AWS region (Cost Explorer is global, but session needs region)
         start_date: Start date in YYYY-MM-DD format (default: first day of last month)
         end_date: End date in YYYY-MM-DD format (default: first day of current month)
+        top_k: Only return the top_k most expensive entries (default: all)
     
     Returns:
         Dictionary with cost breakdown by service
     """
     # Calculate date range if not provided
     if not start_date or not end_date:
-        today = datetime.now()
-        first_day_current_month = today.replace(day=1)
-        last_day_previous_month = first_day_current_month - timedelta(days=1)
-        first_day_previous_month = last_day_previous_month.replace(day=1)
-        
-        start_date = first_day_previous_month.strftime("%Y-%m-%d")
-        end_date = first_day_current_month.strftime("%Y-%m-%d")
+        start_date, end_date = _month_range_for(date.today())
     
     logger.info(f"Getting cost breakdown by service for period {start_date} to {end_date}")
     
-    # Create Cost Explorer client (always use us-east-1)
-    ce_client = session.client("ce", region_name="us-east-1")
-    
     try:
-        # Query Cost Explorer API for services
-        service_response = ce_client.get_cost_and_usage(
-            TimePeriod={"Start": start_date, "End": end_date},
-            Granularity="MONTHLY",
-            Metrics=["UnblendedCost"],
-            GroupBy=[{"Type": "DIMENSION", "Key": "SERVICE"}],
-        )
-        
-        # Process response to extract service-wise costs
-        services = []
-        for time_period in service_response["ResultsByTime"]:
-            for group in time_period["Groups"]:
-                service = group["Keys"][0] if group["Keys"][0] else "No Service"
-                cost = round(float(group["Metrics"]["UnblendedCost"]["Amount"]), 2)
-                
-                if cost > 0:
-                    services.append({
-                        "Service": service,
-                        "Cost": cost,
-                        "Currency": "USD",
-                        "Period": f"{start_date} to {end_date}",
-                        "Description": f"Total cost for {service}",
-                    })
-        
-        # Sort by cost descending
-        services.sort(key=lambda x: x["Cost"], reverse=True)
-        
-        # Calculate total
-        total_cost = sum(s["Cost"] for s in services)
-        
-        fields = {
-            "1": "Service",
-            "2": "Cost",
-            "3": "Currency",
-            "4": "Period",
-            "5": "Description",
-        }
-        
-        return {
-            "id": 302,
-            "name": "Cost by Service",
-            "fields": fields,
-            "headers": fields_to_headers(fields),
-            "count": len(services),
-            "total_cost": total_cost,
-            "resource": services,
-        }
+        groups = _query_costs(session, start_date, end_date, ["SERVICE"])
+        return _service_result(groups, f"{start_date} to {end_date}", top_k)
         
     except Exception as e:
         logger.error(f"Error getting cost by service: {e}")
@@ -186,6 +366,7 @@ def get_cost_by_region_and_service(
     region_name: str,
     start_date: str | None = None,
     end_date: str | None = None,
+    top_k: int | None = None,
 ) -> dict[str, Any]:
     """Get cost breakdown by region and service for the specified period.
     
@@ -194,86 +375,66 @@ def get_cost_by_region_and_service(
         region_name: AWS region (Cost Explorer is global, but session needs region)
         start_date: Start date in YYYY-MM-DD format (default: first day of last month)
         end_date: End date in YYYY-MM-DD format (default: first day of current month)
+        top_k: Only return the top_k most expensive entries (default: all)
     
     Returns:
         Dictionary with cost breakdown by region and service
     """
     # Calculate date range if not provided
     if not start_date or not end_date:
-        today = datetime.now()
-        first_day_current_month = today.replace(day=1)
-        last_day_previous_month = first_day_current_month - timedelta(days=1)
-        first_day_previous_month = last_day_previous_month.replace(day=1)
-        
-        start_date = first_day_previous_month.strftime("%Y-%m-%d")
-        end_date = first_day_current_month.strftime("%Y-%m-%d")
+        start_date, end_date = _month_range_for(date.today())
     
     logger.info(f"Getting cost breakdown by region and service for period {start_date} to {end_date}")
     
-    # Create Cost Explorer client (always use us-east-1)
-    ce_client = session.client("ce", region_name="us-east-1")
-    
     try:
-        # Query Cost Explorer API for region and service combination
-        response = ce_client.get_cost_and_usage(
-            TimePeriod={"Start": start_date, "End": end_date},
-            Granularity="MONTHLY",
-            Metrics=["UnblendedCost"],
-            GroupBy=[
-                {"Type": "DIMENSION", "Key": "REGION"},
-                {"Type": "DIMENSION", "Key": "SERVICE"},
-            ],
-        )
-        
-        # Process response to extract region-service costs
-        region_services = []
-        for time_period in response["ResultsByTime"]:
-            for group in time_period["Groups"]:
-                region = group["Keys"][0] if group["Keys"][0] else "No Region"
-                service = (
-                    group["Keys"][1]
-                    if len(group["Keys"]) > 1 and group["Keys"][1]
-                    else "No Service"
-                )
-                cost = round(float(group["Metrics"]["UnblendedCost"]["Amount"]), 2)
-                
-                if cost > 0:
-                    region_services.append({
-                        "Region": region,
-                        "Service": service,
-                        "Cost": cost,
-                        "Currency": "USD",
-                        "Period": f"{start_date} to {end_date}",
-                        "Description": f"{service} cost in {region}",
-                    })
-        
-        # Sort by cost descending
-        region_services.sort(key=lambda x: x["Cost"], reverse=True)
+        groups = _query_costs(session, start_date, end_date, ["REGION", "SERVICE"])
+        return _region_service_result(groups, f"{start_date} to {end_date}", top_k)
         
-        # Calculate total
-        total_cost = sum(rs["Cost"] for rs in region_services)
-        
-        fields = {
-            "1": "Region",
-            "2": "Service",
-            "3": "Cost",
-            "4": "Currency",
-            "5": "Period",
-            "6": "Description",
-        }
+    except Exception as e:
+        logger.error(f"Error getting cost by region and service: {e}")
+        raise
+
+
+def get_cost_breakdown(
+    session: Any,
+    region_name: str,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    top_k: int | None = None,
+) -> list[dict[str, Any]]:
+    """Get cost by region, by service and by region and service in one query.
+    
+    A single REGION x SERVICE query is folded onto each dimension, so the three
+    breakdowns cost one Cost Explorer request instead of three.
+    
+    Args:
+        session: Boto3 session
+        region_name: AWS region (Cost Explorer is global, but session needs region)
+        start_date: Start date in YYYY-MM-DD format (default: first day of last month)
+        end_date: End date in YYYY-MM-DD format (default: first day of current month)
+        top_k: Only return the top_k most expensive entries per breakdown (default: all)
+    
+    Returns:
+        List of resource objects (cost by region, by service, by region and service)
+    """
+    # Calculate date range if not provided
+    if not start_date or not end_date:
+        start_date, end_date = _month_range_for(date.today())
+    
+    logger.info(f"Getting combined cost breakdown for period {start_date} to {end_date}")
+    
+    try:
+        groups = _query_costs(session, start_date, end_date, ["REGION", "SERVICE"])
+        period = f"{start_date} to {end_date}"
         
-        return {
-            "id": 303,
-            "name": "Cost by Region and Service",
-            "fields": fields,
-            "headers": fields_to_headers(fields),
-            "count": len(region_services),
-            "total_cost": total_cost,
-            "resource": region_services,
-        }
+        return [
+            _region_result(_fold_groups(groups, 0), period, top_k),
+            _service_result(_fold_groups(groups, 1), period, top_k),
+            _region_service_result(groups, period, top_k),
+        ]
         
     except Exception as e:
-        logger.error(f"Error getting cost by region and service: {e}")
+        logger.error(f"Error getting combined cost breakdown: {e}")
         raise
 
 
@@ -293,20 +454,21 @@ def get_daily_cost_trend(
         Dictionary with daily cost trend
     """
     # Calculate date range
-    end_date = datetime.now()
+    end_date = date.today()
     start_date = end_date - timedelta(days=days)
     
-    start_date_str = start_date.strftime("%Y-%m-%d")
-    end_date_str = end_date.strftime("%Y-%m-%d")
+    start_date_str = start_date.isoformat()
+    end_date_str = end_date.isoformat()
     
     logger.info(f"Getting daily cost trend for {days} days ({start_date_str} to {end_date_str})")
     
     # Create Cost Explorer client (always use us-east-1)
-    ce_client = session.client("ce", region_name="us-east-1")
+    ce_client = get_client(session, "ce", "us-east-1")
     
     try:
         # Query Cost Explorer API for daily costs
-        response = ce_client.get_cost_and_usage(
+        pages = iter_token_pages(
+            ce_client.get_cost_and_usage,
             TimePeriod={"Start": start_date_str, "End": end_date_str},
             Granularity="DAILY",
             Metrics=["UnblendedCost"],
@@ -314,41 +476,32 @@ def get_daily_cost_trend(
         
         # Process response to extract daily costs
         daily_costs = []
-        for time_period in response["ResultsByTime"]:
-            date = time_period["TimePeriod"]["Start"]
-            cost = round(float(time_period["Total"]["UnblendedCost"]["Amount"]), 2)
+        cents = []
+        for time_period in (period for page in pages for period in page["ResultsByTime"]):
+            day = time_period["TimePeriod"]["Start"]
+            cost_cents = _to_cents(time_period["Total"]["UnblendedCost"]["Amount"])
             
+            cents.append(cost_cents)
             daily_costs.append({
-                "Date": date,
-                "Cost": cost,
-                "Currency": "USD",
-                "Description": f"Total cost for {date}",
+                "Date": day,
+                "Cost": cost_cents / 100,
+                "Currency": _CURRENCY,
+                "Description": f"Total cost for {day}",
             })
         
         # Calculate statistics
-        costs = [dc["Cost"] for dc in daily_costs]
-        total_cost = sum(costs)
-        avg_cost = total_cost / len(costs) if costs else 0
-        max_cost = max(costs) if costs else 0
-        min_cost = min(costs) if costs else 0
-        
-        fields = {
-            "1": "Date",
-            "2": "Cost",
-            "3": "Currency",
-            "4": "Description",
-        }
+        total_cents, avg_cents, max_cents, min_cents = _cost_stats(cents)
         
         return {
             "id": 304,
             "name": "Daily Cost Trend",
-            "fields": fields,
-            "headers": fields_to_headers(fields),
+            "fields": _DAILY_FIELDS,
+            "headers": _DAILY_HEADERS,
             "count": len(daily_costs),
-            "total_cost": round(total_cost, 2),
-            "average_cost": round(avg_cost, 2),
-            "max_cost": round(max_cost, 2),
-            "min_cost": round(min_cost, 2),
+            "total_cost": round(total_cents / 100, 2),
+            "average_cost": round(avg_cents / 100, 2),
+            "max_cost": round(max_cents / 100, 2),
+            "min_cost": round(min_cents / 100, 2),
             "period_days": days,
             "resource": daily_costs,
         }
@@ -1,14 +1,121 @@
 """Network cost optimization tools for AWS resources."""
 
 import logging
-from datetime import datetime, timedelta
+import re
+from bisect import bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from math import fsum
 from typing import Any
 
-from ..utils.helpers import fields_to_headers
+from ..utils.aws_clients import get_client
+from ..utils.cache import disk_cached
+from ..utils.helpers import fields_to_headers, iter_token_pages
+from ..utils.metrics import get_metric_data_values, metric_stat_query
+from ..utils.regions import run_across_regions
+from ..utils.serialization import dumps_json
 
 logger = logging.getLogger(__name__)
 
+# Usage type tokens that identify the direction of a data transfer
+_TRANSFER_TOKEN_RE = re.compile(r"(?:^|-)(InterZone|Regional|Out|In)(?=-|$)")
 
+# Transfer type per token, most specific first (e.g. "InterZone-In" is Inter-AZ)
+_TRANSFER_TYPES = {
+    "InterZone": "Inter-AZ",
+    "Regional": "Inter-Region",
+    "Out": "Outbound",
+    "In": "Inbound",
+}
+
+# Billable data transfer usage type groups; inbound transfer is free, so
+# only outbound, inter-region and inter-AZ traffic is requested
+_DATA_TRANSFER_USAGE_TYPE_GROUPS = (
+    "EC2: Data Transfer - Inter AZ",
+    "EC2: Data Transfer - Internet (Out)",
+    "EC2: Data Transfer - Region to Region (Out)",
+    "EC2: Data Transfer - CloudFront (Out)",
+    "S3: Data Transfer - Internet (Out)",
+    "S3: Data Transfer - Region to Region (Out)",
+    "S3: Data Transfer - CloudFront (Out)",
+)
+
+# NAT Gateway pricing: $0.045/hour + $0.045/GB processed
+_NAT_MONTHLY_HOURLY_COST = 0.045 * 24 * 30
+_NAT_COST_PER_GB = 0.045
+
+# Cost threshold in USD above which each transfer type gets a recommendation
+_TRANSFER_RECOMMENDATIONS = {
+    "Outbound": (100.0, "Consider CloudFront or S3 Transfer Acceleration"),
+    "Inter-Region": (50.0, "Consider VPC peering or PrivateLink"),
+    "Inter-AZ": (50.0, "Review multi-AZ architecture necessity"),
+}
+
+# NAT Gateway usage tiers: a gateway processing less than the n-th limit (in
+# GB) falls into the n-th tier, and anything above the last limit into the
+# final one. Each tier is (recommendation, savings rate, whether the rate
+# applies to the total cost rather than just the data processing cost).
+_NAT_USAGE_TIER_LIMITS_GB = (10.0, 100.0)
+_NAT_USAGE_TIERS = (
+    ("Very low usage - consider removing or using VPC endpoints", 0.9, True),
+    ("Low usage - consider VPC endpoints for AWS services", 0.5, False),
+    ("Consider VPC endpoints to reduce data processing costs", 0.3, False),
+)
+
+# Traffic processed by a NAT Gateway, in both directions
+_NAT_TRAFFIC_METRICS = ("BytesOutToDestination", "BytesInFromSource")
+
+# Output fields for data transfer cost analysis
+_DATA_TRANSFER_FIELDS: dict[str, str] = {
+    "1": "Service",
+    "2": "UsageType",
+    "3": "TransferType",
+    "4": "MonthlyCost",
+    "5": "StartDate",
+    "6": "EndDate",
+    "7": "Recommendation",
+}
+_DATA_TRANSFER_HEADERS = fields_to_headers(_DATA_TRANSFER_FIELDS)
+
+# Output fields for NAT Gateway recommendations
+_NAT_FIELDS: dict[str, str] = {
+    "1": "NatGatewayId",
+    "2": "VpcId",
+    "3": "TotalGBProcessed",
+    "4": "MonthlyHourlyCost",
+    "5": "DataProcessingCost",
+    "6": "TotalMonthlyCost",
+    "7": "PotentialMonthlySavings",
+    "8": "Recommendation",
+    "9": "Tags",
+}
+_NAT_HEADERS = fields_to_headers(_NAT_FIELDS)
+
+
+@lru_cache(maxsize=1024)
+def _classify_transfer(usage_type: str) -> str:
+    """Classify a usage type such as "USE1-DataTransfer-Out-Bytes".
+    
+    Only whole "-"-delimited tokens count, so "InterZone" or "Intra" never
+    match "In". Usage types repeat across services and periods, so results
+    are cached.
+    
+    Args:
+        usage_type: Cost Explorer USAGE_TYPE value
+    
+    Returns:
+        Transfer type (Outbound, Inbound, Inter-Region, Inter-AZ or Unknown)
+    """
+    tokens = set(_TRANSFER_TOKEN_RE.findall(usage_type))
+    for token, transfer_type in _TRANSFER_TYPES.items():
+        if token in tokens:
+            return transfer_type
+    return "Unknown"
+
+
+@disk_cached
 def analyze_data_transfer_costs(
     session: Any, region_name: str = "us-east-1"
 ) -> dict[str, Any]:
@@ -21,19 +128,23 @@ def analyze_data_transfer_costs(
     Returns:
         Dictionary with data transfer cost analysis
     """
-    ce_client = session.client("ce", region_name="us-east-1")
+    ce_client = get_client(session, "ce", "us-east-1")
     
     output_data = []
+    # Numeric costs kept alongside the formatted rows for aggregation
+    monthly_costs = []
     
     logger.info("Analyzing data transfer costs")
     
     try:
         # Get costs for last 30 days
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+        now = datetime.now(timezone.utc)
+        end_date = now.strftime("%Y-%m-%d")
+        start_date = (now - timedelta(days=30)).strftime("%Y-%m-%d")
         
         # Get data transfer costs by service
-        response = ce_client.get_cost_and_usage(
+        pages = iter_token_pages(
+            ce_client.get_cost_and_usage,
             TimePeriod={"Start": start_date, "End": end_date},
             Granularity="MONTHLY",
             Metrics=["UnblendedCost"],
@@ -44,44 +155,33 @@ def analyze_data_transfer_costs(
             Filter={
                 "Dimensions": {
                     "Key": "USAGE_TYPE_GROUP",
-                    "Values": ["Data Transfer"]
+                    "Values": list(_DATA_TRANSFER_USAGE_TYPE_GROUPS),
                 }
             }
         )
         
-        for result in response.get("ResultsByTime", []):
+        for result in (result for page in pages for result in page.get("ResultsByTime", [])):
             time_period = result.get("TimePeriod", {})
             groups = result.get("Groups", [])
             
             for group in groups:
-                keys = group.get("Keys", [])
-                service = keys[0] if len(keys) > 0 else "N/A"
-                usage_type = keys[1] if len(keys) > 1 else "N/A"
+                service, usage_type, *_ = (*group.get("Keys", ()), "N/A", "N/A")
                 
-                metrics = group.get("Metrics", {})
-                cost = float(metrics.get("UnblendedCost", {}).get("Amount", "0"))
+                try:
+                    cost = float(group["Metrics"]["UnblendedCost"]["Amount"])
+                except (KeyError, TypeError, ValueError):
+                    cost = 0.0
                 
                 if cost > 0:
-                    # Determine transfer type
-                    transfer_type = "Unknown"
-                    if "Out" in usage_type or "DataTransfer-Out" in usage_type:
-                        transfer_type = "Outbound"
-                    elif "In" in usage_type or "DataTransfer-In" in usage_type:
-                        transfer_type = "Inbound"
-                    elif "Regional" in usage_type:
-                        transfer_type = "Inter-Region"
-                    elif "InterZone" in usage_type:
-                        transfer_type = "Inter-AZ"
+                    transfer_type = _classify_transfer(usage_type)
                     
-                    # Determine recommendation
+                    # Recommend a change once the transfer type's cost threshold is exceeded
                     recommendation = ""
-                    if transfer_type == "Outbound" and cost > 100:
-                        recommendation = "Consider CloudFront or S3 Transfer Acceleration"
-                    elif transfer_type == "Inter-Region" and cost > 50:
-                        recommendation = "Consider VPC peering or PrivateLink"
-                    elif transfer_type == "Inter-AZ" and cost > 50:
-                        recommendation = "Review multi-AZ architecture necessity"
+                    rule = _TRANSFER_RECOMMENDATIONS.get(transfer_type)
+                    if rule is not None and cost > rule[0]:
+                        recommendation = rule[1]
                     
+                    monthly_costs.append(cost)
                     output_data.append({
                         "Service": service,
                         "UsageType": usage_type,
@@ -92,26 +192,13 @@ def analyze_data_transfer_costs(
                         "Recommendation": recommendation if recommendation else "Monitor usage",
                     })
         
-        total_monthly_cost = sum(
-            float(item["MonthlyCost"].replace("$", ""))
-            for item in output_data
-        )
-        
-        fields = {
-            "1": "Service",
-            "2": "UsageType",
-            "3": "TransferType",
-            "4": "MonthlyCost",
-            "5": "StartDate",
-            "6": "EndDate",
-            "7": "Recommendation",
-        }
+        total_monthly_cost = fsum(monthly_costs)
         
         return {
             "id": 307,
             "name": "Data Transfer Cost Analysis",
-            "fields": fields,
-            "headers": fields_to_headers(fields),
+            "fields": _DATA_TRANSFER_FIELDS,
+            "headers": _DATA_TRANSFER_HEADERS,
             "count": len(output_data),
             "total_monthly_cost": f"${total_monthly_cost:.2f}",
             "resource": output_data,
@@ -122,6 +209,45 @@ def analyze_data_transfer_costs(
         raise
 
 
+@dataclass(slots=True, frozen=True)
+class NatGatewayRecommendation:
+    """Cost analysis of a single NAT Gateway.
+    
+    Numbers stay numeric for aggregation and are only formatted for display
+    in to_dict().
+    """
+    
+    nat_gateway_id: str
+    vpc_id: str
+    subnet_id: str
+    state: str
+    total_gb_processed: float
+    monthly_hourly_cost: float
+    data_processing_cost: float
+    total_monthly_cost: float
+    potential_savings: float
+    tags: Sequence[dict[str, str]]
+    recommendation: str
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Project the record onto the output fields."""
+        tags = {tag["Key"]: tag["Value"] for tag in self.tags}
+        
+        return {
+            "NatGatewayId": self.nat_gateway_id,
+            "VpcId": self.vpc_id,
+            "SubnetId": self.subnet_id,
+            "State": self.state,
+            "TotalGBProcessed": f"{self.total_gb_processed:.2f}",
+            "MonthlyHourlyCost": f"${self.monthly_hourly_cost:.2f}",
+            "DataProcessingCost": f"${self.data_processing_cost:.2f}",
+            "TotalMonthlyCost": f"${self.total_monthly_cost:.2f}",
+            "PotentialMonthlySavings": f"${self.potential_savings:.2f}",
+            "Tags": dumps_json(tags).decode(),
+            "Recommendation": self.recommendation,
+        }
+
+
 def get_nat_gateway_optimization_recommendations(
     session: Any, region_name: str
 ) -> dict[str, Any]:
@@ -134,126 +260,113 @@ def get_nat_gateway_optimization_recommendations(
     Returns:
         Dictionary with NAT Gateway optimization recommendations
     """
-    ec2_client = session.client("ec2", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    output_data = []
+    records: list[NatGatewayRecommendation] = []
     
     logger.info(f"Getting NAT Gateway optimization recommendations in {region_name}")
     
     try:
         # Get all NAT Gateways
-        response = ec2_client.describe_nat_gateways()
+        paginator = ec2_client.get_paginator("describe_nat_gateways")
+        nat_gateways = [
+            nat_gateway
+            for page in paginator.paginate(PaginationConfig={"PageSize": 1000})
+            for nat_gateway in page["NatGateways"]
+        ]
+        
+        end_time = datetime.now(timezone.utc)
+        start_time = end_time - timedelta(days=30)
         
-        start_time = datetime.now() - timedelta(days=30)
-        end_time = datetime.now()
+        available_gateways = [
+            nat_gateway for nat_gateway in nat_gateways
+            if nat_gateway["State"] == "available"
+        ]
+        
+        # Fetch both traffic metrics for every gateway with batched GetMetricData calls
+        tasks = [
+            (nat_gateway["NatGatewayId"], metric_name)
+            for nat_gateway in available_gateways
+            for metric_name in _NAT_TRAFFIC_METRICS
+        ]
+        queries = [
+            metric_stat_query(
+                f"q{index}",
+                "AWS/NATGateway",
+                metric_name,
+                [{"Name": "NatGatewayId", "Value": nat_gateway_id}],
+                "Sum",
+            )
+            for index, (nat_gateway_id, metric_name) in enumerate(tasks)
+        ]
+        values = get_metric_data_values(cloudwatch_client, queries, start_time, end_time)
+        traffic = {
+            task: sum(values[query["Id"]]) for task, query in zip(tasks, queries)
+        }
         
-        for nat_gateway in response["NatGateways"]:
+        for nat_gateway in available_gateways:
             nat_gateway_id = nat_gateway["NatGatewayId"]
             state = nat_gateway["State"]
             subnet_id = nat_gateway["SubnetId"]
             vpc_id = nat_gateway["VpcId"]
             
-            if state != "available":
-                continue
-            
-            # Check data processed
-            bytes_out_metric = cloudwatch_client.get_metric_statistics(
-                Namespace="AWS/NATGateway",
-                MetricName="BytesOutToDestination",
-                Dimensions=[{"Name": "NatGatewayId", "Value": nat_gateway_id}],
-                StartTime=start_time,
-                EndTime=end_time,
-                Period=86400,
-                Statistics=["Sum"]
-            )
+            total_bytes_out = traffic[nat_gateway_id, "BytesOutToDestination"]
+            total_bytes_in = traffic[nat_gateway_id, "BytesInFromSource"]
             
-            bytes_in_metric = cloudwatch_client.get_metric_statistics(
-                Namespace="AWS/NATGateway",
-                MetricName="BytesInFromSource",
-                Dimensions=[{"Name": "NatGatewayId", "Value": nat_gateway_id}],
-                StartTime=start_time,
-                EndTime=end_time,
-                Period=86400,
-                Statistics=["Sum"]
-            )
-            
-            total_bytes_out = 0
-            total_bytes_in = 0
-            
-            if bytes_out_metric["Datapoints"]:
-                total_bytes_out = sum(dp["Sum"] for dp in bytes_out_metric["Datapoints"])
-            
-            if bytes_in_metric["Datapoints"]:
-                total_bytes_in = sum(dp["Sum"] for dp in bytes_in_metric["Datapoints"])
+            if total_bytes_out == 0 and total_bytes_in == 0:
+                # Idle gateways only cost the hourly charge, all of which is saved
+                records.append(NatGatewayRecommendation(
+                    nat_gateway_id,
+                    vpc_id,
+                    subnet_id,
+                    state,
+                    0.0,
+                    _NAT_MONTHLY_HOURLY_COST,
+                    0.0,
+                    _NAT_MONTHLY_HOURLY_COST,
+                    _NAT_MONTHLY_HOURLY_COST,
+                    nat_gateway.get("Tags", ()),
+                    "Idle - safe to delete",
+                ))
+                continue
             
             total_gb_processed = (total_bytes_out + total_bytes_in) / (1024**3)
             
-            # Calculate costs
-            # NAT Gateway: $0.045/hour + $0.045/GB processed
-            hourly_cost = 0.045
-            monthly_hourly_cost = hourly_cost * 24 * 30
-            data_processing_cost = total_gb_processed * 0.045
-            total_monthly_cost = monthly_hourly_cost + data_processing_cost
-            
-            # Determine recommendation
-            recommendation = ""
-            potential_savings = 0.0
-            
-            if total_gb_processed < 10:
-                recommendation = "Very low usage - consider removing or using VPC endpoints"
-                potential_savings = total_monthly_cost * 0.9
-            elif total_gb_processed < 100:
-                recommendation = "Low usage - consider VPC endpoints for AWS services"
-                potential_savings = data_processing_cost * 0.5
-            else:
-                recommendation = "Consider VPC endpoints to reduce data processing costs"
-                potential_savings = data_processing_cost * 0.3
+            data_processing_cost = total_gb_processed * _NAT_COST_PER_GB
+            total_monthly_cost = _NAT_MONTHLY_HOURLY_COST + data_processing_cost
             
-            # Get tags
-            tags = {tag["Key"]: tag["Value"] for tag in nat_gateway.get("Tags", [])}
+            # Pick the usage tier the processed volume falls into
+            recommendation, savings_rate, of_total_cost = _NAT_USAGE_TIERS[
+                bisect_right(_NAT_USAGE_TIER_LIMITS_GB, total_gb_processed)
+            ]
+            potential_savings = (
+                total_monthly_cost if of_total_cost else data_processing_cost
+            ) * savings_rate
             
-            output_data.append({
-                "NatGatewayId": nat_gateway_id,
-                "VpcId": vpc_id,
-                "SubnetId": subnet_id,
-                "State": state,
-                "TotalGBProcessed": f"{total_gb_processed:.2f}",
-                "MonthlyHourlyCost": f"${monthly_hourly_cost:.2f}",
-                "DataProcessingCost": f"${data_processing_cost:.2f}",
-                "TotalMonthlyCost": f"${total_monthly_cost:.2f}",
-                "PotentialMonthlySavings": f"${potential_savings:.2f}",
-                "Tags": str(tags),
-                "Recommendation": recommendation,
-            })
+            records.append(NatGatewayRecommendation(
+                nat_gateway_id,
+                vpc_id,
+                subnet_id,
+                state,
+                total_gb_processed,
+                _NAT_MONTHLY_HOURLY_COST,
+                data_processing_cost,
+                total_monthly_cost,
+                potential_savings,
+                nat_gateway.get("Tags", ()),
+                recommendation,
+            ))
         
-        total_monthly_cost = sum(
-            float(item["TotalMonthlyCost"].replace("$", ""))
-            for item in output_data
-        )
-        
-        total_potential_savings = sum(
-            float(item["PotentialMonthlySavings"].replace("$", ""))
-            for item in output_data
-        )
-        
-        fields = {
-            "1": "NatGatewayId",
-            "2": "VpcId",
-            "3": "TotalGBProcessed",
-            "4": "MonthlyHourlyCost",
-            "5": "DataProcessingCost",
-            "6": "TotalMonthlyCost",
-            "7": "PotentialMonthlySavings",
-            "8": "Recommendation",
-            "9": "Tags",
-        }
+        total_monthly_cost = fsum(record.total_monthly_cost for record in records)
+        total_potential_savings = fsum(record.potential_savings for record in records)
+        output_data = [record.to_dict() for record in records]
         
         return {
             "id": 308,
             "name": "NAT Gateway Optimization Recommendations",
-            "fields": fields,
-            "headers": fields_to_headers(fields),
+            "fields": _NAT_FIELDS,
+            "headers": _NAT_HEADERS,
             "count": len(output_data),
             "total_monthly_cost": f"${total_monthly_cost:.2f}",
             "total_potential_savings": f"${total_potential_savings:.2f}",
@@ -263,3 +376,18 @@ def get_nat_gateway_optimization_recommendations(
     except Exception as e:
         logger.error(f"Error getting NAT Gateway optimization recommendations: {e}")
         raise
+
+
+def get_nat_gateway_optimization_recommendations_all_regions(
+    session: Any, regions: list[str] | None = None
+) -> dict[str, Any]:
+    """Get NAT Gateway optimization recommendations for several regions at once.
+    
+    Args:
+        session: Boto3 session
+        regions: Region names to scan (default: all enabled regions)
+    
+    Returns:
+        Dictionary with NAT Gateway recommendations, including a Region column
+    """
+    return run_across_regions(get_nat_gateway_optimization_recommendations, session, regions)
@@ -1,14 +1,134 @@
 """Cost savings and optimization recommendation tools for AWS resources."""
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from math import fsum
 from typing import Any
 
-from ..utils.helpers import fields_to_headers
+from ..utils.aws_clients import get_client
+from ..utils.cache import disk_cached
+from ..utils.concurrency import thread_map
+from ..utils.helpers import fields_to_headers, iter_token_pages
 
 logger = logging.getLogger(__name__)
 
+_SAVINGS_PLANS_TYPES = ("COMPUTE_SP", "EC2_INSTANCE_SP", "SAGEMAKER_SP")
 
+# Reservations used less than this percentage of the time are underutilized
+_UNDERUTILIZED_THRESHOLD = 70.0
+
+# Output fields for Savings Plans recommendations
+_SAVINGS_PLANS_FIELDS: dict[str, str] = {
+    "1": "SavingsPlansType",
+    "2": "Region",
+    "3": "InstanceFamily",
+    "4": "HourlyCommitment",
+    "5": "UpfrontCost",
+    "6": "EstimatedMonthlySavings",
+    "7": "EstimatedSavingsPercentage",
+    "8": "EstimatedROI",
+    "9": "CurrentAverageHourlyOnDemandSpend",
+    "10": "OfferingId",
+}
+_SAVINGS_PLANS_HEADERS = fields_to_headers(_SAVINGS_PLANS_FIELDS)
+
+# Output fields for Reserved Instance recommendations
+_RI_RECOMMENDATION_FIELDS: dict[str, str] = {
+    "1": "Service",
+    "2": "InstanceType",
+    "3": "Platform",
+    "4": "Region",
+    "5": "RecommendedNumberOfInstancesToPurchase",
+    "6": "UpfrontCost",
+    "7": "RecurringStandardMonthlyCost",
+    "8": "EstimatedMonthlySavings",
+    "9": "EstimatedSavingsPercentage",
+    "10": "AverageUtilization",
+}
+_RI_RECOMMENDATION_HEADERS = fields_to_headers(_RI_RECOMMENDATION_FIELDS)
+
+# Output fields for Reserved Instance utilization analysis
+_RI_UTILIZATION_FIELDS: dict[str, str] = {
+    "1": "Service",
+    "2": "InstanceType",
+    "3": "StartDate",
+    "4": "EndDate",
+    "5": "UtilizationPercentage",
+    "6": "PurchasedHours",
+    "7": "UsedHours",
+    "8": "UnusedHours",
+    "9": "IsUnderutilized",
+    "10": "TotalAmortizedFee",
+    "11": "NetRISavings",
+}
+_RI_UTILIZATION_HEADERS = fields_to_headers(_RI_UTILIZATION_FIELDS)
+
+
+def _savings_plans_rows(
+    ce_client: Any, sp_type: str
+) -> tuple[list[dict[str, Any]], list[float], str | None]:
+    """Get output rows for one Savings Plans type.
+    
+    Args:
+        ce_client: Cost Explorer client
+        sp_type: Savings Plans type (e.g. COMPUTE_SP)
+    
+    Returns:
+        Tuple of (recommendation rows, estimated monthly savings per row,
+        error message or None if the query succeeded)
+    """
+    rows = []
+    savings = []
+    
+    try:
+        pages = iter_token_pages(
+            ce_client.get_savings_plans_purchase_recommendation,
+            SavingsPlansType=sp_type,
+            LookbackPeriodInDays="SIXTY_DAYS",
+            TermInYears="ONE_YEAR",
+            PaymentOption="NO_UPFRONT"
+        )
+        
+        details = (
+            detail
+            for page in pages
+            for detail in page.get("SavingsPlansPurchaseRecommendation", {}).get(
+                "SavingsPlansPurchaseRecommendationDetails", []
+            )
+        )
+        
+        for detail in details:
+            savings_plans_details = detail.get("SavingsPlansDetails", {})
+            
+            hourly_commitment = detail.get("HourlyCommitmentToPurchase", "0")
+            upfront_cost = detail.get("UpfrontCost", "0")
+            estimated_monthly_savings = detail.get("EstimatedMonthlySavings", "0")
+            estimated_savings_percentage = detail.get("EstimatedSavingsPercentage", "0")
+            estimated_roi = detail.get("EstimatedROI", "0")
+            
+            rows.append({
+                "SavingsPlansType": sp_type,
+                "Region": savings_plans_details.get("Region", "N/A"),
+                "InstanceFamily": savings_plans_details.get("InstanceFamily", "N/A"),
+                "OfferingId": savings_plans_details.get("OfferingId", "N/A"),
+                "HourlyCommitment": f"${float(hourly_commitment):.4f}",
+                "UpfrontCost": f"${float(upfront_cost):.2f}",
+                "EstimatedMonthlySavings": f"${float(estimated_monthly_savings):.2f}",
+                "EstimatedSavingsPercentage": f"{float(estimated_savings_percentage):.2f}%",
+                "EstimatedROI": f"{float(estimated_roi):.2f}%",
+                "CurrentAverageHourlyOnDemandSpend": detail.get("CurrentAverageHourlyOnDemandSpend", "0"),
+                "CurrentMaximumHourlyOnDemandSpend": detail.get("CurrentMaximumHourlyOnDemandSpend", "0"),
+                "CurrentMinimumHourlyOnDemandSpend": detail.get("CurrentMinimumHourlyOnDemandSpend", "0"),
+            })
+            savings.append(float(estimated_monthly_savings))
+    except Exception as e:
+        logger.warning(f"Could not get recommendations for {sp_type}: {e}")
+        return rows, savings, str(e)
+    
+    return rows, savings, None
+
+
+@disk_cached
 def get_savings_plans_recommendations(
     session: Any, region_name: str = "us-east-1"
 ) -> dict[str, Any]:
@@ -21,79 +141,39 @@ def get_savings_plans_recommendations(
     Returns:
         Dictionary with Savings Plans recommendations
     """
-    ce_client = session.client("ce", region_name="us-east-1")
+    ce_client = get_client(session, "ce", "us-east-1")
     
     output_data = []
     
     logger.info("Getting Savings Plans recommendations")
     
     try:
-        # Get recommendations for different Savings Plans types
-        for sp_type in ["COMPUTE_SP", "EC2_INSTANCE_SP", "SAGEMAKER_SP"]:
-            try:
-                response = ce_client.get_savings_plans_purchase_recommendation(
-                    SavingsPlansType=sp_type,
-                    LookbackPeriodInDays="SIXTY_DAYS",
-                    TermInYears="ONE_YEAR",
-                    PaymentOption="NO_UPFRONT"
-                )
-                
-                metadata = response.get("Metadata", {})
-                recommendations = response.get("SavingsPlansPurchaseRecommendation", {})
-                
-                for detail in recommendations.get("SavingsPlansPurchaseRecommendationDetails", []):
-                    savings_plans_details = detail.get("SavingsPlansDetails", {})
-                    
-                    hourly_commitment = detail.get("HourlyCommitmentToPurchase", "0")
-                    upfront_cost = detail.get("UpfrontCost", "0")
-                    estimated_monthly_savings = detail.get("EstimatedMonthlySavings", "0")
-                    estimated_savings_percentage = detail.get("EstimatedSavingsPercentage", "0")
-                    estimated_roi = detail.get("EstimatedROI", "0")
-                    
-                    output_data.append({
-                        "SavingsPlansType": sp_type,
-                        "Region": savings_plans_details.get("Region", "N/A"),
-                        "InstanceFamily": savings_plans_details.get("InstanceFamily", "N/A"),
-                        "OfferingId": savings_plans_details.get("OfferingId", "N/A"),
-                        "HourlyCommitment": f"${float(hourly_commitment):.4f}",
-                        "UpfrontCost": f"${float(upfront_cost):.2f}",
-                        "EstimatedMonthlySavings": f"${float(estimated_monthly_savings):.2f}",
-                        "EstimatedSavingsPercentage": f"{float(estimated_savings_percentage):.2f}%",
-                        "EstimatedROI": f"{float(estimated_roi):.2f}%",
-                        "CurrentAverageHourlyOnDemandSpend": detail.get("CurrentAverageHourlyOnDemandSpend", "0"),
-                        "CurrentMaximumHourlyOnDemandSpend": detail.get("CurrentMaximumHourlyOnDemandSpend", "0"),
-                        "CurrentMinimumHourlyOnDemandSpend": detail.get("CurrentMinimumHourlyOnDemandSpend", "0"),
-                    })
-            except Exception as e:
-                logger.warning(f"Could not get recommendations for {sp_type}: {e}")
-                continue
-        
-        total_monthly_savings = sum(
-            float(item["EstimatedMonthlySavings"].replace("$", "").replace(",", ""))
-            for item in output_data
+        # Query the Savings Plans types concurrently; each one fails independently
+        monthly_savings = []
+        failed_queries = {}
+        results = thread_map(
+            lambda sp_type: _savings_plans_rows(ce_client, sp_type),
+            _SAVINGS_PLANS_TYPES,
+            max_workers=len(_SAVINGS_PLANS_TYPES),
         )
+        for sp_type, (rows, savings, error) in zip(_SAVINGS_PLANS_TYPES, results):
+            output_data.extend(rows)
+            monthly_savings.extend(savings)
+            if error is not None:
+                failed_queries[sp_type] = error
         
-        fields = {
-            "1": "SavingsPlansType",
-            "2": "Region",
-            "3": "InstanceFamily",
-            "4": "HourlyCommitment",
-            "5": "UpfrontCost",
-            "6": "EstimatedMonthlySavings",
-            "7": "EstimatedSavingsPercentage",
-            "8": "EstimatedROI",
-            "9": "CurrentAverageHourlyOnDemandSpend",
-            "10": "OfferingId",
-        }
+        total_monthly_savings = fsum(monthly_savings)
         
         return {
             "id": 302,
             "name": "Savings Plans Recommendations",
-            "fields": fields,
-            "headers": fields_to_headers(fields),
+            "fields": _SAVINGS_PLANS_FIELDS,
+            "headers": _SAVINGS_PLANS_HEADERS,
             "count": len(output_data),
             "total_monthly_savings": f"${total_monthly_savings:.2f}",
             "resource": output_data,
+            # Partial results are returned but not cached (see utils.cache)
+            "failed_queries": failed_queries,
         }
         
     except Exception as e:
@@ -101,6 +181,7 @@ def get_savings_plans_recommendations(
         raise
 
 
+@disk_cached
 def get_reserved_instance_recommendations(
     session: Any, region_name: str = "us-east-1", service: str = "EC2"
 ) -> dict[str, Any]:
@@ -114,22 +195,26 @@ def get_reserved_instance_recommendations(
     Returns:
         Dictionary with Reserved Instance recommendations
     """
-    ce_client = session.client("ce", region_name="us-east-1")
+    ce_client = get_client(session, "ce", "us-east-1")
     
     output_data = []
+    # Numeric savings kept alongside the formatted rows for aggregation
+    monthly_savings = []
     
     logger.info(f"Getting Reserved Instance recommendations for {service}")
     
     try:
-        response = ce_client.get_reservation_purchase_recommendation(
+        pages = iter_token_pages(
+            ce_client.get_reservation_purchase_recommendation,
             Service=service.upper(),
             LookbackPeriodInDays="SIXTY_DAYS",
             TermInYears="ONE_YEAR",
             PaymentOption="NO_UPFRONT"
         )
         
-        metadata = response.get("Metadata", {})
-        recommendations = response.get("Recommendations", [])
+        recommendations = [
+            rec for page in pages for rec in page.get("Recommendations", [])
+        ]
         
         for rec in recommendations:
             rec_details = rec.get("RecommendationDetails", {})
@@ -156,6 +241,7 @@ def get_reserved_instance_recommendations(
             
             rec_summary = rec.get("RecommendationSummary", {})
             
+            monthly_savings.append(float(rec_details.get("EstimatedMonthlySavingsAmount", "0")))
             output_data.append({
                 "Service": service.upper(),
                 "InstanceType": instance_type,
@@ -172,29 +258,13 @@ def get_reserved_instance_recommendations(
                 "MaximumNumberOfInstancesUsedPerHour": rec_details.get('MaximumNumberOfInstancesUsedPerHour', '0'),
             })
         
-        total_monthly_savings = sum(
-            float(item["EstimatedMonthlySavings"].replace("$", "").replace(",", ""))
-            for item in output_data
-        )
-        
-        fields = {
-            "1": "Service",
-            "2": "InstanceType",
-            "3": "Platform",
-            "4": "Region",
-            "5": "RecommendedNumberOfInstancesToPurchase",
-            "6": "UpfrontCost",
-            "7": "RecurringStandardMonthlyCost",
-            "8": "EstimatedMonthlySavings",
-            "9": "EstimatedSavingsPercentage",
-            "10": "AverageUtilization",
-        }
+        total_monthly_savings = fsum(monthly_savings)
         
         return {
             "id": 303,
             "name": f"Reserved Instance Recommendations - {service}",
-            "fields": fields,
-            "headers": fields_to_headers(fields),
+            "fields": _RI_RECOMMENDATION_FIELDS,
+            "headers": _RI_RECOMMENDATION_HEADERS,
             "count": len(output_data),
             "total_monthly_savings": f"${total_monthly_savings:.2f}",
             "resource": output_data,
@@ -205,6 +275,7 @@ def get_reserved_instance_recommendations(
         raise
 
 
+@disk_cached
 def analyze_reserved_instance_utilization(
     session: Any, region_name: str = "us-east-1"
 ) -> dict[str, Any]:
@@ -217,18 +288,23 @@ def analyze_reserved_instance_utilization(
     Returns:
         Dictionary with Reserved Instance utilization analysis
     """
-    ce_client = session.client("ce", region_name="us-east-1")
+    ce_client = get_client(session, "ce", "us-east-1")
     
     output_data = []
+    # Amortized fee and utilization per row, parsed once for aggregation
+    amortized_fees = []
+    utilizations = []
     
     logger.info("Analyzing Reserved Instance utilization")
     
     try:
         # Get utilization for last 30 days
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+        now = datetime.now(timezone.utc)
+        end_date = now.strftime("%Y-%m-%d")
+        start_date = (now - timedelta(days=30)).strftime("%Y-%m-%d")
         
-        response = ce_client.get_reservation_utilization(
+        pages = iter_token_pages(
+            ce_client.get_reservation_utilization,
             TimePeriod={"Start": start_date, "End": end_date},
             Granularity="MONTHLY",
             GroupBy=[
@@ -237,30 +313,34 @@ def analyze_reserved_instance_utilization(
             ]
         )
         
-        for result in response.get("UtilizationsByTime", []):
+        for result in (result for page in pages for result in page.get("UtilizationsByTime", [])):
             time_period = result.get("TimePeriod", {})
             groups = result.get("Groups", [])
             
             for group in groups:
-                keys = group.get("Keys", [])
-                service = keys[0] if len(keys) > 0 else "N/A"
-                instance_type = keys[1] if len(keys) > 1 else "N/A"
+                service, instance_type, *_ = (*group.get("Keys", ()), "N/A", "N/A")
                 
                 utilization = group.get("Utilization", {})
-                utilization_percentage = utilization.get("UtilizationPercentage", "0")
+                try:
+                    utilization_percentage = float(utilization["UtilizationPercentage"])
+                except (KeyError, TypeError, ValueError):
+                    utilization_percentage = 0.0
                 purchased_hours = utilization.get("PurchasedHours", "0")
                 used_hours = utilization.get("UsedHours", "0")
                 unused_hours = utilization.get("UnusedHours", "0")
                 
+                amortized_fees.append(float(utilization.get("TotalAmortizedFee", "0")))
+                utilizations.append(utilization_percentage)
+                
                 # Flag underutilized RIs (< 70% utilization)
-                is_underutilized = float(utilization_percentage) < 70.0
+                is_underutilized = utilization_percentage < _UNDERUTILIZED_THRESHOLD
                 
                 output_data.append({
                     "Service": service,
                     "InstanceType": instance_type,
                     "StartDate": time_period.get("Start", "N/A"),
                     "EndDate": time_period.get("End", "N/A"),
-                    "UtilizationPercentage": f"{float(utilization_percentage):.2f}%",
+                    "UtilizationPercentage": f"{utilization_percentage:.2f}%",
                     "PurchasedHours": f"{float(purchased_hours):.2f}",
                     "UsedHours": f"{float(used_hours):.2f}",
                     "UnusedHours": f"{float(unused_hours):.2f}",
@@ -269,32 +349,18 @@ def analyze_reserved_instance_utilization(
                     "NetRISavings": utilization.get("NetRISavings", "0"),
                 })
         
-        # Calculate wasted spend from underutilized RIs
-        wasted_spend = sum(
-            float(item["TotalAmortizedFee"]) * (1 - float(item["UtilizationPercentage"].replace("%", "")) / 100)
-            for item in output_data
-            if item["IsUnderutilized"] == "Yes"
+        # Calculate wasted spend from underutilized RIs in one pass over the numbers
+        wasted_spend = fsum(
+            fee * (1 - utilization_percentage / 100)
+            for fee, utilization_percentage in zip(amortized_fees, utilizations)
+            if utilization_percentage < _UNDERUTILIZED_THRESHOLD
         )
         
-        fields = {
-            "1": "Service",
-            "2": "InstanceType",
-            "3": "StartDate",
-            "4": "EndDate",
-            "5": "UtilizationPercentage",
-            "6": "PurchasedHours",
-            "7": "UsedHours",
-            "8": "UnusedHours",
-            "9": "IsUnderutilized",
-            "10": "TotalAmortizedFee",
-            "11": "NetRISavings",
-        }
-        
         return {
             "id": 304,
             "name": "Reserved Instance Utilization Analysis",
-            "fields": fields,
-            "headers": fields_to_headers(fields),
+            "fields": _RI_UTILIZATION_FIELDS,
+            "headers": _RI_UTILIZATION_HEADERS,
             "count": len(output_data),
             "wasted_monthly_spend": f"${wasted_spend:.2f}",
             "resource": output_data,
@@ -1,13 +1,138 @@
 """Storage cost optimization tools for AWS resources."""
 
 import logging
-from datetime import datetime, timedelta
+import math
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from statistics import fmean
 from typing import Any
 
+from ..utils.aws_clients import get_client
 from ..utils.helpers import fields_to_headers
+from ..utils.metrics import get_metric_data_values, metric_stat_query
+from ..utils.regions import run_across_regions
 
 logger = logging.getLogger(__name__)
 
+# Monthly EBS pricing per volume type: ($ per GB, $ per provisioned IOPS).
+# gp3 includes a 3,000 IOPS baseline, so provisioned IOPS are not charged.
+_EBS_PRICING = {
+    "gp2": (0.10, 0.0),
+    "gp3": (0.08, 0.0),
+    "io1": (0.125, 0.065),
+    "io2": (0.125, 0.065),
+    "standard": (0.05, 0.0),
+}
+
+# Recommended type per current type, applied while the volume's average
+# ops/second stays below the limit (io2 has the same price as io1 but
+# better durability)
+_EBS_MIGRATIONS = {
+    "gp2": ("gp3", math.inf),
+    "io1": ("io2", 16000),
+    "standard": ("gp3", math.inf),
+}
+
+
+def _ebs_monthly_cost(volume_type: str, size: int, iops: int) -> float:
+    """Estimate the monthly cost of an EBS volume.
+    
+    Args:
+        volume_type: EBS volume type (a key of _EBS_PRICING)
+        size: Volume size in GB
+        iops: Provisioned IOPS
+    
+    Returns:
+        Estimated monthly cost in USD
+    """
+    price_per_gb, price_per_iops = _EBS_PRICING[volume_type]
+    return size * price_per_gb + iops * price_per_iops
+
+
+def _format_tags(tags: Mapping[str, str]) -> str:
+    """Format tags as "key=value" pairs for display."""
+    return ", ".join(f"{key}={value}" for key, value in tags.items()) if tags else "None"
+
+
+@dataclass(slots=True, frozen=True)
+class EbsRecommendation:
+    """Volume type recommendation for a single EBS volume.
+    
+    Numbers stay numeric for aggregation and are only formatted for display
+    in to_dict().
+    """
+    
+    volume_id: str
+    volume_name: str
+    current_type: str
+    recommended_type: str
+    size: int
+    current_iops: int
+    average_iops: float
+    current_monthly_cost: float
+    recommended_monthly_cost: float
+    estimated_savings: float
+    attached_to: str
+    tags: Mapping[str, str]
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Project the record onto the output fields."""
+        return {
+            "VolumeId": self.volume_id,
+            "VolumeName": self.volume_name,
+            "CurrentVolumeType": self.current_type,
+            "RecommendedVolumeType": self.recommended_type,
+            "Size": f"{self.size} GB",
+            "CurrentIOPS": self.current_iops,
+            "AverageIOPS": f"{self.average_iops:.2f}",
+            "CurrentMonthlyCost": f"${self.current_monthly_cost:.2f}",
+            "RecommendedMonthlyCost": f"${self.recommended_monthly_cost:.2f}",
+            "EstimatedMonthlySavings": f"${self.estimated_savings:.2f}",
+            "AttachedTo": self.attached_to,
+            "Tags": _format_tags(self.tags),
+            "Recommendation": f"Change from {self.current_type} to {self.recommended_type}",
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class SnapshotRecommendation:
+    """Lifecycle recommendation for a single EBS snapshot.
+    
+    Numbers stay numeric for aggregation and are only formatted for display
+    in to_dict().
+    """
+    
+    snapshot_id: str
+    volume_id: str
+    volume_exists: bool
+    size: int
+    state: str
+    age_days: int
+    start_time: datetime
+    description: str
+    estimated_monthly_cost: float
+    should_delete: bool
+    tags: Mapping[str, str]
+    recommendation: str
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Project the record onto the output fields."""
+        return {
+            "SnapshotId": self.snapshot_id,
+            "VolumeId": self.volume_id,
+            "VolumeExists": "Yes" if self.volume_exists else "No",
+            "Size": f"{self.size} GB",
+            "State": self.state,
+            "AgeDays": self.age_days,
+            "StartTime": self.start_time.strftime("%Y-%m-%d"),
+            "Description": self.description,
+            "EstimatedMonthlyCost": f"${self.estimated_monthly_cost:.2f}",
+            "ShouldDelete": "Yes" if self.should_delete else "Review",
+            "Tags": _format_tags(self.tags),
+            "Recommendation": self.recommendation,
+        }
+
 
 def get_ebs_volume_type_recommendations(
     session: Any, region_name: str
@@ -21,118 +146,88 @@ def get_ebs_volume_type_recommendations(
     Returns:
         Dictionary with EBS volume type recommendations
     """
-    ec2_client = session.client("ec2", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    output_data = []
+    records: list[EbsRecommendation] = []
+    total_monthly_savings = 0.0
     
     logger.info(f"Getting EBS volume type recommendations in {region_name}")
     
     try:
         # Get all volumes
         paginator = ec2_client.get_paginator("describe_volumes")
+        volumes = [
+            volume
+            for page in paginator.paginate(PaginationConfig={"PageSize": 500})
+            for volume in page["Volumes"]
+        ]
         
-        start_time = datetime.now() - timedelta(days=14)
-        end_time = datetime.now()
+        end_time = datetime.now(timezone.utc)
+        start_time = end_time - timedelta(days=14)
         
-        for page in paginator.paginate():
-            for volume in page["Volumes"]:
-                volume_id = volume["VolumeId"]
-                volume_type = volume["VolumeType"]
-                size = volume["Size"]
-                iops = volume.get("Iops", 0)
-                throughput = volume.get("Throughput", 0)
-                
-                # Check IOPS usage
-                read_ops_metric = cloudwatch_client.get_metric_statistics(
-                    Namespace="AWS/EBS",
-                    MetricName="VolumeReadOps",
-                    Dimensions=[{"Name": "VolumeId", "Value": volume_id}],
-                    StartTime=start_time,
-                    EndTime=end_time,
-                    Period=86400,
-                    Statistics=["Average"]
-                )
-                
-                write_ops_metric = cloudwatch_client.get_metric_statistics(
-                    Namespace="AWS/EBS",
-                    MetricName="VolumeWriteOps",
-                    Dimensions=[{"Name": "VolumeId", "Value": volume_id}],
-                    StartTime=start_time,
-                    EndTime=end_time,
-                    Period=86400,
-                    Statistics=["Average"]
-                )
-                
-                avg_read_ops = 0
-                avg_write_ops = 0
-                
-                if read_ops_metric["Datapoints"]:
-                    avg_read_ops = sum(dp["Average"] for dp in read_ops_metric["Datapoints"]) / len(read_ops_metric["Datapoints"])
-                
-                if write_ops_metric["Datapoints"]:
-                    avg_write_ops = sum(dp["Average"] for dp in write_ops_metric["Datapoints"]) / len(write_ops_metric["Datapoints"])
-                
-                total_ops_per_second = (avg_read_ops + avg_write_ops) / 60  # Convert to per second
-                
-                # Determine recommended volume type
-                recommended_type = volume_type
-                estimated_savings = 0.0
-                current_cost = 0.0
-                recommended_cost = 0.0
-                
-                if volume_type == "gp2":
-                    # GP2 pricing: $0.10/GB-month
-                    current_cost = size * 0.10
-                    # GP3 pricing: $0.08/GB-month + $0.005/provisioned IOPS + $0.04/MB/s throughput
-                    recommended_type = "gp3"
-                    recommended_cost = size * 0.08
-                    estimated_savings = current_cost - recommended_cost
-                elif volume_type == "io1" and total_ops_per_second < 16000:
-                    # IO1 pricing: $0.125/GB-month + $0.065/provisioned IOPS
-                    current_cost = size * 0.125 + iops * 0.065
-                    # IO2 pricing: $0.125/GB-month + $0.065/provisioned IOPS (same price, better durability)
-                    recommended_type = "io2"
-                    recommended_cost = current_cost
-                    estimated_savings = 0
-                elif volume_type == "standard":
-                    # Magnetic pricing: $0.05/GB-month + $0.05/million I/O requests
-                    current_cost = size * 0.05
-                    recommended_type = "gp3"
-                    recommended_cost = size * 0.08
-                    estimated_savings = current_cost - recommended_cost
+        # Fetch read and write ops for every volume in batched requests
+        queries = [
+            metric_stat_query(
+                f"{prefix}{index}",
+                "AWS/EBS",
+                metric_name,
+                [{"Name": "VolumeId", "Value": volume["VolumeId"]}],
+                "Average",
+            )
+            for index, volume in enumerate(volumes)
+            for prefix, metric_name in (("r", "VolumeReadOps"), ("w", "VolumeWriteOps"))
+        ]
+        values = get_metric_data_values(cloudwatch_client, queries, start_time, end_time)
+        
+        for index, volume in enumerate(volumes):
+            volume_id = volume["VolumeId"]
+            volume_type = volume["VolumeType"]
+            size = volume["Size"]
+            iops = volume.get("Iops", 0)
+            
+            read_ops = values[f"r{index}"]
+            write_ops = values[f"w{index}"]
+            avg_read_ops = fmean(read_ops) if read_ops else 0.0
+            avg_write_ops = fmean(write_ops) if write_ops else 0.0
+            
+            total_ops_per_second = (avg_read_ops + avg_write_ops) / 60  # Convert to per second
+            
+            # Determine recommended volume type
+            recommended_type = volume_type
+            estimated_savings = 0.0
+            current_cost = 0.0
+            recommended_cost = 0.0
+            
+            migration = _EBS_MIGRATIONS.get(volume_type)
+            if migration is not None and total_ops_per_second < migration[1]:
+                recommended_type = migration[0]
+                current_cost = _ebs_monthly_cost(volume_type, size, iops)
+                recommended_cost = _ebs_monthly_cost(recommended_type, size, iops)
+                estimated_savings = current_cost - recommended_cost
+            
+            if recommended_type != volume_type or estimated_savings > 0:
+                tags = {tag["Key"]: tag["Value"] for tag in volume.get("Tags") or ()}
+                attachments = volume.get("Attachments") or ()
+                attached_to = attachments[0].get("InstanceId", "N/A") if attachments else "N/A"
                 
-                if recommended_type != volume_type or estimated_savings > 0:
-                    # Get tags
-                    tags = {tag["Key"]: tag["Value"] for tag in volume.get("Tags", [])}
-                    name = tags.get("Name", "N/A")
-                    
-                    # Get attachment info
-                    attachments = volume.get("Attachments", [])
-                    attached_to = "N/A"
-                    if attachments:
-                        attached_to = attachments[0].get("InstanceId", "N/A")
-                    
-                    output_data.append({
-                        "VolumeId": volume_id,
-                        "VolumeName": name,
-                        "CurrentVolumeType": volume_type,
-                        "RecommendedVolumeType": recommended_type,
-                        "Size": f"{size} GB",
-                        "CurrentIOPS": iops,
-                        "AverageIOPS": f"{total_ops_per_second:.2f}",
-                        "CurrentMonthlyCost": f"${current_cost:.2f}",
-                        "RecommendedMonthlyCost": f"${recommended_cost:.2f}",
-                        "EstimatedMonthlySavings": f"${estimated_savings:.2f}",
-                        "AttachedTo": attached_to,
-                        "Tags": str(tags),
-                        "Recommendation": f"Change from {volume_type} to {recommended_type}",
-                    })
+                total_monthly_savings += estimated_savings
+                records.append(EbsRecommendation(
+                    volume_id=volume_id,
+                    volume_name=tags.get("Name", "N/A"),
+                    current_type=volume_type,
+                    recommended_type=recommended_type,
+                    size=size,
+                    current_iops=iops,
+                    average_iops=total_ops_per_second,
+                    current_monthly_cost=current_cost,
+                    recommended_monthly_cost=recommended_cost,
+                    estimated_savings=estimated_savings,
+                    attached_to=attached_to,
+                    tags=tags,
+                ))
         
-        total_monthly_savings = sum(
-            float(item["EstimatedMonthlySavings"].replace("$", ""))
-            for item in output_data
-        )
+        output_data = [record.to_dict() for record in records]
         
         fields = {
             "1": "VolumeId",
@@ -163,6 +258,104 @@ def get_ebs_volume_type_recommendations(
         raise
 
 
+def get_ebs_volume_type_recommendations_all_regions(
+    session: Any, regions: list[str] | None = None
+) -> dict[str, Any]:
+    """Get EBS volume type recommendations for several regions at once.
+    
+    Args:
+        session: Boto3 session
+        regions: Region names to scan (default: all enabled regions)
+    
+    Returns:
+        Dictionary with EBS volume type recommendations, including a Region column
+    """
+    return run_across_regions(get_ebs_volume_type_recommendations, session, regions)
+
+
+def iter_snapshot_recommendations(
+    session: Any, region_name: str, retention_days: int = 30
+) -> Iterator[SnapshotRecommendation]:
+    """Yield snapshot lifecycle recommendations one snapshot at a time.
+    
+    Rows are produced while snapshot pages are read, so callers that stream
+    results elsewhere never hold the whole inventory in memory.
+    
+    Args:
+        session: Boto3 session
+        region_name: AWS region name
+        retention_days: Recommended retention period in days
+    
+    Yields:
+        One record per snapshot that needs attention
+    """
+    ec2_client = get_client(session, "ec2", region_name)
+    now = datetime.now(timezone.utc)
+    
+    # Look up live volumes once instead of describing each snapshot's volume
+    existing_volume_ids = {
+        volume["VolumeId"]
+        for page in ec2_client.get_paginator("describe_volumes").paginate(
+            PaginationConfig={"PageSize": 500}
+        )
+        for volume in page["Volumes"]
+    }
+    
+    # Get all completed snapshots owned by the account; pending and failed
+    # snapshots are not billed as stored snapshots
+    paginator = ec2_client.get_paginator("describe_snapshots")
+    pages = paginator.paginate(
+        OwnerIds=["self"],
+        Filters=[{"Name": "status", "Values": ["completed"]}],
+        PaginationConfig={"PageSize": 1000},
+    )
+    
+    for page in pages:
+        for snapshot in page["Snapshots"]:
+            snapshot_id = snapshot["SnapshotId"]
+            volume_id = snapshot.get("VolumeId", "N/A")
+            start_time = snapshot["StartTime"]
+            volume_size = snapshot["VolumeSize"]
+            state = snapshot["State"]
+            
+            # Calculate age
+            age_days = (now - start_time).days
+            
+            volume_exists = volume_id in existing_volume_ids
+            
+            # Determine recommendation
+            recommendation = ""
+            should_delete = False
+            
+            if age_days > retention_days and not volume_exists:
+                recommendation = f"Delete snapshot (>{retention_days} days old, volume deleted)"
+                should_delete = True
+            elif age_days > retention_days * 2:
+                recommendation = f"Consider deleting snapshot (>{retention_days * 2} days old)"
+                should_delete = True
+            elif not volume_exists:
+                recommendation = "Volume deleted - review if snapshot still needed"
+            
+            if recommendation:
+                tags = {tag["Key"]: tag["Value"] for tag in snapshot.get("Tags") or ()}
+                
+                # Estimated cost is $0.05 per GB-month
+                yield SnapshotRecommendation(
+                    snapshot_id=snapshot_id,
+                    volume_id=volume_id,
+                    volume_exists=volume_exists,
+                    size=volume_size,
+                    state=state,
+                    age_days=age_days,
+                    start_time=start_time,
+                    description=snapshot.get("Description", "N/A"),
+                    estimated_monthly_cost=volume_size * 0.05,
+                    should_delete=should_delete,
+                    tags=tags,
+                    recommendation=recommendation,
+                )
+
+
 def get_snapshot_lifecycle_recommendations(
     session: Any, region_name: str, retention_days: int = 30
 ) -> dict[str, Any]:
@@ -176,76 +369,15 @@ def get_snapshot_lifecycle_recommendations(
     Returns:
         Dictionary with snapshot lifecycle recommendations
     """
-    ec2_client = session.client("ec2", region_name=region_name)
-    
     output_data = []
+    total_monthly_cost = 0.0
     
     logger.info(f"Getting snapshot lifecycle recommendations in {region_name}")
     
     try:
-        # Get all snapshots owned by the account
-        paginator = ec2_client.get_paginator("describe_snapshots")
-        
-        for page in paginator.paginate(OwnerIds=["self"]):
-            for snapshot in page["Snapshots"]:
-                snapshot_id = snapshot["SnapshotId"]
-                volume_id = snapshot.get("VolumeId", "N/A")
-                start_time = snapshot["StartTime"]
-                volume_size = snapshot["VolumeSize"]
-                state = snapshot["State"]
-                
-                # Calculate age
-                age_days = (datetime.now(start_time.tzinfo) - start_time).days
-                
-                # Check if volume still exists
-                volume_exists = False
-                if volume_id != "N/A":
-                    try:
-                        ec2_client.describe_volumes(VolumeIds=[volume_id])
-                        volume_exists = True
-                    except Exception:
-                        volume_exists = False
-                
-                # Determine recommendation
-                recommendation = ""
-                should_delete = False
-                
-                if age_days > retention_days and not volume_exists:
-                    recommendation = f"Delete snapshot (>{retention_days} days old, volume deleted)"
-                    should_delete = True
-                elif age_days > retention_days * 2:
-                    recommendation = f"Consider deleting snapshot (>{retention_days * 2} days old)"
-                    should_delete = True
-                elif not volume_exists:
-                    recommendation = "Volume deleted - review if snapshot still needed"
-                
-                if recommendation:
-                    # Get tags
-                    tags = {tag["Key"]: tag["Value"] for tag in snapshot.get("Tags", [])}
-                    description = snapshot.get("Description", "N/A")
-                    
-                    # Estimate cost ($0.05 per GB-month)
-                    estimated_monthly_cost = volume_size * 0.05
-                    
-                    output_data.append({
-                        "SnapshotId": snapshot_id,
-                        "VolumeId": volume_id,
-                        "VolumeExists": "Yes" if volume_exists else "No",
-                        "Size": f"{volume_size} GB",
-                        "State": state,
-                        "AgeDays": age_days,
-                        "StartTime": start_time.strftime("%Y-%m-%d"),
-                        "Description": description,
-                        "EstimatedMonthlyCost": f"${estimated_monthly_cost:.2f}",
-                        "ShouldDelete": "Yes" if should_delete else "Review",
-                        "Tags": str(tags),
-                        "Recommendation": recommendation,
-                    })
-        
-        total_monthly_cost = sum(
-            float(item["EstimatedMonthlyCost"].replace("$", ""))
-            for item in output_data
-        )
+        for record in iter_snapshot_recommendations(session, region_name, retention_days):
+            output_data.append(record.to_dict())
+            total_monthly_cost += record.estimated_monthly_cost
         
         fields = {
             "1": "SnapshotId",
@@ -273,3 +405,24 @@ def get_snapshot_lifecycle_recommendations(
     except Exception as e:
         logger.error(f"Error getting snapshot lifecycle recommendations: {e}")
         raise
+
+
+def get_snapshot_lifecycle_recommendations_all_regions(
+    session: Any, regions: list[str] | None = None, retention_days: int = 30
+) -> dict[str, Any]:
+    """Get snapshot lifecycle recommendations for several regions at once.
+    
+    Args:
+        session: Boto3 session
+        regions: Region names to scan (default: all enabled regions)
+        retention_days: Recommended retention period in days
+    
+    Returns:
+        Dictionary with snapshot lifecycle recommendations, including a Region column
+    """
+    return run_across_regions(
+        get_snapshot_lifecycle_recommendations,
+        session,
+        regions,
+        retention_days=retention_days,
+    )
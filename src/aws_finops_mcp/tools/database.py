@@ -1,13 +1,134 @@
 """Database cleanup and optimization tools for AWS resources."""
 
 import logging
-from datetime import datetime, timedelta
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from statistics import fmean
 from typing import Any
 
+from ..utils.aws_clients import get_account_id, get_client
+from ..utils.concurrency import thread_map
 from ..utils.helpers import fields_to_headers
+from ..utils.metrics import get_metric_data_values, metric_stat_query
+from ..utils.regions import run_across_regions
 
 logger = logging.getLogger(__name__)
 
+# Consumed capacity metrics, keyed by the query ID prefix used for each
+_CONSUMED_CAPACITY_METRICS = (
+    ("r", "ConsumedReadCapacityUnits"),
+    ("w", "ConsumedWriteCapacityUnits"),
+)
+
+
+# Table descriptions are reused for a few minutes so that running several
+# DynamoDB tools against the same account and region describes each table once
+_TABLE_CACHE_TTL = 300.0
+_table_cache: dict[tuple[str, str], tuple[float, list[dict[str, Any]]]] = {}
+_table_cache_lock = threading.Lock()
+
+
+def _describe_tables(session: Any, region_name: str) -> list[dict[str, Any]]:
+    """Describe every DynamoDB table, skipping tables that cannot be described.
+    
+    Results are cached per account and region for _TABLE_CACHE_TTL seconds,
+    unless the account cannot be looked up or a table could not be described.
+    
+    Args:
+        session: Boto3 session
+        region_name: AWS region name
+    
+    Returns:
+        List of table descriptions
+    """
+    key = None
+    try:
+        key = (get_account_id(session), region_name)
+    except Exception as e:
+        logger.warning(f"Caching disabled for DynamoDB tables: {e}")
+    
+    if key is not None:
+        with _table_cache_lock:
+            cached = _table_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < _TABLE_CACHE_TTL:
+            return cached[1]
+    
+    dynamodb_client = get_client(session, "dynamodb", region_name)
+    
+    def describe(table_name: str) -> dict[str, Any] | None:
+        try:
+            return dynamodb_client.describe_table(TableName=table_name)["Table"]
+        except Exception as e:
+            logger.debug(f"Error describing table {table_name}: {e}")
+            return None
+    
+    # Describe tables concurrently; the shared client is thread-safe
+    table_names = [
+        table_name
+        for page in dynamodb_client.get_paginator("list_tables").paginate(
+            PaginationConfig={"PageSize": 100}
+        )
+        for table_name in page.get("TableNames", [])
+    ]
+    described = thread_map(describe, table_names)
+    tables = [table for table in described if table is not None]
+    
+    # A partial listing would hide the missing tables until the entry expires
+    if key is not None and len(tables) == len(described):
+        with _table_cache_lock:
+            _table_cache[key] = (time.monotonic(), tables)
+    return tables
+
+
+def _consumed_capacity_queries(
+    indexed_tables: Iterable[tuple[int, dict[str, Any]]], stat: str
+) -> list[dict[str, Any]]:
+    """Build read and write consumed capacity queries for each table.
+    
+    Query IDs are "r<index>" and "w<index>", so tables can be skipped
+    without renumbering the others.
+    
+    Args:
+        indexed_tables: (index, table description) pairs, e.g. from enumerate()
+        stat: Statistic to return (e.g. "Sum", "Average")
+    
+    Returns:
+        MetricDataQuery dictionaries
+    """
+    return [
+        metric_stat_query(
+            f"{prefix}{index}",
+            "AWS/DynamoDB",
+            metric_name,
+            [{"Name": "TableName", "Value": table["TableName"]}],
+            stat,
+        )
+        for index, table in indexed_tables
+        for prefix, metric_name in _CONSUMED_CAPACITY_METRICS
+    ]
+
+
+def _is_empty_since(table: dict[str, Any], since: datetime) -> bool:
+    """Check whether a table holds no data and was created before a point in time.
+    
+    Args:
+        table: Table description
+        since: Start of the lookback window
+    
+    Returns:
+        True if the table is empty and older than the window
+    """
+    creation_time = table.get("CreationDateTime")
+    return (
+        table.get("ItemCount", 0) == 0
+        and table.get("TableSizeBytes", 0) == 0
+        and creation_time is not None
+        and creation_time <= since
+    )
+
 
 def find_unused_dynamodb_tables(
     session: Any, region_name: str, period: int = 90
@@ -22,49 +143,43 @@ def find_unused_dynamodb_tables(
     Returns:
         Dictionary with unused DynamoDB tables
     """
-    dynamodb_client = session.client("dynamodb", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    dynamodb_client = get_client(session, "dynamodb", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
-    end_time = datetime.now()
+    end_time = datetime.now(timezone.utc)
+    start_time = end_time - timedelta(days=period)
     output_data = []
+    total_monthly_cost = 0.0
     
     logger.info(f"Finding unused DynamoDB tables in {region_name}")
     
     try:
-        # Get all tables
-        tables_response = dynamodb_client.list_tables()
+        tables = _describe_tables(session, region_name)
+        
+        # Empty tables that predate the window are idle without asking
+        # CloudWatch; fetch consumed capacity for the rest in batched requests
+        values = get_metric_data_values(
+            cloudwatch_client,
+            _consumed_capacity_queries(
+                (
+                    (index, table)
+                    for index, table in enumerate(tables)
+                    if not _is_empty_since(table, start_time)
+                ),
+                "Sum",
+            ),
+            start_time,
+            end_time,
+        )
         
-        for table_name in tables_response.get("TableNames", []):
+        for index, table in enumerate(tables):
+            table_name = table["TableName"]
             try:
-                # Get table details
-                table_response = dynamodb_client.describe_table(TableName=table_name)
-                table = table_response["Table"]
-                
-                # Check CloudWatch metrics for activity
-                has_activity = False
-                for metric_name in ["ConsumedReadCapacityUnits", "ConsumedWriteCapacityUnits"]:
-                    try:
-                        metric_response = cloudwatch_client.get_metric_statistics(
-                            Namespace="AWS/DynamoDB",
-                            MetricName=metric_name,
-                            Dimensions=[{"Name": "TableName", "Value": table_name}],
-                            StartTime=start_time,
-                            EndTime=end_time,
-                            Period=86400,
-                            Statistics=["Sum"],
-                        )
-                        
-                        if metric_response["Datapoints"]:
-                            for datapoint in metric_response["Datapoints"]:
-                                if datapoint.get("Sum", 0) > 0:
-                                    has_activity = True
-                                    break
-                        
-                        if has_activity:
-                            break
-                    except Exception:
-                        pass
+                has_activity = any(
+                    value > 0
+                    for prefix, _ in _CONSUMED_CAPACITY_METRICS
+                    for value in values.get(f"{prefix}{index}", ())
+                )
                 
                 if not has_activity:
                     table_status = table.get("TableStatus", "ACTIVE")
@@ -73,17 +188,14 @@ def find_unused_dynamodb_tables(
                     table_size_gb = table_size_bytes / (1024 ** 3)
                     billing_mode = table.get("BillingModeSummary", {}).get("BillingMode", "PROVISIONED")
                     
-                    # Get provisioned capacity
+                    # Get provisioned capacity and estimate cost
                     read_capacity = 0
                     write_capacity = 0
+                    monthly_cost = 0
                     if billing_mode == "PROVISIONED":
                         provisioned_throughput = table.get("ProvisionedThroughput", {})
                         read_capacity = provisioned_throughput.get("ReadCapacityUnits", 0)
                         write_capacity = provisioned_throughput.get("WriteCapacityUnits", 0)
-                    
-                    # Calculate estimated cost
-                    monthly_cost = 0
-                    if billing_mode == "PROVISIONED":
                         # $0.00065/hour per RCU, $0.00065/hour per WCU
                         monthly_cost = (read_capacity + write_capacity) * 0.00065 * 24 * 30
                     # Storage: $0.25/GB/month
@@ -94,8 +206,8 @@ def find_unused_dynamodb_tables(
                         tags_response = dynamodb_client.list_tags_of_resource(
                             ResourceArn=table["TableArn"]
                         )
-                        tags = tags_response.get("Tags", [])
-                        tags_str = ", ".join([f"{tag['Key']}={tag['Value']}" for tag in tags]) if tags else "None"
+                        tags = tags_response.get("Tags") or ()
+                        tags_str = ", ".join(f"{tag['Key']}={tag['Value']}" for tag in tags) if tags else "None"
                     except Exception:
                         tags_str = "None"
                     
@@ -103,7 +215,7 @@ def find_unused_dynamodb_tables(
                     creation_time = table.get("CreationDateTime")
                     age_days = 0
                     if creation_time:
-                        age_days = (datetime.now(creation_time.tzinfo) - creation_time).days
+                        age_days = (end_time - creation_time).days
                     
                     output_data.append({
                         "TableName": table_name,
@@ -119,17 +231,12 @@ def find_unused_dynamodb_tables(
                         "Tags": tags_str,
                         "Description": f"DynamoDB table with no activity in the last {period} days",
                     })
+                    total_monthly_cost += monthly_cost
             
             except Exception as e:
                 logger.debug(f"Error processing table {table_name}: {e}")
                 continue
         
-        # Calculate total potential savings
-        total_monthly_cost = sum(
-            float(table["EstimatedMonthlyCost"].replace("$", ""))
-            for table in output_data
-        )
-        
         fields = {
             "1": "TableName",
             "2": "TableStatus",
@@ -160,6 +267,58 @@ def find_unused_dynamodb_tables(
         raise
 
 
+def find_unused_dynamodb_tables_all_regions(
+    session: Any, regions: list[str] | None = None, period: int = 90
+) -> dict[str, Any]:
+    """Find unused DynamoDB tables in several regions at once.
+    
+    Args:
+        session: Boto3 session
+        regions: Region names to scan (default: all enabled regions)
+        period: Lookback period in days
+    
+    Returns:
+        Dictionary with unused DynamoDB tables, including a Region column
+    """
+    return run_across_regions(find_unused_dynamodb_tables, session, regions, period=period)
+
+
+@dataclass(slots=True, frozen=True)
+class DynamoRecommendation:
+    """Capacity recommendation for a single provisioned DynamoDB table.
+    
+    Numbers stay numeric for aggregation and are only formatted for display
+    in to_dict().
+    """
+    
+    table_name: str
+    provisioned_read: int
+    provisioned_write: int
+    consumed_read: float
+    consumed_write: float
+    read_utilization: float
+    write_utilization: float
+    avg_utilization: float
+    recommended_action: str
+    estimated_savings: float
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Project the record onto the output fields."""
+        return {
+            "TableName": self.table_name,
+            "BillingMode": "PROVISIONED",
+            "ProvisionedReadCapacity": self.provisioned_read,
+            "ProvisionedWriteCapacity": self.provisioned_write,
+            "ConsumedReadCapacity": f"{self.consumed_read:.2f}",
+            "ConsumedWriteCapacity": f"{self.consumed_write:.2f}",
+            "ReadUtilizationPercent": f"{self.read_utilization:.1f}%",
+            "WriteUtilizationPercent": f"{self.write_utilization:.1f}%",
+            "AvgUtilizationPercent": f"{self.avg_utilization:.1f}%",
+            "RecommendedAction": self.recommended_action,
+            "EstimatedMonthlySavings": f"${self.estimated_savings:.2f}",
+        }
+
+
 def find_underutilized_dynamodb_tables(
     session: Any, region_name: str, period: int = 30
 ) -> dict[str, Any]:
@@ -173,65 +332,47 @@ def find_underutilized_dynamodb_tables(
     Returns:
         Dictionary with underutilized DynamoDB tables
     """
-    dynamodb_client = session.client("dynamodb", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
-    end_time = datetime.now()
-    output_data = []
+    end_time = datetime.now(timezone.utc)
+    start_time = end_time - timedelta(days=period)
+    records: list[DynamoRecommendation] = []
+    total_monthly_savings = 0.0
     
     logger.info(f"Finding underutilized DynamoDB tables in {region_name}")
     
     try:
-        # Get all tables
-        tables_response = dynamodb_client.list_tables()
+        # Only provisioned tables with capacity can be underutilized
+        tables = []
+        for table in _describe_tables(session, region_name):
+            billing_mode = table.get("BillingModeSummary", {}).get("BillingMode", "PROVISIONED")
+            provisioned_throughput = table.get("ProvisionedThroughput", {})
+            if billing_mode == "PROVISIONED" and (
+                provisioned_throughput.get("ReadCapacityUnits", 0)
+                or provisioned_throughput.get("WriteCapacityUnits", 0)
+            ):
+                tables.append(table)
+        
+        # Fetch consumed capacity for every table in batched requests
+        values = get_metric_data_values(
+            cloudwatch_client,
+            _consumed_capacity_queries(enumerate(tables), "Average"),
+            start_time,
+            end_time,
+        )
         
-        for table_name in tables_response.get("TableNames", []):
+        for index, table in enumerate(tables):
+            table_name = table["TableName"]
             try:
-                # Get table details
-                table_response = dynamodb_client.describe_table(TableName=table_name)
-                table = table_response["Table"]
-                
-                billing_mode = table.get("BillingModeSummary", {}).get("BillingMode", "PROVISIONED")
-                
-                # Only check provisioned tables
-                if billing_mode != "PROVISIONED":
-                    continue
-                
                 provisioned_throughput = table.get("ProvisionedThroughput", {})
                 provisioned_read = provisioned_throughput.get("ReadCapacityUnits", 0)
                 provisioned_write = provisioned_throughput.get("WriteCapacityUnits", 0)
                 
-                if provisioned_read == 0 and provisioned_write == 0:
-                    continue
-                
-                # Get consumed capacity from CloudWatch
-                consumed_read = 0
-                consumed_write = 0
-                
-                for metric_name, consumed_var in [
-                    ("ConsumedReadCapacityUnits", "consumed_read"),
-                    ("ConsumedWriteCapacityUnits", "consumed_write")
-                ]:
-                    try:
-                        metric_response = cloudwatch_client.get_metric_statistics(
-                            Namespace="AWS/DynamoDB",
-                            MetricName=metric_name,
-                            Dimensions=[{"Name": "TableName", "Value": table_name}],
-                            StartTime=start_time,
-                            EndTime=end_time,
-                            Period=86400,
-                            Statistics=["Average"],
-                        )
-                        
-                        if metric_response["Datapoints"]:
-                            avg_consumed = sum(dp.get("Average", 0) for dp in metric_response["Datapoints"]) / len(metric_response["Datapoints"])
-                            if metric_name == "ConsumedReadCapacityUnits":
-                                consumed_read = avg_consumed
-                            else:
-                                consumed_write = avg_consumed
-                    except Exception:
-                        pass
+                # Average the daily consumed capacity
+                read_values = values[f"r{index}"]
+                write_values = values[f"w{index}"]
+                consumed_read = fmean(read_values) if read_values else 0.0
+                consumed_write = fmean(write_values) if write_values else 0.0
                 
                 # Calculate utilization
                 read_utilization = (consumed_read / provisioned_read * 100) if provisioned_read > 0 else 0
@@ -254,29 +395,25 @@ def find_underutilized_dynamodb_tables(
                     else:
                         estimated_savings = current_cost * 0.8
                     
-                    output_data.append({
-                        "TableName": table_name,
-                        "BillingMode": billing_mode,
-                        "ProvisionedReadCapacity": provisioned_read,
-                        "ProvisionedWriteCapacity": provisioned_write,
-                        "ConsumedReadCapacity": f"{consumed_read:.2f}",
-                        "ConsumedWriteCapacity": f"{consumed_write:.2f}",
-                        "ReadUtilizationPercent": f"{read_utilization:.1f}%",
-                        "WriteUtilizationPercent": f"{write_utilization:.1f}%",
-                        "AvgUtilizationPercent": f"{avg_utilization:.1f}%",
-                        "RecommendedAction": recommended_action,
-                        "EstimatedMonthlySavings": f"${estimated_savings:.2f}",
-                    })
+                    records.append(DynamoRecommendation(
+                        table_name=table_name,
+                        provisioned_read=provisioned_read,
+                        provisioned_write=provisioned_write,
+                        consumed_read=consumed_read,
+                        consumed_write=consumed_write,
+                        read_utilization=read_utilization,
+                        write_utilization=write_utilization,
+                        avg_utilization=avg_utilization,
+                        recommended_action=recommended_action,
+                        estimated_savings=estimated_savings,
+                    ))
+                    total_monthly_savings += estimated_savings
             
             except Exception as e:
                 logger.debug(f"Error processing table {table_name}: {e}")
                 continue
         
-        # Calculate total potential savings
-        total_monthly_savings = sum(
-            float(table["EstimatedMonthlySavings"].replace("$", ""))
-            for table in output_data
-        )
+        output_data = [record.to_dict() for record in records]
         
         fields = {
             "1": "TableName",
@@ -305,3 +442,21 @@ def find_underutilized_dynamodb_tables(
     except Exception as e:
         logger.error(f"Error finding underutilized DynamoDB tables: {e}")
         raise
+
+
+def find_underutilized_dynamodb_tables_all_regions(
+    session: Any, regions: list[str] | None = None, period: int = 30
+) -> dict[str, Any]:
+    """Find underutilized DynamoDB tables in several regions at once.
+    
+    Args:
+        session: Boto3 session
+        regions: Region names to scan (default: all enabled regions)
+        period: Lookback period in days
+    
+    Returns:
+        Dictionary with underutilized DynamoDB tables, including a Region column
+    """
+    return run_across_regions(
+        find_underutilized_dynamodb_tables, session, regions, period=period
+    )
@@ -1,14 +1,153 @@
 """Governance and tagging tools for AWS resources."""
 
 import logging
+from collections import Counter
+from collections.abc import Iterator
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from math import fsum
+from operator import attrgetter
 from typing import Any
-import json
 
+from ..utils.aws_clients import get_client
+from ..utils.concurrency import thread_map
 from ..utils.helpers import fields_to_headers
+from ..utils.regions import run_across_regions
+from ..utils.tagging_cache import get_all_tagged_resources
 
 logger = logging.getLogger(__name__)
 
+# Cost allocation recommendations, shared by every row
+_COST_REVIEW_RECOMMENDATION = "Review and optimize costs"
+_COST_MONITOR_RECOMMENDATION = "Monitor usage"
+
+_UNTAGGED_FIELDS: dict[str, str] = {
+    "1": "ResourceARN",
+    "2": "Service",
+    "3": "ResourceType",
+    "4": "ResourceId",
+    "5": "MissingTags",
+    "6": "ExistingTags",
+    "7": "Recommendation",
+}
+_UNTAGGED_HEADERS = fields_to_headers(_UNTAGGED_FIELDS)
+
+_COMPLIANCE_FIELDS: dict[str, str] = {
+    "1": "Service",
+    "2": "TotalResources",
+    "3": "CompliantResources",
+    "4": "NonCompliantResources",
+    "5": "ComplianceRate",
+    "6": "RequiredTags",
+    "7": "Recommendation",
+}
+_COMPLIANCE_HEADERS = fields_to_headers(_COMPLIANCE_FIELDS)
+
+_COST_ALLOCATION_FIELDS: dict[str, str] = {
+    "1": "TagKey",
+    "2": "TagValue",
+    "3": "MonthlyCost",
+    "4": "StartDate",
+    "5": "EndDate",
+    "6": "Recommendation",
+}
+_COST_ALLOCATION_HEADERS = fields_to_headers(_COST_ALLOCATION_FIELDS)
+
+
+def _parse_arn(arn: str) -> tuple[str, str, str]:
+    """Extract the service, resource type and resource ID from an ARN.
+    
+    Args:
+        arn: Amazon Resource Name
+    
+    Returns:
+        Tuple of (service, resource type, resource ID); missing parts are "Unknown"
+    """
+    arn_parts = arn.split(":")
+    if len(arn_parts) <= 5:
+        service = arn_parts[2] if len(arn_parts) > 2 else "Unknown"
+        return service, "Unknown", "Unknown"
+    
+    resource = arn_parts[5]
+    return arn_parts[2], resource.partition("/")[0], resource.rpartition("/")[2]
+
+
+def _scan_tags(
+    session: Any, region_name: str, required_tags: list[str]
+) -> Iterator[tuple[str, dict[str, Any] | None]]:
+    """Check every resource in a region against the required tags in one pass.
+    
+    The check runs client-side on the shared inventory: get_resources
+    TagFilters can only select resources that have a key, so finding the
+    ones without it would take an extra full scan per required tag.
+    
+    Args:
+        session: Boto3 session
+        region_name: AWS region name
+        required_tags: List of required tag keys
+    
+    Yields:
+        Tuples of (service, untagged resource row or None if compliant)
+    """
+    required_set = frozenset(required_tags)
+    # Display strings per missing-tag combination; few combinations repeat
+    # across many resources
+    missing_labels: dict[tuple[str, ...], tuple[str, str]] = {}
+    
+    # Get all resources (shared with the other tagging tools for a few minutes)
+    for resource in get_all_tagged_resources(session, region_name):
+        resource_arn = resource["ResourceARN"]
+        resource_tags = resource.get("Tags") or ()
+        
+        service, resource_type, resource_id = _parse_arn(resource_arn)
+        
+        # Check for missing required tags; most resources in a well-tagged
+        # account are compliant, so only their keys are looked at
+        if required_set.issubset(tag["Key"] for tag in resource_tags):
+            yield service, None
+            continue
+        
+        tags = {tag["Key"]: tag["Value"] for tag in resource_tags}
+        missing_tags = tuple(tag for tag in required_tags if tag not in tags)
+        labels = missing_labels.get(missing_tags)
+        if labels is None:
+            joined = ", ".join(missing_tags)
+            labels = missing_labels[missing_tags] = (joined, f"Add missing tags: {joined}")
+        
+        yield service, {
+            "ResourceARN": resource_arn,
+            "Service": service,
+            "ResourceType": resource_type,
+            "ResourceId": resource_id,
+            "MissingTags": labels[0],
+            "ExistingTags": ", ".join(f"{key}={value}" for key, value in tags.items()) if tags else "None",
+            "Recommendation": labels[1],
+        }
+
+
+def iter_untagged_resources(
+    session: Any, region_name: str, required_tags: list[str] | None = None
+) -> Iterator[dict[str, Any]]:
+    """Yield resources without required tags one at a time.
+    
+    Rows are built lazily, but the region's tag inventory itself is read in
+    full first because it is shared with the other tagging tools.
+    
+    Args:
+        session: Boto3 session
+        region_name: AWS region name
+        required_tags: List of required tag keys (default: ["Environment", "Owner", "CostCenter"])
+    
+    Yields:
+        One output row per resource missing a required tag
+    """
+    if required_tags is None:
+        required_tags = ["Environment", "Owner", "CostCenter"]
+    
+    for _, row in _scan_tags(session, region_name, required_tags):
+        if row is not None:
+            yield row
+
 
 def find_untagged_resources(
     session: Any, region_name: str, required_tags: list[str] | None = None
@@ -23,59 +162,16 @@ def find_untagged_resources(
     Returns:
         Dictionary with untagged resources
     """
-    tagging_client = session.client("resourcegroupstaggingapi", region_name=region_name)
-    
-    if required_tags is None:
-        required_tags = ["Environment", "Owner", "CostCenter"]
-    
-    output_data = []
-    
     logger.info(f"Finding untagged resources in {region_name}")
     
     try:
-        # Get all resources
-        paginator = tagging_client.get_paginator("get_resources")
-        
-        for page in paginator.paginate():
-            for resource in page.get("ResourceTagMappingList", []):
-                resource_arn = resource["ResourceARN"]
-                tags = {tag["Key"]: tag["Value"] for tag in resource.get("Tags", [])}
-                
-                # Check for missing required tags
-                missing_tags = [tag for tag in required_tags if tag not in tags]
-                
-                if missing_tags:
-                    # Extract resource type and ID from ARN
-                    arn_parts = resource_arn.split(":")
-                    service = arn_parts[2] if len(arn_parts) > 2 else "Unknown"
-                    resource_type = arn_parts[5].split("/")[0] if len(arn_parts) > 5 else "Unknown"
-                    resource_id = arn_parts[5].split("/")[-1] if len(arn_parts) > 5 else "Unknown"
-                    
-                    output_data.append({
-                        "ResourceARN": resource_arn,
-                        "Service": service,
-                        "ResourceType": resource_type,
-                        "ResourceId": resource_id,
-                        "MissingTags": ", ".join(missing_tags),
-                        "ExistingTags": str(tags),
-                        "Recommendation": f"Add missing tags: {', '.join(missing_tags)}",
-                    })
-        
-        fields = {
-            "1": "ResourceARN",
-            "2": "Service",
-            "3": "ResourceType",
-            "4": "ResourceId",
-            "5": "MissingTags",
-            "6": "ExistingTags",
-            "7": "Recommendation",
-        }
+        output_data = list(iter_untagged_resources(session, region_name, required_tags))
         
         return {
             "id": 701,
             "name": "Untagged Resources",
-            "fields": fields,
-            "headers": fields_to_headers(fields),
+            "fields": _UNTAGGED_FIELDS,
+            "headers": _UNTAGGED_HEADERS,
             "count": len(output_data),
             "resource": output_data,
         }
@@ -85,6 +181,24 @@ def find_untagged_resources(
         raise
 
 
+def find_untagged_resources_all_regions(
+    session: Any, regions: list[str] | None = None, required_tags: list[str] | None = None
+) -> dict[str, Any]:
+    """Find resources without required tags in several regions at once.
+    
+    Args:
+        session: Boto3 session
+        regions: Region names to scan (default: all enabled regions)
+        required_tags: List of required tag keys (default: ["Environment", "Owner", "CostCenter"])
+    
+    Returns:
+        Dictionary with untagged resources, including a Region column
+    """
+    return run_across_regions(
+        find_untagged_resources, session, regions, required_tags=required_tags
+    )
+
+
 def analyze_tag_compliance(
     session: Any, region_name: str, required_tags: list[str] | None = None
 ) -> dict[str, Any]:
@@ -98,8 +212,6 @@ def analyze_tag_compliance(
     Returns:
         Dictionary with tag compliance analysis
     """
-    tagging_client = session.client("resourcegroupstaggingapi", region_name=region_name)
-    
     if required_tags is None:
         required_tags = ["Environment", "Owner", "CostCenter"]
     
@@ -108,46 +220,24 @@ def analyze_tag_compliance(
     logger.info(f"Analyzing tag compliance in {region_name}")
     
     try:
-        # Get all resources
-        paginator = tagging_client.get_paginator("get_resources")
-        
         # Track compliance by service
-        service_stats = {}
-        
-        for page in paginator.paginate():
-            for resource in page.get("ResourceTagMappingList", []):
-                resource_arn = resource["ResourceARN"]
-                tags = {tag["Key"]: tag["Value"] for tag in resource.get("Tags", [])}
-                
-                # Extract service from ARN
-                arn_parts = resource_arn.split(":")
-                service = arn_parts[2] if len(arn_parts) > 2 else "Unknown"
-                
-                if service not in service_stats:
-                    service_stats[service] = {
-                        "total": 0,
-                        "compliant": 0,
-                        "non_compliant": 0
-                    }
-                
-                service_stats[service]["total"] += 1
-                
-                # Check compliance
-                missing_tags = [tag for tag in required_tags if tag not in tags]
-                if not missing_tags:
-                    service_stats[service]["compliant"] += 1
-                else:
-                    service_stats[service]["non_compliant"] += 1
+        total_counts: Counter[str] = Counter()
+        compliant_counts: Counter[str] = Counter()
+        for service, row in _scan_tags(session, region_name, required_tags):
+            total_counts[service] += 1
+            if row is None:
+                compliant_counts[service] += 1
         
         # Generate compliance report
-        for service, stats in service_stats.items():
-            compliance_rate = (stats["compliant"] / stats["total"] * 100) if stats["total"] > 0 else 0
+        for service, total in total_counts.items():
+            compliant = compliant_counts[service]
+            compliance_rate = compliant / total * 100
             
             output_data.append({
                 "Service": service,
-                "TotalResources": stats["total"],
-                "CompliantResources": stats["compliant"],
-                "NonCompliantResources": stats["non_compliant"],
+                "TotalResources": total,
+                "CompliantResources": compliant,
+                "NonCompliantResources": total - compliant,
                 "ComplianceRate": f"{compliance_rate:.2f}%",
                 "RequiredTags": ", ".join(required_tags),
                 "Recommendation": "Implement tag policies and automation" if compliance_rate < 80 else "Maintain current tagging practices",
@@ -156,21 +246,11 @@ def analyze_tag_compliance(
         # Sort by non-compliant count
         output_data.sort(key=lambda x: x["NonCompliantResources"], reverse=True)
         
-        fields = {
-            "1": "Service",
-            "2": "TotalResources",
-            "3": "CompliantResources",
-            "4": "NonCompliantResources",
-            "5": "ComplianceRate",
-            "6": "RequiredTags",
-            "7": "Recommendation",
-        }
-        
         return {
             "id": 702,
             "name": "Tag Compliance Analysis",
-            "fields": fields,
-            "headers": fields_to_headers(fields),
+            "fields": _COMPLIANCE_FIELDS,
+            "headers": _COMPLIANCE_HEADERS,
             "count": len(output_data),
             "resource": output_data,
         }
@@ -180,6 +260,54 @@ def analyze_tag_compliance(
         raise
 
 
+@dataclass(slots=True, frozen=True)
+class TagCostEntry:
+    """Cost of the resources sharing one value of a cost allocation tag.
+    
+    Numbers stay numeric for sorting and totals and are only formatted for
+    display in to_dict().
+    """
+    
+    tag_key: str
+    tag_value: str
+    monthly_cost: float
+    start_date: str
+    end_date: str
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Project the record onto the output fields."""
+        return {
+            "TagKey": self.tag_key,
+            "TagValue": self.tag_value,
+            "MonthlyCost": f"${self.monthly_cost:.2f}",
+            "StartDate": self.start_date,
+            "EndDate": self.end_date,
+            "Recommendation": (
+                _COST_REVIEW_RECOMMENDATION
+                if self.monthly_cost > 1000
+                else _COST_MONITOR_RECOMMENDATION
+            ),
+        }
+
+
+def analyze_tag_compliance_all_regions(
+    session: Any, regions: list[str] | None = None, required_tags: list[str] | None = None
+) -> dict[str, Any]:
+    """Analyze tag compliance in several regions at once.
+    
+    Args:
+        session: Boto3 session
+        regions: Region names to scan (default: all enabled regions)
+        required_tags: List of required tag keys
+    
+    Returns:
+        Dictionary with tag compliance analysis, including a Region column
+    """
+    return run_across_regions(
+        analyze_tag_compliance, session, regions, required_tags=required_tags
+    )
+
+
 def generate_cost_allocation_report(
     session: Any, region_name: str = "us-east-1"
 ) -> dict[str, Any]:
@@ -192,21 +320,21 @@ def generate_cost_allocation_report(
     Returns:
         Dictionary with cost allocation report
     """
-    ce_client = session.client("ce", region_name="us-east-1")
-    
-    output_data = []
+    ce_client = get_client(session, "ce", "us-east-1")
     
     logger.info("Generating cost allocation report")
     
     try:
         # Get costs for last 30 days grouped by tags
-        end_date = datetime.now().strftime("%Y-%m-%d")
-        start_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+        now = datetime.now()
+        end_date = now.strftime("%Y-%m-%d")
+        start_date = (now - timedelta(days=30)).strftime("%Y-%m-%d")
         
         # Common cost allocation tags
         tag_keys = ["Environment", "Owner", "CostCenter", "Project", "Application"]
         
-        for tag_key in tag_keys:
+        def fetch_tag_costs(tag_key: str) -> list[TagCostEntry]:
+            rows = []
             try:
                 response = ce_client.get_cost_and_usage(
                     TimePeriod={"Start": start_date, "End": end_date},
@@ -227,40 +355,31 @@ def generate_cost_allocation_report(
                         cost = float(metrics.get("UnblendedCost", {}).get("Amount", "0"))
                         
                         if cost > 0:
-                            output_data.append({
-                                "TagKey": tag_key,
-                                "TagValue": tag_value,
-                                "MonthlyCost": f"${cost:.2f}",
-                                "StartDate": time_period.get("Start", "N/A"),
-                                "EndDate": time_period.get("End", "N/A"),
-                                "Recommendation": "Review and optimize costs" if cost > 1000 else "Monitor usage",
-                            })
+                            rows.append(TagCostEntry(
+                                tag_key=tag_key,
+                                tag_value=tag_value,
+                                monthly_cost=cost,
+                                start_date=time_period.get("Start", "N/A"),
+                                end_date=time_period.get("End", "N/A"),
+                            ))
             except Exception as e:
                 logger.warning(f"Could not get costs for tag {tag_key}: {e}")
-                continue
+            return rows
         
-        # Sort by cost
-        output_data.sort(key=lambda x: float(x["MonthlyCost"].replace("$", "")), reverse=True)
+        # Query every tag key concurrently; the client retries throttled calls
+        entries = [entry for rows in thread_map(fetch_tag_costs, tag_keys) for entry in rows]
         
-        total_monthly_cost = sum(
-            float(item["MonthlyCost"].replace("$", ""))
-            for item in output_data
-        )
+        # Sort by cost
+        entries.sort(key=attrgetter("monthly_cost"), reverse=True)
         
-        fields = {
-            "1": "TagKey",
-            "2": "TagValue",
-            "3": "MonthlyCost",
-            "4": "StartDate",
-            "5": "EndDate",
-            "6": "Recommendation",
-        }
+        total_monthly_cost = fsum(entry.monthly_cost for entry in entries)
+        output_data = [entry.to_dict() for entry in entries]
         
         return {
             "id": 703,
             "name": "Cost Allocation Report",
-            "fields": fields,
-            "headers": fields_to_headers(fields),
+            "fields": _COST_ALLOCATION_FIELDS,
+            "headers": _COST_ALLOCATION_HEADERS,
             "count": len(output_data),
             "total_monthly_cost": f"${total_monthly_cost:.2f}",
             "resource": output_data,
@@ -1,13 +1,122 @@
 """Messaging service cleanup tools for AWS resources."""
 
 import logging
+import time
 from datetime import datetime, timedelta
 from typing import Any
 
+from ..utils.aws_clients import get_client
+from ..utils.concurrency import thread_map
 from ..utils.helpers import fields_to_headers
+from ..utils.metrics import (
+    LIST_METRICS_WINDOW,
+    get_metric_data_values,
+    list_metric_dimension_values,
+    metric_stat_query,
+)
+from ..utils.regions import run_across_regions
 
 logger = logging.getLogger(__name__)
 
+# SQS activity metrics, keyed by the query ID prefix used for each
+_QUEUE_ACTIVITY_METRICS = (
+    ("s", "NumberOfMessagesSent"),
+    ("r", "NumberOfMessagesReceived"),
+)
+
+_SQS_FIELDS: dict[str, str] = {
+    "1": "QueueName",
+    "2": "QueueUrl",
+    "3": "ApproximateNumberOfMessages",
+    "4": "LastModifiedTimestamp",
+    "5": "MessageRetentionPeriod",
+    "6": "QueueType",
+    "7": "Tags",
+    "8": "Description",
+}
+_SQS_HEADERS = fields_to_headers(_SQS_FIELDS)
+
+_SNS_FIELDS: dict[str, str] = {
+    "1": "TopicName",
+    "2": "TopicArn",
+    "3": "SubscriptionsConfirmed",
+    "4": "SubscriptionsPending",
+    "5": "Owner",
+    "6": "Tags",
+    "7": "Description",
+}
+_SNS_HEADERS = fields_to_headers(_SNS_FIELDS)
+
+_EVENTBRIDGE_FIELDS: dict[str, str] = {
+    "1": "RuleName",
+    "2": "RuleArn",
+    "3": "State",
+    "4": "EventPattern",
+    "5": "ScheduleExpression",
+    "6": "TargetCount",
+    "7": "CreatedTime",
+    "8": "Tags",
+    "9": "Description",
+}
+_EVENTBRIDGE_HEADERS = fields_to_headers(_EVENTBRIDGE_FIELDS)
+
+
+def _active_resources(
+    cloudwatch_client: Any,
+    namespace: str,
+    dimension_name: str,
+    metrics: tuple[tuple[str, str], ...],
+    names: list[str],
+    start_time: datetime,
+    end_time: datetime,
+) -> set[str]:
+    """Find the resources with a positive daily sum for any of the metrics.
+    
+    Resources are queried through batched GetMetricData requests instead of
+    one get_metric_statistics call per resource and metric. For lookbacks of
+    up to LIST_METRICS_WINDOW, ListMetrics first rules out resources that
+    have no recent datapoints at all.
+    
+    Args:
+        cloudwatch_client: Boto3 CloudWatch client
+        namespace: CloudWatch namespace
+        dimension_name: Dimension identifying the resource (e.g. "QueueName")
+        metrics: (query ID prefix, metric name) pairs
+        names: Dimension values of the resources to check
+        start_time: Start time for metrics
+        end_time: End time for metrics
+    
+    Returns:
+        Names of the resources that had activity
+    """
+    # For short lookbacks, resources without any recent metric are idle and
+    # need no GetMetricData query
+    if end_time - start_time <= LIST_METRICS_WINDOW:
+        listed = set().union(*(
+            list_metric_dimension_values(cloudwatch_client, namespace, metric_name, dimension_name)
+            for _, metric_name in metrics
+        ))
+        names = [name for name in names if name in listed]
+    
+    queries = [
+        metric_stat_query(
+            f"{prefix}{index}",
+            namespace,
+            metric_name,
+            [{"Name": dimension_name, "Value": name}],
+            "Sum",
+        )
+        for index, name in enumerate(names)
+        for prefix, metric_name in metrics
+    ]
+    values = get_metric_data_values(cloudwatch_client, queries, start_time, end_time)
+    
+    return {
+        name
+        for index, name in enumerate(names)
+        if any(value > 0 for prefix, _ in metrics for value in values[f"{prefix}{index}"])
+    }
+
 
 def find_unused_sqs_queues(
     session: Any, region_name: str, period: int = 90
@@ -22,28 +131,47 @@ def find_unused_sqs_queues(
     Returns:
         Dictionary with unused SQS queues
     """
-    sqs_client = session.client("sqs", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    sqs_client = get_client(session, "sqs", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
-    output_data = []
+    start_time = end_time - timedelta(days=period)
     
     logger.info(f"Finding unused SQS queues in {region_name}")
     
     try:
         # Get all queues
-        queues_response = sqs_client.list_queues()
-        queue_urls = queues_response.get("QueueUrls", [])
+        queue_urls = [
+            queue_url
+            for page in sqs_client.get_paginator("list_queues").paginate(
+                PaginationConfig={"PageSize": 1000}
+            )
+            for queue_url in page.get("QueueUrls", [])
+        ]
+        
+        # Check CloudWatch metrics for activity in batched requests
+        active_queues = _active_resources(
+            cloudwatch_client,
+            "AWS/SQS",
+            "QueueName",
+            _QUEUE_ACTIVITY_METRICS,
+            [queue_url.split("/")[-1] for queue_url in queue_urls],
+            start_time,
+            end_time,
+        )
         
-        for queue_url in queue_urls:
+        def process_queue(queue_url: str) -> dict[str, Any] | None:
             queue_name = queue_url.split("/")[-1]
             
             try:
                 # Get queue attributes
                 attrs_response = sqs_client.get_queue_attributes(
                     QueueUrl=queue_url,
-                    AttributeNames=["All"]
+                    AttributeNames=[
+                        "ApproximateNumberOfMessages",
+                        "LastModifiedTimestamp",
+                        "MessageRetentionPeriod",
+                    ],
                 )
                 
                 attributes = attrs_response.get("Attributes", {})
@@ -52,32 +180,7 @@ def find_unused_sqs_queues(
                 retention_period = int(attributes.get("MessageRetentionPeriod", 345600))
                 queue_type = "FIFO" if queue_name.endswith(".fifo") else "Standard"
                 
-                # Check CloudWatch metrics for activity
-                has_activity = False
-                for metric_name in ["NumberOfMessagesSent", "NumberOfMessagesReceived"]:
-                    try:
-                        metric_response = cloudwatch_client.get_metric_statistics(
-                            Namespace="AWS/SQS",
-                            MetricName=metric_name,
-                            Dimensions=[{"Name": "QueueName", "Value": queue_name}],
-                            StartTime=start_time,
-                            EndTime=end_time,
-                            Period=86400,
-                            Statistics=["Sum"],
-                        )
-                        
-                        if metric_response["Datapoints"]:
-                            for datapoint in metric_response["Datapoints"]:
-                                if datapoint.get("Sum", 0) > 0:
-                                    has_activity = True
-                                    break
-                        
-                        if has_activity:
-                            break
-                    except Exception:
-                        pass
-                
-                if not has_activity and approx_messages == 0:
+                if approx_messages == 0:
                     # Get tags
                     try:
                         tags_response = sqs_client.list_queue_tags(QueueUrl=queue_url)
@@ -86,37 +189,38 @@ def find_unused_sqs_queues(
                     except Exception:
                         tags_str = "None"
                     
-                    output_data.append({
+                    return {
                         "QueueUrl": queue_url,
                         "QueueName": queue_name,
                         "ApproximateNumberOfMessages": approx_messages,
-                        "LastModifiedTimestamp": datetime.fromtimestamp(int(last_modified)).strftime("%Y-%m-%d %H:%M:%S") if last_modified else "N/A",
+                        "LastModifiedTimestamp": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(int(last_modified))) if last_modified else "N/A",
                         "MessageRetentionPeriod": f"{retention_period // 86400} days",
                         "QueueType": queue_type,
                         "Tags": tags_str,
                         "Description": f"SQS queue with no activity in the last {period} days",
-                    })
+                    }
             
             except Exception as e:
                 logger.debug(f"Error processing queue {queue_name}: {e}")
-                continue
+            return None
         
-        fields = {
-            "1": "QueueName",
-            "2": "QueueUrl",
-            "3": "ApproximateNumberOfMessages",
-            "4": "LastModifiedTimestamp",
-            "5": "MessageRetentionPeriod",
-            "6": "QueueType",
-            "7": "Tags",
-            "8": "Description",
-        }
+        # Look up attributes and tags only for queues without activity,
+        # concurrently; the shared clients are thread-safe
+        idle_queue_urls = [
+            queue_url for queue_url in queue_urls
+            if queue_url.split("/")[-1] not in active_queues
+        ]
+        output_data = [
+            row
+            for row in thread_map(process_queue, idle_queue_urls)
+            if row is not None
+        ]
         
         return {
             "id": 210,
             "name": "Unused SQS Queues",
-            "fields": fields,
-            "headers": fields_to_headers(fields),
+            "fields": _SQS_FIELDS,
+            "headers": _SQS_HEADERS,
             "count": len(output_data),
             "resource": output_data,
         }
@@ -126,6 +230,22 @@ def find_unused_sqs_queues(
         raise
 
 
+def find_unused_sqs_queues_all_regions(
+    session: Any, regions: list[str] | None = None, period: int = 90
+) -> dict[str, Any]:
+    """Find unused SQS queues in several regions at once.
+    
+    Args:
+        session: Boto3 session
+        regions: Region names to scan (default: all enabled regions)
+        period: Lookback period in days
+    
+    Returns:
+        Dictionary with unused SQS queues, including a Region column
+    """
+    return run_across_regions(find_unused_sqs_queues, session, regions, period=period)
+
+
 def find_unused_sns_topics(
     session: Any, region_name: str, period: int = 90
 ) -> dict[str, Any]:
@@ -139,20 +259,34 @@ def find_unused_sns_topics(
     Returns:
         Dictionary with unused SNS topics
     """
-    sns_client = session.client("sns", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    sns_client = get_client(session, "sns", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
-    output_data = []
+    start_time = end_time - timedelta(days=period)
     
     logger.info(f"Finding unused SNS topics in {region_name}")
     
     try:
-        # Get all topics
-        topics_response = sns_client.list_topics()
+        # Get all topics (ListTopics has a fixed page size of 100)
+        topics = [
+            topic
+            for page in sns_client.get_paginator("list_topics").paginate()
+            for topic in page.get("Topics", [])
+        ]
+        
+        # Check CloudWatch metrics for publishes in batched requests
+        published_topics = _active_resources(
+            cloudwatch_client,
+            "AWS/SNS",
+            "TopicName",
+            (("p", "NumberOfMessagesPublished"),),
+            [topic["TopicArn"].split(":")[-1] for topic in topics],
+            start_time,
+            end_time,
+        )
         
-        for topic in topics_response.get("Topics", []):
+        def process_topic(topic: dict[str, Any]) -> dict[str, Any] | None:
             topic_arn = topic["TopicArn"]
             topic_name = topic_arn.split(":")[-1]
             
@@ -165,28 +299,7 @@ def find_unused_sns_topics(
                 subscriptions_pending = int(attributes.get("SubscriptionsPending", 0))
                 owner = attributes.get("Owner", "N/A")
                 
-                # Check CloudWatch metrics for publishes
-                has_publishes = False
-                try:
-                    metric_response = cloudwatch_client.get_metric_statistics(
-                        Namespace="AWS/SNS",
-                        MetricName="NumberOfMessagesPublished",
-                        Dimensions=[{"Name": "TopicName", "Value": topic_name}],
-                        StartTime=start_time,
-                        EndTime=end_time,
-                        Period=86400,
-                        Statistics=["Sum"],
-                    )
-                    
-                    if metric_response["Datapoints"]:
-                        for datapoint in metric_response["Datapoints"]:
-                            if datapoint.get("Sum", 0) > 0:
-                                has_publishes = True
-                                break
-                except Exception:
-                    pass
-                
-                if not has_publishes and subscriptions_confirmed == 0:
+                if subscriptions_confirmed == 0:
                     # Get tags
                     try:
                         tags_response = sns_client.list_tags_for_resource(ResourceArn=topic_arn)
@@ -195,7 +308,7 @@ def find_unused_sns_topics(
                     except Exception:
                         tags_str = "None"
                     
-                    output_data.append({
+                    return {
                         "TopicArn": topic_arn,
                         "TopicName": topic_name,
                         "SubscriptionsConfirmed": subscriptions_confirmed,
@@ -203,27 +316,29 @@ def find_unused_sns_topics(
                         "Owner": owner,
                         "Tags": tags_str,
                         "Description": f"SNS topic with no publishes in the last {period} days",
-                    })
+                    }
             
             except Exception as e:
                 logger.debug(f"Error processing topic {topic_name}: {e}")
-                continue
+            return None
         
-        fields = {
-            "1": "TopicName",
-            "2": "TopicArn",
-            "3": "SubscriptionsConfirmed",
-            "4": "SubscriptionsPending",
-            "5": "Owner",
-            "6": "Tags",
-            "7": "Description",
-        }
+        # Look up attributes and tags only for topics without publishes,
+        # concurrently; the shared clients are thread-safe
+        idle_topics = [
+            topic for topic in topics
+            if topic["TopicArn"].split(":")[-1] not in published_topics
+        ]
+        output_data = [
+            row
+            for row in thread_map(process_topic, idle_topics)
+            if row is not None
+        ]
         
         return {
             "id": 211,
             "name": "Unused SNS Topics",
-            "fields": fields,
-            "headers": fields_to_headers(fields),
+            "fields": _SNS_FIELDS,
+            "headers": _SNS_HEADERS,
             "count": len(output_data),
             "resource": output_data,
         }
@@ -233,6 +348,22 @@ def find_unused_sns_topics(
         raise
 
 
+def find_unused_sns_topics_all_regions(
+    session: Any, regions: list[str] | None = None, period: int = 90
+) -> dict[str, Any]:
+    """Find unused SNS topics in several regions at once.
+    
+    Args:
+        session: Boto3 session
+        regions: Region names to scan (default: all enabled regions)
+        period: Lookback period in days
+    
+    Returns:
+        Dictionary with unused SNS topics, including a Region column
+    """
+    return run_across_regions(find_unused_sns_topics, session, regions, period=period)
+
+
 def find_unused_eventbridge_rules(
     session: Any, region_name: str, period: int = 90
 ) -> dict[str, Any]:
@@ -246,20 +377,36 @@ def find_unused_eventbridge_rules(
     Returns:
         Dictionary with unused EventBridge rules
     """
-    events_client = session.client("events", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    events_client = get_client(session, "events", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
-    output_data = []
+    start_time = end_time - timedelta(days=period)
     
     logger.info(f"Finding unused EventBridge rules in {region_name}")
     
     try:
         # Get all rules
-        rules_response = events_client.list_rules()
+        rules = [
+            rule
+            for page in events_client.get_paginator("list_rules").paginate(
+                PaginationConfig={"PageSize": 100}
+            )
+            for rule in page.get("Rules", [])
+        ]
+        
+        # Check CloudWatch metrics for invocations of enabled rules in batched requests
+        invoked_rules = _active_resources(
+            cloudwatch_client,
+            "AWS/Events",
+            "RuleName",
+            (("i", "Invocations"),),
+            [rule["Name"] for rule in rules if rule.get("State", "ENABLED") != "DISABLED"],
+            start_time,
+            end_time,
+        )
         
-        for rule in rules_response.get("Rules", []):
+        def process_rule(rule: dict[str, Any]) -> dict[str, Any]:
             rule_name = rule["Name"]
             rule_arn = rule["Arn"]
             state = rule.get("State", "ENABLED")
@@ -269,7 +416,7 @@ def find_unused_eventbridge_rules(
             # Check if disabled for long time
             if state == "DISABLED":
                 # Get rule creation time (not directly available, use CloudWatch)
-                output_data.append({
+                return {
                     "RuleName": rule_name,
                     "RuleArn": rule_arn,
                     "State": state,
@@ -279,74 +426,45 @@ def find_unused_eventbridge_rules(
                     "CreatedTime": "N/A",
                     "Tags": "None",
                     "Description": f"EventBridge rule disabled for {period}+ days",
-                })
-            else:
-                # Check CloudWatch metrics for invocations
-                has_invocations = False
-                try:
-                    metric_response = cloudwatch_client.get_metric_statistics(
-                        Namespace="AWS/Events",
-                        MetricName="Invocations",
-                        Dimensions=[{"Name": "RuleName", "Value": rule_name}],
-                        StartTime=start_time,
-                        EndTime=end_time,
-                        Period=86400,
-                        Statistics=["Sum"],
-                    )
-                    
-                    if metric_response["Datapoints"]:
-                        for datapoint in metric_response["Datapoints"]:
-                            if datapoint.get("Sum", 0) > 0:
-                                has_invocations = True
-                                break
-                except Exception:
-                    pass
-                
-                if not has_invocations:
-                    # Get targets count
-                    try:
-                        targets_response = events_client.list_targets_by_rule(Rule=rule_name)
-                        target_count = len(targets_response.get("Targets", []))
-                    except Exception:
-                        target_count = 0
-                    
-                    # Get tags
-                    try:
-                        tags_response = events_client.list_tags_for_resource(ResourceARN=rule_arn)
-                        tags = tags_response.get("Tags", [])
-                        tags_str = ", ".join([f"{tag['Key']}={tag['Value']}" for tag in tags]) if tags else "None"
-                    except Exception:
-                        tags_str = "None"
-                    
-                    output_data.append({
-                        "RuleName": rule_name,
-                        "RuleArn": rule_arn,
-                        "State": state,
-                        "EventPattern": event_pattern[:50] + "..." if len(event_pattern) > 50 else event_pattern,
-                        "ScheduleExpression": schedule_expression,
-                        "TargetCount": target_count,
-                        "CreatedTime": "N/A",
-                        "Tags": tags_str,
-                        "Description": f"EventBridge rule with no invocations in the last {period} days",
-                    })
+                }
+            
+            # Get targets count
+            try:
+                targets_response = events_client.list_targets_by_rule(Rule=rule_name)
+                target_count = len(targets_response.get("Targets", []))
+            except Exception:
+                target_count = 0
+            
+            # Get tags
+            try:
+                tags_response = events_client.list_tags_for_resource(ResourceARN=rule_arn)
+                tags = tags_response.get("Tags", [])
+                tags_str = ", ".join([f"{tag['Key']}={tag['Value']}" for tag in tags]) if tags else "None"
+            except Exception:
+                tags_str = "None"
+            
+            return {
+                "RuleName": rule_name,
+                "RuleArn": rule_arn,
+                "State": state,
+                "EventPattern": event_pattern[:50] + "..." if len(event_pattern) > 50 else event_pattern,
+                "ScheduleExpression": schedule_expression,
+                "TargetCount": target_count,
+                "CreatedTime": "N/A",
+                "Tags": tags_str,
+                "Description": f"EventBridge rule with no invocations in the last {period} days",
+            }
         
-        fields = {
-            "1": "RuleName",
-            "2": "RuleArn",
-            "3": "State",
-            "4": "EventPattern",
-            "5": "ScheduleExpression",
-            "6": "TargetCount",
-            "7": "CreatedTime",
-            "8": "Tags",
-            "9": "Description",
-        }
+        # Skip rules with invocations so targets and tags are only looked up
+        # for idle ones, concurrently; the shared clients are thread-safe
+        idle_rules = [rule for rule in rules if rule["Name"] not in invoked_rules]
+        output_data = thread_map(process_rule, idle_rules)
         
         return {
             "id": 212,
             "name": "Unused EventBridge Rules",
-            "fields": fields,
-            "headers": fields_to_headers(fields),
+            "fields": _EVENTBRIDGE_FIELDS,
+            "headers": _EVENTBRIDGE_HEADERS,
             "count": len(output_data),
             "resource": output_data,
         }
@@ -354,3 +472,21 @@ def find_unused_eventbridge_rules(
     except Exception as e:
         logger.error(f"Error finding unused EventBridge rules: {e}")
         raise
+
+
+def find_unused_eventbridge_rules_all_regions(
+    session: Any, regions: list[str] | None = None, period: int = 90
+) -> dict[str, Any]:
+    """Find unused EventBridge rules in several regions at once.
+    
+    Args:
+        session: Boto3 session
+        regions: Region names to scan (default: all enabled regions)
+        period: Lookback period in days
+    
+    Returns:
+        Dictionary with unused EventBridge rules, including a Region column
+    """
+    return run_across_regions(
+        find_unused_eventbridge_rules, session, regions, period=period
+    )
@@ -1,94 +1,185 @@
 """Monitoring cleanup tools for AWS resources."""
 
 import logging
-from datetime import datetime, timedelta
-from typing import Any, Dict, List
-
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Set, Tuple
+
+from ..utils.aws_clients import get_client
+from ..utils.concurrency import DEFAULT_MAX_WORKERS, thread_map
 from ..utils.helpers import fields_to_headers
+from ..utils.serialization import loads_json
 
 logger = logging.getLogger(__name__)
 
+# State reasons of alarms whose metric's resource has been deleted
+_MISSING_RESOURCE_RE = re.compile(r"does not exist|not found", re.IGNORECASE)
+
+
+@dataclass(slots=True, frozen=True)
+class UnusedAlarm:
+    """A CloudWatch alarm that has not had data for the lookback period.
+    
+    Timestamps and numbers stay raw and are only formatted for display in
+    to_dict().
+    """
+    
+    alarm_name: str
+    alarm_arn: str
+    state_value: str
+    state_reason: str
+    metric_name: str
+    namespace: str
+    actions_enabled: bool
+    alarm_actions_count: int
+    state_updated: datetime | None
+    age_days: int
+    monthly_cost: float
+    tags: str
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Project the record onto the output fields."""
+        state_reason = self.state_reason
+        return {
+            "AlarmName": self.alarm_name,
+            "AlarmArn": self.alarm_arn,
+            "StateValue": self.state_value,
+            "StateReason": state_reason[:100] + "..." if len(state_reason) > 100 else state_reason,
+            "MetricName": self.metric_name,
+            "Namespace": self.namespace,
+            "ActionsEnabled": self.actions_enabled,
+            "AlarmActionsCount": self.alarm_actions_count,
+            "StateUpdatedTimestamp": self.state_updated.strftime("%Y-%m-%d %H:%M:%S") if self.state_updated else "N/A",
+            "AgeDays": self.age_days,
+            "EstimatedMonthlyCost": f"${self.monthly_cost:.2f}",
+            "Tags": self.tags,
+            "Description": f"CloudWatch alarm in {self.state_value} state for {self.age_days}+ days",
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class StaleDashboard:
+    """A CloudWatch dashboard that has not been modified for the lookback period."""
+    
+    dashboard_name: str
+    dashboard_arn: str
+    last_modified: datetime | None
+    age_days: int
+    widget_count: int
+    monthly_cost: float
+    
+    def to_dict(self) -> dict[str, Any]:
+        """Project the record onto the output fields."""
+        return {
+            "DashboardName": self.dashboard_name,
+            "DashboardArn": self.dashboard_arn,
+            "LastModified": self.last_modified.strftime("%Y-%m-%d %H:%M:%S") if self.last_modified else "N/A",
+            "AgeDays": self.age_days,
+            "WidgetCount": self.widget_count,
+            "EstimatedMonthlyCost": f"${self.monthly_cost:.2f}",
+            "Description": f"CloudWatch dashboard not modified in {self.age_days} days",
+        }
+
 
 def find_unused_cloudwatch_alarms(
-    session: Any, region_name: str, period: int = 90
+    session: Any,
+    region_name: str,
+    period: int = 90,
+    max_parallel_requests: int = DEFAULT_MAX_WORKERS,
 ) -> dict[str, Any]:
     """Find CloudWatch alarms in INSUFFICIENT_DATA state for extended period.
     
+    Only INSUFFICIENT_DATA alarms are paged, so alarms on deleted resources
+    are found once they stop receiving data. Alarms that treat missing data
+    as notBreaching, breaching or ignore stay in OK or ALARM and are not
+    reported.
+    
     Args:
         session: Boto3 session
         region_name: AWS region name
         period: Lookback period in days
+        max_parallel_requests: Maximum number of concurrent tag lookups
     
     Returns:
         Dictionary with unused CloudWatch alarms
     """
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    cutoff_date = datetime.now() - timedelta(days=period)
-    output_data = []
+    # Alarm timestamps are timezone-aware, so the scan's clock is too
+    now = datetime.now(timezone.utc)
+    cutoff_date = now - timedelta(days=period)
     
     logger.info(f"Finding unused CloudWatch alarms in {region_name}")
     
     try:
-        # Get all alarms
+        # Get alarms without data; CloudWatch filters by state server-side, and
+        # alarms on deleted resources stop receiving data and end up here too
         paginator = cloudwatch_client.get_paginator("describe_alarms")
+        unused_alarms = []
         
-        for page in paginator.paginate():
+        for page in paginator.paginate(
+            StateValue="INSUFFICIENT_DATA",
+            AlarmTypes=["MetricAlarm", "CompositeAlarm"],
+        ):
             for alarm in page.get("MetricAlarms", []) + page.get("CompositeAlarms", []):
-                alarm_name = alarm["AlarmName"]
-                alarm_arn = alarm["AlarmArn"]
-                state_value = alarm.get("StateValue", "OK")
                 state_reason = alarm.get("StateReason", "")
                 state_updated = alarm.get("StateUpdatedTimestamp")
                 
                 # Check if in INSUFFICIENT_DATA state for long time
                 is_unused = False
-                if state_value == "INSUFFICIENT_DATA":
-                    if state_updated and state_updated < cutoff_date:
-                        is_unused = True
+                if state_updated and state_updated < cutoff_date:
+                    is_unused = True
                 
                 # Also check for alarms referencing deleted resources
-                if "does not exist" in state_reason.lower() or "not found" in state_reason.lower():
+                if _MISSING_RESOURCE_RE.search(state_reason):
                     is_unused = True
                 
                 if is_unused:
-                    # Get alarm details
-                    metric_name = alarm.get("MetricName", "N/A")
-                    namespace = alarm.get("Namespace", "N/A")
-                    actions_enabled = alarm.get("ActionsEnabled", False)
-                    alarm_actions = alarm.get("AlarmActions", [])
-                    
-                    # Calculate age
-                    age_days = 0
-                    if state_updated:
-                        age_days = (datetime.now(state_updated.tzinfo) - state_updated).days
-                    
-                    # CloudWatch alarm cost: $0.10/month per alarm
-                    monthly_cost = 0.10
-                    
-                    # Get tags
-                    try:
-                        tags_response = cloudwatch_client.list_tags_for_resource(ResourceARN=alarm_arn)
-                        tags = tags_response.get("Tags", [])
-                        tags_str = ", ".join([f"{tag['Key']}={tag['Value']}" for tag in tags]) if tags else "None"
-                    except Exception:
-                        tags_str = "None"
-                    
-                    output_data.append({
-                        "AlarmName": alarm_name,
-                        "AlarmArn": alarm_arn,
-                        "StateValue": state_value,
-                        "StateReason": state_reason[:100] + "..." if len(state_reason) > 100 else state_reason,
-                        "MetricName": metric_name,
-                        "Namespace": namespace,
-                        "ActionsEnabled": actions_enabled,
-                        "AlarmActionsCount": len(alarm_actions),
-                        "StateUpdatedTimestamp": state_updated.strftime("%Y-%m-%d %H:%M:%S") if state_updated else "N/A",
-                        "AgeDays": age_days,
-                        "EstimatedMonthlyCost": f"${monthly_cost:.2f}",
-                        "Tags": tags_str,
-                        "Description": f"CloudWatch alarm in {state_value} state for {age_days}+ days",
-                    })
+                    unused_alarms.append(alarm)
+        
+        def fetch_tags(alarm_arn: str) -> str:
+            try:
+                tags_response = cloudwatch_client.list_tags_for_resource(ResourceARN=alarm_arn)
+                tags = tags_response.get("Tags", [])
+                return ", ".join([f"{tag['Key']}={tag['Value']}" for tag in tags]) if tags else "None"
+            except Exception:
+                return "None"
+        
+        # Look up tags for every unused alarm concurrently on the shared client
+        alarm_tags = thread_map(
+            fetch_tags,
+            [alarm["AlarmArn"] for alarm in unused_alarms],
+            max_workers=max_parallel_requests,
+        )
+        
+        records = []
+        for alarm, tags_str in zip(unused_alarms, alarm_tags):
+            state_updated = alarm.get("StateUpdatedTimestamp")
+            
+            # Calculate age
+            age_days = 0
+            if state_updated:
+                age_days = (now - state_updated).days
+            
+            records.append(UnusedAlarm(
+                alarm_name=alarm["AlarmName"],
+                alarm_arn=alarm["AlarmArn"],
+                state_value=alarm.get("StateValue", "OK"),
+                state_reason=alarm.get("StateReason", ""),
+                metric_name=alarm.get("MetricName", "N/A"),
+                namespace=alarm.get("Namespace", "N/A"),
+                actions_enabled=alarm.get("ActionsEnabled", False),
+                alarm_actions_count=len(alarm.get("AlarmActions", [])),
+                state_updated=state_updated,
+                age_days=age_days,
+                # CloudWatch alarm cost: $0.10/month per alarm
+                monthly_cost=0.10,
+                tags=tags_str,
+            ))
+        
+        output_data = [record.to_dict() for record in records]
         
         # Calculate total potential savings
         total_monthly_cost = len(output_data) * 0.10
@@ -137,56 +228,57 @@ def find_orphaned_cloudwatch_dashboards(
     Returns:
         Dictionary with orphaned CloudWatch dashboards
     """
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    output_data = []
+    now = datetime.now(timezone.utc)
     
     logger.info(f"Finding orphaned CloudWatch dashboards in {region_name}")
     
     try:
-        # Get all dashboards
-        dashboards_response = cloudwatch_client.list_dashboards()
-        
-        for dashboard in dashboards_response.get("DashboardEntries", []):
-            dashboard_name = dashboard["DashboardName"]
-            last_modified = dashboard.get("LastModified")
-            
-            try:
-                # Get dashboard details
-                dashboard_response = cloudwatch_client.get_dashboard(DashboardName=dashboard_name)
-                dashboard_body = dashboard_response.get("DashboardBody", "")
-                
-                # Count widgets
-                import json
-                try:
-                    dashboard_json = json.loads(dashboard_body)
-                    widget_count = len(dashboard_json.get("widgets", []))
-                except Exception:
-                    widget_count = 0
+        # Only dashboards old enough are inspected; age comes from the listing
+        old_dashboards = []
+        paginator = cloudwatch_client.get_paginator("list_dashboards")
+        for page in paginator.paginate():
+            for dashboard in page.get("DashboardEntries", []):
+                last_modified = dashboard.get("LastModified")
                 
                 # Calculate age
                 age_days = 0
                 if last_modified:
-                    age_days = (datetime.now(last_modified.tzinfo) - last_modified).days
-                
-                # CloudWatch dashboard cost: $3/month per dashboard
-                monthly_cost = 3.00
+                    age_days = (now - last_modified).days
                 
                 # Check if old enough
                 if age_days >= period:
-                    output_data.append({
-                        "DashboardName": dashboard_name,
-                        "DashboardArn": dashboard.get("DashboardArn", "N/A"),
-                        "LastModified": last_modified.strftime("%Y-%m-%d %H:%M:%S") if last_modified else "N/A",
-                        "AgeDays": age_days,
-                        "WidgetCount": widget_count,
-                        "EstimatedMonthlyCost": f"${monthly_cost:.2f}",
-                        "Description": f"CloudWatch dashboard not modified in {age_days} days",
-                    })
-            
+                    old_dashboards.append((dashboard, age_days))
+        
+        def fetch_body(dashboard_name: str) -> str | None:
+            try:
+                return cloudwatch_client.get_dashboard(DashboardName=dashboard_name).get("DashboardBody", "")
             except Exception as e:
                 logger.debug(f"Error processing dashboard {dashboard_name}: {e}")
+                return None
+        
+        # Get dashboard details concurrently
+        dashboard_bodies = thread_map(
+            fetch_body, [dashboard["DashboardName"] for dashboard, _ in old_dashboards]
+        )
+        
+        records = []
+        for (dashboard, age_days), dashboard_body in zip(old_dashboards, dashboard_bodies):
+            if dashboard_body is None:
                 continue
+            
+            records.append(StaleDashboard(
+                dashboard_name=dashboard["DashboardName"],
+                dashboard_arn=dashboard.get("DashboardArn", "N/A"),
+                last_modified=dashboard.get("LastModified"),
+                age_days=age_days,
+                widget_count=_count_widgets(dashboard_body),
+                # CloudWatch dashboard cost: $3/month per dashboard
+                monthly_cost=3.00,
+            ))
+        
+        output_data = [record.to_dict() for record in records]
         
         # Calculate total potential savings
         total_monthly_cost = len(output_data) * 3.00
@@ -304,16 +396,21 @@ def find_orphaned_cloudwatch_alarms(
         service_data = _get_aws_services_data(session, max_results, region_name)
         
         # Get all CloudWatch alarms
-        cloudwatch_client = session.client('cloudwatch', region_name=region_name)
+        cloudwatch_client = get_client(session, 'cloudwatch', region_name)
         cloudwatch_alarms = _list_alarms_for_aws_resources(cloudwatch_client, max_results)
         
+        # Group alarms by namespace so each check only sees its own alarms
+        alarms_by_namespace: Dict[str, List[Dict]] = defaultdict(list)
+        for alarm in cloudwatch_alarms:
+            alarms_by_namespace[alarm['Namespace']].append(alarm)
+        
         # Check each resource type for orphaned alarms
         output_data = []
         for resource_name, resource_details in input_data.items():
             if resource_name in service_data:
                 for namespace in resource_details['Namespace']:
                     orphaned = _check_alarm_aws_resources_with_resource_list(
-                        resource_details, namespace, cloudwatch_alarms, service_data[resource_name]
+                        resource_details, alarms_by_namespace.get(namespace, []), service_data[resource_name]
                     )
                     output_data.extend(orphaned)
         
@@ -343,197 +440,226 @@ def find_orphaned_cloudwatch_alarms(
         raise
 
 
-def _get_aws_services_data(session: Any, max_results: int, region_name: str) -> Dict[str, List[Dict]]:
-    """Get data for all AWS services to validate alarms against."""
-    ec2_client = session.client('ec2', region_name=region_name)
-    elbv2_client = session.client('elbv2', region_name=region_name)
-    rds_client = session.client('rds', region_name=region_name)
-    ecs_client = session.client('ecs', region_name=region_name)
-    lambda_client = session.client('lambda', region_name=region_name)
-    sqs_client = session.client('sqs', region_name=region_name)
-    
-    service_data = {
-        "EC2Instance": _get_ec2_details(ec2_client, max_results),
-        "RDSCluster": _get_rds_cluster_details(rds_client, max_results),
-        "RDSInstance": _get_rds_instance_details(rds_client, max_results),
-        "LoadBalancer": _get_load_balancer_details(elbv2_client, max_results),
-        "ECSCluster": _get_ecs_cluster_details(ecs_client, max_results),
-        "ECSService": _get_ecs_service_details(ecs_client, max_results),
-        "Lambda": _get_lambda_details(lambda_client, max_results),
-        "LambdaResource": _get_lambda_resource_details(lambda_client, max_results),
-        "SQS": _get_sqs_details(sqs_client, max_results)
-    }
+def _get_aws_services_data(session: Any, max_results: int, region_name: str) -> Dict[str, Set[Tuple[str, ...]]]:
+    """Get data for all AWS services to validate alarms against.
+    
+    Each resource type maps to the set of its resources' dimension values,
+    ordered as in the type's Dimension list in find_orphaned_cloudwatch_alarms.
+    """
+    ec2_client = get_client(session, 'ec2', region_name)
+    elbv2_client = get_client(session, 'elbv2', region_name)
+    rds_client = get_client(session, 'rds', region_name)
+    ecs_client = get_client(session, 'ecs', region_name)
+    lambda_client = get_client(session, 'lambda', region_name)
+    sqs_client = get_client(session, 'sqs', region_name)
+    
+    fetchers = [
+        ("EC2Instance", _get_ec2_details, ec2_client),
+        ("RDSCluster", _get_rds_cluster_details, rds_client),
+        ("RDSInstance", _get_rds_instance_details, rds_client),
+        ("LoadBalancer", _get_load_balancer_details, elbv2_client),
+        ("ECSCluster", _get_ecs_cluster_details, ecs_client),
+        ("ECSService", _get_ecs_service_details, ecs_client),
+        ("Lambda", _get_lambda_details, lambda_client),
+        ("SQS", _get_sqs_details, sqs_client),
+        ("TargetGroup", _get_target_group_details, elbv2_client),
+    ]
+    
+    # Each service is listed independently, so all of them are paged concurrently
+    results = thread_map(
+        lambda fetcher: fetcher[1](fetcher[2], max_results),
+        fetchers,
+        max_workers=len(fetchers),
+    )
+    service_data = {name: result for (name, _, _), result in zip(fetchers, results)}
     
     # Get target groups
-    target_groups, load_balancers_target_group = _get_target_group_details(elbv2_client, max_results)
+    target_groups, load_balancers_target_group = service_data.pop("TargetGroup")
     service_data["TargetGroup"] = target_groups
     service_data["LoadBalancerTargetGroup"] = load_balancers_target_group
     
+    # Get Lambda functions and their versions
+    functions, function_resources = service_data.pop("Lambda")
+    service_data["Lambda"] = functions
+    service_data["LambdaResource"] = function_resources
+    
     return service_data
 
 
-def _get_ec2_details(ec2_client: Any, max_results: int) -> List[Dict]:
-    """Get all EC2 instance IDs."""
-    ec2_details = []
+def _page_config(max_results: int, minimum: int, maximum: int) -> Dict[str, int]:
+    """Build a PaginationConfig whose page size is within the API's accepted range.
+    
+    max_results only sets the page size; every page is still read, so the
+    resource inventory stays complete.
+    """
+    return {'PageSize': min(max(max_results, minimum), maximum)}
+
+
+def _get_ec2_details(ec2_client: Any, max_results: int) -> Set[Tuple[str, ...]]:
+    """Get all EC2 instances as (InstanceId,) keys."""
+    ec2_details = set()
     paginator = ec2_client.get_paginator('describe_instances')
     
-    for page in paginator.paginate(PaginationConfig={'PageSize': max_results}):
+    for page in paginator.paginate(PaginationConfig=_page_config(max_results, 5, 1000)):
         for reservation in page['Reservations']:
             for instance in reservation['Instances']:
-                ec2_details.append({"InstanceId": instance['InstanceId']})
+                ec2_details.add((instance['InstanceId'],))
     
     return ec2_details
 
 
 def _get_target_group_details(elbv2_client: Any, max_results: int) -> tuple:
-    """Get all target groups and their load balancer associations."""
-    targetgroup_details = []
-    target_groups = []
+    """Get (TargetGroup,) keys and (TargetGroup, LoadBalancer) association keys."""
+    targetgroup_details = set()
+    target_groups = set()
     paginator = elbv2_client.get_paginator('describe_target_groups')
     
-    for page in paginator.paginate(PaginationConfig={'PageSize': max_results}):
+    for page in paginator.paginate(PaginationConfig=_page_config(max_results, 1, 400)):
         for target_group in page['TargetGroups']:
             tg_arn_part = "targetgroup/" + target_group['TargetGroupArn'].split("targetgroup/")[1]
-            target_groups.append({"TargetGroup": tg_arn_part})
+            target_groups.add((tg_arn_part,))
             
             for load_balancer in target_group.get("LoadBalancerArns", []):
                 lb_arn_part = load_balancer.split("loadbalancer/")[1]
-                targetgroup_details.append({
-                    "LoadBalancer": lb_arn_part,
-                    "TargetGroup": tg_arn_part
-                })
+                targetgroup_details.add((tg_arn_part, lb_arn_part))
     
     return target_groups, targetgroup_details
 
 
-def _get_load_balancer_details(elbv2_client: Any, max_results: int) -> List[Dict]:
-    """Get all load balancers."""
-    load_balancer_details = []
+def _get_load_balancer_details(elbv2_client: Any, max_results: int) -> Set[Tuple[str, ...]]:
+    """Get all load balancers as (LoadBalancer,) keys."""
+    load_balancer_details = set()
     paginator = elbv2_client.get_paginator('describe_load_balancers')
     
-    for page in paginator.paginate(PaginationConfig={'PageSize': max_results}):
+    for page in paginator.paginate(PaginationConfig=_page_config(max_results, 1, 400)):
         for load_balancer in page['LoadBalancers']:
             lb_arn_part = load_balancer['LoadBalancerArn'].split("loadbalancer/")[1]
-            load_balancer_details.append({"LoadBalancer": lb_arn_part})
+            load_balancer_details.add((lb_arn_part,))
     
     return load_balancer_details
 
 
-def _get_rds_cluster_details(rds_client: Any, max_results: int) -> List[Dict]:
-    """Get all RDS clusters."""
-    rds_details = []
+def _get_rds_cluster_details(rds_client: Any, max_results: int) -> Set[Tuple[str, ...]]:
+    """Get all RDS clusters as (DBClusterIdentifier,) keys."""
+    rds_details = set()
     filters = [{
         'Name': 'engine',
         'Values': ["mysql", "aurora-mysql", "postgres", "aurora-postgresql"]
     }]
     
     paginator = rds_client.get_paginator('describe_db_clusters')
-    for page in paginator.paginate(Filters=filters, PaginationConfig={'PageSize': max_results}):
+    for page in paginator.paginate(Filters=filters, PaginationConfig=_page_config(max_results, 20, 100)):
         for cluster in page['DBClusters']:
-            rds_details.append({'DBClusterIdentifier': cluster['DBClusterIdentifier']})
+            rds_details.add((cluster['DBClusterIdentifier'],))
     
     return rds_details
 
 
-def _get_rds_instance_details(rds_client: Any, max_results: int) -> List[Dict]:
-    """Get all RDS instances."""
-    rds_details = []
+def _get_rds_instance_details(rds_client: Any, max_results: int) -> Set[Tuple[str, ...]]:
+    """Get all RDS instances as (DBInstanceIdentifier,) keys."""
+    rds_details = set()
     filters = [{
         'Name': 'engine',
         'Values': ["mysql", "aurora-mysql", "postgres", "aurora-postgresql"]
     }]
     
     paginator = rds_client.get_paginator('describe_db_instances')
-    for page in paginator.paginate(Filters=filters, PaginationConfig={'PageSize': max_results}):
+    for page in paginator.paginate(Filters=filters, PaginationConfig=_page_config(max_results, 20, 100)):
         for instance in page['DBInstances']:
-            rds_details.append({'DBInstanceIdentifier': instance['DBInstanceIdentifier']})
+            rds_details.add((instance['DBInstanceIdentifier'],))
     
     return rds_details
 
 
-def _get_ecs_cluster_details(ecs_client: Any, max_results: int) -> List[Dict]:
-    """Get all ECS clusters."""
-    ecs_details = []
+def _get_ecs_cluster_details(ecs_client: Any, max_results: int) -> Set[Tuple[str, ...]]:
+    """Get all ECS clusters as (ClusterName,) keys."""
+    ecs_details = set()
     paginator = ecs_client.get_paginator('list_clusters')
     
-    for page in paginator.paginate(PaginationConfig={'PageSize': max_results}):
+    for page in paginator.paginate(PaginationConfig=_page_config(max_results, 1, 100)):
         for cluster_arn in page['clusterArns']:
-            ecs_details.append({"ClusterName": cluster_arn.split("cluster/")[1]})
+            ecs_details.add((cluster_arn.split("cluster/")[1],))
     
     return ecs_details
 
 
-def _get_ecs_service_details(ecs_client: Any, max_results: int) -> List[Dict]:
-    """Get all ECS services across all clusters."""
-    ecs_details = []
+def _get_ecs_service_details(ecs_client: Any, max_results: int) -> Set[Tuple[str, ...]]:
+    """Get all ECS services across all clusters as (ClusterName, ServiceName) keys."""
     cluster_paginator = ecs_client.get_paginator('list_clusters')
-    
-    for cluster_page in cluster_paginator.paginate(PaginationConfig={'PageSize': max_results}):
-        for cluster_arn in cluster_page['clusterArns']:
-            cluster_name = cluster_arn.split("cluster/")[1]
-            service_paginator = ecs_client.get_paginator('list_services')
-            
+    cluster_arns = [
+        cluster_arn
+        for cluster_page in cluster_paginator.paginate(PaginationConfig=_page_config(max_results, 1, 100))
+        for cluster_arn in cluster_page['clusterArns']
+    ]
+    
+    def list_cluster_services(cluster_arn: str) -> List[Tuple[str, str]]:
+        cluster_name = cluster_arn.split("cluster/")[1]
+        service_paginator = ecs_client.get_paginator('list_services')
+        return [
+            (cluster_name, service_arn.split("/")[-1])
             for service_page in service_paginator.paginate(
                 cluster=cluster_arn,
-                PaginationConfig={'PageSize': max_results}
-            ):
-                for service_arn in service_page['serviceArns']:
-                    ecs_details.append({
-                        "ClusterName": cluster_name,
-                        "ServiceName": service_arn.split("/")[-1]
-                    })
-    
-    return ecs_details
+                PaginationConfig=_page_config(max_results, 1, 100)
+            )
+            for service_arn in service_page['serviceArns']
+        ]
+    
+    # Page each cluster's services concurrently
+    return {
+        service
+        for services in thread_map(list_cluster_services, cluster_arns)
+        for service in services
+    }
 
 
-def _get_lambda_details(lambda_client: Any, max_results: int) -> List[Dict]:
-    """Get all Lambda functions."""
-    lambda_details = []
-    paginator = lambda_client.get_paginator('list_functions')
+def _get_lambda_details(lambda_client: Any, max_results: int) -> tuple:
+    """Get (FunctionName,) keys and (FunctionName, Resource) version keys.
     
-    for page in paginator.paginate(PaginationConfig={'PageSize': max_results}):
-        for function in page['Functions']:
-            lambda_details.append({"FunctionName": function["FunctionName"]})
+    Functions are listed once and feed both the function and the version
+    lookups.
+    """
+    function_paginator = lambda_client.get_paginator('list_functions')
+    function_names = [
+        function["FunctionName"]
+        for function_page in function_paginator.paginate(PaginationConfig=_page_config(max_results, 1, 50))
+        for function in function_page['Functions']
+    ]
+    
+    def list_function_versions(function_name: str) -> List[Tuple[str, str]]:
+        lambda_details = []
+        version_paginator = lambda_client.get_paginator('list_versions_by_function')
+        
+        for version_page in version_paginator.paginate(
+            FunctionName=function_name,
+            PaginationConfig=_page_config(max_results, 1, 50)
+        ):
+            for version_function in version_page['Versions']:
+                if version_function["Version"] == "$LATEST":
+                    resource_name = version_function["FunctionName"]
+                else:
+                    resource_name = f"{version_function['FunctionName']}:{version_function['Version']}"
+                
+                lambda_details.append((version_function["FunctionName"], resource_name))
+        
+        return lambda_details
     
-    return lambda_details
+    # Page each function's versions concurrently
+    lambda_resources = {
+        version
+        for versions in thread_map(list_function_versions, function_names)
+        for version in versions
+    }
+    return {(function_name,) for function_name in function_names}, lambda_resources
 
 
-def _get_lambda_resource_details(lambda_client: Any, max_results: int) -> List[Dict]:
-    """Get all Lambda function versions and aliases."""
-    lambda_details = []
-    function_paginator = lambda_client.get_paginator('list_functions')
-    
-    for function_page in function_paginator.paginate(PaginationConfig={'PageSize': max_results}):
-        for function in function_page['Functions']:
-            function_name = function["FunctionName"]
-            version_paginator = lambda_client.get_paginator('list_versions_by_function')
-            
-            for version_page in version_paginator.paginate(
-                FunctionName=function_name,
-                PaginationConfig={'PageSize': max_results}
-            ):
-                for version_function in version_page['Versions']:
-                    if version_function["Version"] == "$LATEST":
-                        resource_name = version_function["FunctionName"]
-                    else:
-                        resource_name = f"{version_function['FunctionName']}:{version_function['Version']}"
-                    
-                    lambda_details.append({
-                        "FunctionName": version_function["FunctionName"],
-                        "Resource": resource_name
-                    })
-    
-    return lambda_details
-
-
-def _get_sqs_details(sqs_client: Any, max_results: int) -> List[Dict]:
-    """Get all SQS queues."""
-    sqs_details = []
+def _get_sqs_details(sqs_client: Any, max_results: int) -> Set[Tuple[str, ...]]:
+    """Get all SQS queues as (QueueName,) keys."""
+    sqs_details = set()
     paginator = sqs_client.get_paginator('list_queues')
     
-    for page in paginator.paginate(PaginationConfig={'PageSize': max_results}):
+    for page in paginator.paginate(PaginationConfig=_page_config(max_results, 1, 1000)):
         for queue_url in page.get('QueueUrls', []):
-            sqs_details.append({"QueueName": queue_url.split("/")[-1]})
+            sqs_details.add((queue_url.split("/")[-1],))
     
     return sqs_details
 
@@ -543,77 +669,80 @@ def _list_alarms_for_aws_resources(cloudwatch_client: Any, max_results: int) ->
     cloudwatch_alarms = []
     paginator = cloudwatch_client.get_paginator('describe_alarms')
     
-    for page in paginator.paginate(PaginationConfig={'PageSize': max_results}):
+    for page in paginator.paginate(PaginationConfig=_page_config(max_results, 1, 100)):
         for alarm in page['MetricAlarms']:
             if "Namespace" in alarm:
-                cloudwatch_alarms.append({
-                    "AlarmName": alarm["AlarmName"],
-                    "Namespace": alarm["Namespace"],
-                    "Dimensions": alarm.get("Dimensions", [])
-                })
+                cloudwatch_alarms.append(
+                    _alarm_entry(alarm["AlarmName"], alarm["Namespace"], alarm.get("Dimensions", []))
+                )
             elif "Metrics" in alarm:
                 for metric in alarm["Metrics"]:
                     if "MetricStat" in metric:
-                        cloudwatch_alarms.append({
-                            "AlarmName": alarm["AlarmName"],
-                            "Namespace": metric["MetricStat"]["Metric"]["Namespace"],
-                            "Dimensions": metric["MetricStat"]["Metric"].get("Dimensions", [])
-                        })
+                        cloudwatch_alarms.append(_alarm_entry(
+                            alarm["AlarmName"],
+                            metric["MetricStat"]["Metric"]["Namespace"],
+                            metric["MetricStat"]["Metric"].get("Dimensions", [])
+                        ))
     
     return cloudwatch_alarms
 
 
+def _alarm_entry(alarm_name: str, namespace: str, dimensions: List[Dict]) -> Dict:
+    """Build an alarm entry, mapping its dimensions by name once for every check."""
+    return {
+        "AlarmName": alarm_name,
+        "Namespace": namespace,
+        "Dimensions": dimensions,
+        "DimensionMap": {dimension['Name']: dimension['Value'] for dimension in dimensions}
+    }
+
+
 def _check_alarm_aws_resources_with_resource_list(
     resource_details: Dict,
-    namespace: str,
     alarms: List[Dict],
-    service_data: List[Dict]
+    resource_index: Set[Tuple[str, ...]]
 ) -> List[Dict]:
-    """Check if alarms reference resources that no longer exist."""
+    """Check if alarms in one namespace reference resources that no longer exist."""
     unused_alarms = []
+    if not alarms:
+        return unused_alarms
+    
     dimensions = resource_details['Dimension']
-    exclude_dimension = resource_details['ExcludeDimension']
+    required_dimensions = frozenset(dimensions)
+    exclude_dimension = frozenset(resource_details['ExcludeDimension'])
+    # With no resources of this type, every applicable alarm is orphaned
+    no_resources = not resource_index
     
     for alarm in alarms:
-        if alarm['Namespace'] == namespace:
-            alarm_dimensions = {dimension['Name']: dimension['Value'] for dimension in alarm['Dimensions']}
-            
-            # Check if all required dimensions are present
-            all_dimension_present = []
-            for resource_dimension in dimensions:
-                all_dimension_present.append(resource_dimension in alarm_dimensions)
-            
-            # Check if excluded dimensions are absent
-            for resource_dimension in exclude_dimension:
-                if resource_dimension in alarm_dimensions:
-                    all_dimension_present.append(False)
-            
-            dimension_present = all(all_dimension_present)
+        alarm_dimensions = alarm['DimensionMap']
+        
+        # Only alarms with all required dimensions and no excluded ones apply
+        if not required_dimensions.issubset(alarm_dimensions) or not exclude_dimension.isdisjoint(alarm_dimensions):
+            continue
+        
+        # Check if resource exists
+        if no_resources or tuple(alarm_dimensions[dimension] for dimension in dimensions) not in resource_index:
+            # Format dimensions for display
+            dim_str = ", ".join([f"{k}={v}" for k, v in alarm_dimensions.items()])
             
-            if dimension_present:
-                # Check if resource exists
-                resource_present = False
-                for resource in service_data:
-                    all_resource_present = []
-                    for resource_dimension in dimensions:
-                        if alarm_dimensions.get(resource_dimension) == resource.get(resource_dimension):
-                            all_resource_present.append(True)
-                        else:
-                            all_resource_present.append(False)
-                    
-                    resource_present = all(all_resource_present)
-                    if resource_present:
-                        break
-                
-                if not resource_present:
-                    # Format dimensions for display
-                    dim_str = ", ".join([f"{k}={v}" for k, v in alarm_dimensions.items()])
-                    
-                    unused_alarms.append({
-                        "AlarmName": alarm['AlarmName'],
-                        "Namespace": alarm['Namespace'],
-                        "Dimensions": dim_str,
-                        "Description": "Alarm not associated with any active resource"
-                    })
+            unused_alarms.append({
+                "AlarmName": alarm['AlarmName'],
+                "Namespace": alarm['Namespace'],
+                "Dimensions": dim_str,
+                "Description": "Alarm not associated with any active resource"
+            })
     
     return unused_alarms
+
+
+def _count_widgets(dashboard_body: str) -> int:
+    """Count the widgets in a dashboard body, or 0 if it cannot be parsed."""
+    # Empty dashboards skip the parse; widget properties can have their own
+    # "type" keys, so counting those instead of parsing would overcount
+    if '"widgets"' not in dashboard_body:
+        return 0
+    
+    try:
+        return len(loads_json(dashboard_body).get("widgets", []))
+    except Exception:
+        return 0
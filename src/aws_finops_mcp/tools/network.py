@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+from ..utils.aws_clients import get_client
 from ..utils.helpers import fields_to_headers
 
 logger = logging.getLogger(__name__)
@@ -23,11 +24,11 @@ def find_unused_nat_gateways(
     Returns:
         Dictionary with unused NAT Gateways
     """
-    ec2_client = session.client("ec2", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     output_data = []
     
     logger.info(f"Finding unused NAT Gateways in {region_name}")
@@ -174,11 +175,11 @@ def find_unused_vpc_endpoints(
     Returns:
         Dictionary with unused VPC endpoints
     """
-    ec2_client = session.client("ec2", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     output_data = []
     
     logger.info(f"Finding unused VPC endpoints in {region_name}")
@@ -334,7 +335,7 @@ def find_unused_internet_gateways(
     Returns:
         Dictionary with unused Internet Gateways
     """
-    ec2_client = session.client("ec2", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
     
     output_data = []
     
@@ -427,11 +428,11 @@ def find_unused_cloudfront_distributions(
     Returns:
         Dictionary with unused CloudFront distributions
     """
-    cloudfront_client = session.client("cloudfront", region_name="us-east-1")
-    cloudwatch_client = session.client("cloudwatch", region_name="us-east-1")
+    cloudfront_client = get_client(session, "cloudfront", "us-east-1")
+    cloudwatch_client = get_client(session, "cloudwatch", "us-east-1")
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     output_data = []
     
     logger.info("Finding unused CloudFront distributions")
@@ -532,11 +533,11 @@ def find_unused_route53_hosted_zones(
     Returns:
         Dictionary with unused Route53 hosted zones
     """
-    route53_client = session.client("route53", region_name="us-east-1")
-    cloudwatch_client = session.client("cloudwatch", region_name="us-east-1")
+    route53_client = get_client(session, "route53", "us-east-1")
+    cloudwatch_client = get_client(session, "cloudwatch", "us-east-1")
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     output_data = []
     
     logger.info("Finding unused Route53 hosted zones")
@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+from ..utils.aws_clients import get_client
 from ..utils.helpers import fields_to_headers
 
 logger = logging.getLogger(__name__)
@@ -22,9 +23,9 @@ def analyze_lambda_cold_starts(
     Returns:
         Dictionary with Lambda cold start analysis
     """
-    lambda_client = session.client("lambda", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
-    logs_client = session.client("logs", region_name=region_name)
+    lambda_client = get_client(session, "lambda", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
+    logs_client = get_client(session, "logs", region_name)
     
     output_data = []
     
@@ -34,8 +35,8 @@ def analyze_lambda_cold_starts(
         # Get all Lambda functions
         paginator = lambda_client.get_paginator("list_functions")
         
-        start_time = datetime.now() - timedelta(days=period)
         end_time = datetime.now()
+        start_time = end_time - timedelta(days=period)
         
         for page in paginator.paginate():
             for function in page["Functions"]:
@@ -129,8 +130,8 @@ def analyze_api_gateway_performance(
     Returns:
         Dictionary with API Gateway performance analysis
     """
-    apigateway_client = session.client("apigateway", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    apigateway_client = get_client(session, "apigateway", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
     output_data = []
     
@@ -140,8 +141,8 @@ def analyze_api_gateway_performance(
         # Get all REST APIs
         apis_response = apigateway_client.get_rest_apis()
         
-        start_time = datetime.now() - timedelta(days=period)
         end_time = datetime.now()
+        start_time = end_time - timedelta(days=period)
         
         for api in apis_response.get("items", []):
             api_id = api["id"]
@@ -249,8 +250,8 @@ def analyze_dynamodb_throttling(
     Returns:
         Dictionary with DynamoDB throttling analysis
     """
-    dynamodb_client = session.client("dynamodb", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    dynamodb_client = get_client(session, "dynamodb", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
     output_data = []
     
@@ -260,8 +261,8 @@ def analyze_dynamodb_throttling(
         # Get all tables
         tables_response = dynamodb_client.list_tables()
         
-        start_time = datetime.now() - timedelta(days=period)
         end_time = datetime.now()
+        start_time = end_time - timedelta(days=period)
         
         for table_name in tables_response.get("TableNames", []):
             # Check for throttled requests
@@ -328,8 +329,8 @@ def analyze_rds_performance_insights(
     Returns:
         Dictionary with RDS performance analysis
     """
-    rds_client = session.client("rds", region_name=region_name)
-    cloudwatch_client = session.client("cloudwatch", region_name=region_name)
+    rds_client = get_client(session, "rds", region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", region_name)
     
     output_data = []
     
@@ -339,8 +340,8 @@ def analyze_rds_performance_insights(
         # Get all DB instances
         paginator = rds_client.get_paginator("describe_db_instances")
         
-        start_time = datetime.now() - timedelta(days=period)
         end_time = datetime.now()
+        start_time = end_time - timedelta(days=period)
         
         for page in paginator.paginate():
             for db_instance in page["DBInstances"]:
@@ -409,8 +410,8 @@ def analyze_cloudfront_cache_hit_ratio(
     Returns:
         Dictionary with CloudFront cache analysis
     """
-    cloudfront_client = session.client("cloudfront", region_name="us-east-1")
-    cloudwatch_client = session.client("cloudwatch", region_name="us-east-1")
+    cloudfront_client = get_client(session, "cloudfront", "us-east-1")
+    cloudwatch_client = get_client(session, "cloudwatch", "us-east-1")
     
     output_data = []
     
@@ -420,8 +421,8 @@ def analyze_cloudfront_cache_hit_ratio(
         # Get all distributions
         paginator = cloudfront_client.get_paginator("list_distributions")
         
-        start_time = datetime.now() - timedelta(days=period)
         end_time = datetime.now()
+        start_time = end_time - timedelta(days=period)
         
         for page in paginator.paginate():
             for distribution in page.get("DistributionList", {}).get("Items", []):
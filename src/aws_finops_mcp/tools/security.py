@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from typing import Any
 import json
 
+from ..utils.aws_clients import get_client
 from ..utils.helpers import fields_to_headers
 
 logger = logging.getLogger(__name__)
@@ -22,7 +23,7 @@ def find_unencrypted_ebs_volumes(
     Returns:
         Dictionary with unencrypted EBS volumes
     """
-    ec2_client = session.client("ec2", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
     
     output_data = []
     
@@ -118,7 +119,7 @@ def find_unencrypted_s3_buckets(
     Returns:
         Dictionary with unencrypted S3 buckets
     """
-    s3_client = session.client("s3", region_name="us-east-1")
+    s3_client = get_client(session, "s3", "us-east-1")
     
     output_data = []
     
@@ -234,7 +235,7 @@ def find_unencrypted_rds_instances(
     Returns:
         Dictionary with unencrypted RDS instances
     """
-    rds_client = session.client("rds", region_name=region_name)
+    rds_client = get_client(session, "rds", region_name)
     
     output_data = []
     
@@ -338,7 +339,7 @@ def find_public_s3_buckets(
     Returns:
         Dictionary with public S3 buckets
     """
-    s3_client = session.client("s3", region_name="us-east-1")
+    s3_client = get_client(session, "s3", "us-east-1")
     
     output_data = []
     
@@ -459,7 +460,7 @@ def find_overly_permissive_security_groups(
     Returns:
         Dictionary with overly permissive security groups
     """
-    ec2_client = session.client("ec2", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
     
     output_data = []
     
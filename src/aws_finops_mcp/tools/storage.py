@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+from ..utils.aws_clients import get_client
 from ..utils.helpers import fields_to_headers
 
 logger = logging.getLogger(__name__)
@@ -22,11 +23,11 @@ def find_unused_s3_buckets(
     Returns:
         Dictionary with unused S3 buckets
     """
-    s3_client = session.client("s3")
-    cloudwatch_client = session.client("cloudwatch", region_name="us-east-1")  # S3 metrics in us-east-1
+    s3_client = get_client(session, "s3", session.region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", "us-east-1")  # S3 metrics in us-east-1
     
-    start_time = datetime.now() - timedelta(days=period)
     end_time = datetime.now()
+    start_time = end_time - timedelta(days=period)
     output_data = []
     
     logger.info("Finding unused S3 buckets")
@@ -222,9 +223,11 @@ def get_s3_storage_class_recommendations(
     Returns:
         Dictionary with storage class recommendations
     """
-    s3_client = session.client("s3")
-    cloudwatch_client = session.client("cloudwatch", region_name="us-east-1")
+    s3_client = get_client(session, "s3", session.region_name)
+    cloudwatch_client = get_client(session, "cloudwatch", "us-east-1")
     
+    end_time = datetime.now()
+    start_time = end_time - timedelta(days=1)
     output_data = []
     
     logger.info("Analyzing S3 storage class optimization opportunities")
@@ -238,9 +241,6 @@ def get_s3_storage_class_recommendations(
             
             try:
                 # Get bucket size
-                end_time = datetime.now()
-                start_time = end_time - timedelta(days=1)
-                
                 size_response = cloudwatch_client.get_metric_statistics(
                     Namespace="AWS/S3",
                     MetricName="BucketSizeBytes",
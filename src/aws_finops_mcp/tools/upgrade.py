@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+from ..utils.aws_clients import get_client
 from ..utils.helpers import fields_to_headers
 
 logger = logging.getLogger(__name__)
@@ -13,8 +14,8 @@ def find_asgs_with_old_amis(
     session: Any, region_name: str, period: int, max_results: int = 100
 ) -> dict[str, Any]:
     """Find Auto Scaling Groups using AMIs older than the specified period."""
-    ec2_client = session.client("ec2", region_name=region_name)
-    asg_client = session.client("autoscaling", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
+    asg_client = get_client(session, "autoscaling", region_name)
     
     cutoff_date = datetime.now() - timedelta(days=period)
     old_ami_asgs = []
@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+from ..utils.aws_clients import get_client
 from ..utils.helpers import fields_to_headers
 
 logger = logging.getLogger(__name__)
@@ -50,7 +51,7 @@ def find_outdated_lambda_runtimes(
     Returns:
         Dictionary with Lambda functions using outdated runtimes
     """
-    lambda_client = session.client("lambda", region_name=region_name)
+    lambda_client = get_client(session, "lambda", region_name)
     
     output_data = []
     
@@ -155,7 +156,7 @@ def find_ec2_instances_with_old_generations(
     Returns:
         Dictionary with EC2 instances using old generation types
     """
-    ec2_client = session.client("ec2", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
     
     output_data = []
     
@@ -254,7 +255,7 @@ def find_ebs_volumes_with_old_types(
     Returns:
         Dictionary with EBS volumes using old types
     """
-    ec2_client = session.client("ec2", region_name=region_name)
+    ec2_client = get_client(session, "ec2", region_name)
     
     output_data = []
     
@@ -376,7 +377,7 @@ def find_outdated_ecs_platform_versions(
     Returns:
         Dictionary with ECS services using outdated platform versions
     """
-    ecs_client = session.client("ecs", region_name=region_name)
+    ecs_client = get_client(session, "ecs", region_name)
     
     output_data = []
     
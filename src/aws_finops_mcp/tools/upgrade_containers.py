@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+from ..utils.aws_clients import get_client
 from ..utils.helpers import fields_to_headers
 
 logger = logging.getLogger(__name__)
@@ -21,7 +22,7 @@ def find_outdated_eks_cluster_versions(
     Returns:
         Dictionary with outdated EKS clusters
     """
-    eks_client = session.client("eks", region_name=region_name)
+    eks_client = get_client(session, "eks", region_name)
     
     output_data = []
     
@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+from ..utils.aws_clients import get_client
 from ..utils.helpers import fields_to_headers
 
 logger = logging.getLogger(__name__)
@@ -21,7 +22,7 @@ def find_outdated_rds_engine_versions(
     Returns:
         Dictionary with outdated RDS instances
     """
-    rds_client = session.client("rds", region_name=region_name)
+    rds_client = get_client(session, "rds", region_name)
     
     output_data = []
     
@@ -146,7 +147,7 @@ def find_outdated_elasticache_engine_versions(
     Returns:
         Dictionary with outdated ElastiCache clusters
     """
-    elasticache_client = session.client("elasticache", region_name=region_name)
+    elasticache_client = get_client(session, "elasticache", region_name)
     
     output_data = []
     
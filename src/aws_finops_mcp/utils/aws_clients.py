@@ -0,0 +1,76 @@
+"""Shared boto3 client construction."""
+
+import threading
+import weakref
+from typing import Any
+
+from botocore.config import Config
+
+# Room for concurrent calls on one client, with adaptive backoff when throttled.
+# Request bodies over 1 KiB are gzipped for operations that accept compression.
+DEFAULT_CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    retries={"mode": "adaptive", "max_attempts": 10},
+    tcp_keepalive=True,
+    request_min_compression_size_bytes=1024,
+)
+
+# Clients are cached per session so they are released together with it
+_clients: "weakref.WeakKeyDictionary[Any, dict[tuple[str, str, Any], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+
+
+def get_client(session: Any, service: str, region: str, config: Any = None) -> Any:
+    """Return a boto3 client, reusing one already built for this session.
+
+    Building a client loads the service model and endpoint data, so tools
+    that call the same service several times with one session share it.
+
+    Args:
+        session: Boto3 session
+        service: AWS service name (e.g. "ce")
+        region: AWS region name
+        config: botocore Config for the client (default: DEFAULT_CLIENT_CONFIG)
+
+    Returns:
+        Boto3 client for the service and region
+    """
+    key = (service, region, config)
+
+    with _lock:
+        session_clients = _clients.setdefault(session, {})
+        client = session_clients.get(key)
+        if client is None:
+            client = session.client(
+                service, region_name=region, config=config or DEFAULT_CLIENT_CONFIG
+            )
+            session_clients[key] = client
+
+    return client
+
+
+# Account IDs never change for a session, so they are looked up once
+_account_ids: "weakref.WeakKeyDictionary[Any, str]" = weakref.WeakKeyDictionary()
+
+
+def get_account_id(session: Any) -> str:
+    """Return the AWS account ID the session's credentials belong to.
+
+    Args:
+        session: Boto3 session
+
+    Returns:
+        12-digit AWS account ID
+    """
+    with _lock:
+        account_id = _account_ids.get(session)
+    if account_id is not None:
+        return account_id
+
+    account_id = get_client(session, "sts", "us-east-1").get_caller_identity()["Account"]
+
+    with _lock:
+        _account_ids[session] = account_id
+    return account_id
@@ -0,0 +1,137 @@
+"""On-disk TTL cache for results of paid AWS API calls.
+
+Cost Explorer bills every request and its data only refreshes about once a
+day, so repeated tool calls within the TTL are served from JSON files under
+MCP_CACHE_DIR (default: ~/.cache/aws-finops-mcp). Set MCP_CACHE_TTL to the
+lifetime in seconds (default: 86400), or to 0 to disable caching.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+from .aws_clients import get_account_id
+from .serialization import dumps_json, loads_json
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+DEFAULT_CACHE_TTL = 86400
+
+
+def _cache_dir() -> Path:
+    """Get the directory cache entries are stored in."""
+    return Path(
+        os.getenv("MCP_CACHE_DIR", Path.home() / ".cache" / "aws-finops-mcp")
+    ).expanduser()
+
+
+def cache_ttl() -> int:
+    """Get the cache lifetime in seconds (0 disables the cache)."""
+    try:
+        return int(os.getenv("MCP_CACHE_TTL", str(DEFAULT_CACHE_TTL)))
+    except ValueError:
+        return DEFAULT_CACHE_TTL
+
+
+def cache_key(name: str, account_id: str, args: tuple, kwargs: dict[str, Any]) -> str:
+    """Build a stable cache key for a function call.
+
+    Args:
+        name: Fully qualified function name
+        account_id: AWS account the call is made against
+        args: Positional arguments (excluding the session)
+        kwargs: Keyword arguments
+
+    Returns:
+        Hex digest identifying the call
+    """
+    payload = json.dumps(
+        {"fn": name, "account": account_id, "args": args, "kwargs": kwargs},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=20).hexdigest()
+
+
+def read_cache(key: str) -> Any | None:
+    """Return the cached value for key, or None if missing or expired."""
+    path = _cache_dir() / f"{key}.json"
+    try:
+        entry = loads_json(path.read_bytes())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+        return None
+
+    if entry.get("expires", 0) < time.time():
+        return None
+    return entry.get("value")
+
+
+def write_cache(key: str, value: Any, ttl: int) -> None:
+    """Store value under key for ttl seconds (errors are logged, not raised)."""
+    directory = _cache_dir()
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial entry
+        with tempfile.NamedTemporaryFile("wb", dir=directory, suffix=".tmp", delete=False) as f:
+            f.write(dumps_json({"expires": time.time() + ttl, "value": value}))
+        os.replace(f.name, directory / f"{key}.json")
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Could not write cache entry {key}: {e}")
+
+
+def disk_cached(func: F) -> F:
+    """Cache a session-based tool function's result on disk.
+
+    The decorated function gains a bust_cache keyword argument that skips the
+    cached value and stores a fresh one. Calls are keyed on the function, the
+    session's AWS account and the remaining arguments. Results that report
+    failed sub-queries under a non-empty failed_queries key are returned but
+    not stored, so one throttled call does not hide data for a whole TTL.
+
+    Args:
+        func: Function taking a boto3 session as its first argument
+
+    Returns:
+        Wrapped function
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(session: Any, *args: Any, bust_cache: bool = False, **kwargs: Any) -> Any:
+        ttl = cache_ttl()
+        if ttl <= 0:
+            return func(session, *args, **kwargs)
+
+        try:
+            key = cache_key(name, get_account_id(session), args, kwargs)
+        except Exception as e:
+            logger.warning(f"Caching disabled for {func.__name__}: {e}")
+            return func(session, *args, **kwargs)
+
+        if not bust_cache:
+            cached = read_cache(key)
+            if cached is not None:
+                logger.info(f"Using cached result for {func.__name__}")
+                return cached
+
+        result = func(session, *args, **kwargs)
+        if isinstance(result, dict) and result.get("failed_queries"):
+            logger.info(f"Not caching partial result for {func.__name__}")
+            return result
+
+        write_cache(key, result, ttl)
+        return result
+
+    return wrapper  # type: ignore[return-value]
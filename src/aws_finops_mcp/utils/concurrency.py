@@ -0,0 +1,92 @@
+"""Concurrency helpers for overlapping AWS API calls with processing."""
+
+import queue
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Enough to hide API round-trip latency without tripping throttling limits
+DEFAULT_MAX_WORKERS = 16
+
+# Marks the end of the producer's output (paired with an optional exception)
+_DONE = object()
+
+
+def prefetch(iterable: Iterable[T], depth: int = 1) -> Iterator[T]:
+    """Iterate in a background thread, staying up to depth items ahead.
+
+    Wrapping a boto3 page iterator lets the next request be in flight while
+    the caller processes the current page. Exceptions raised by the
+    underlying iterator are re-raised in the consumer.
+
+    Args:
+        iterable: Iterable to consume (e.g. a boto3 PageIterator)
+        depth: Maximum number of items buffered ahead of the consumer
+
+    Returns:
+        Iterator over the same items, in the same order
+    """
+    buffer: queue.Queue[tuple[Any, BaseException | None]] = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(entry: tuple[Any, BaseException | None]) -> bool:
+        # Poll so the producer exits if the consumer stops iterating early
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except Exception as e:
+            put((_DONE, e))
+            return
+        put((_DONE, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def thread_map(
+    func: Callable[[T], R], items: Iterable[T], max_workers: int = DEFAULT_MAX_WORKERS
+) -> list[R]:
+    """Apply func to every item on a thread pool, preserving order.
+
+    Intended for I/O-bound boto3 calls: clients are thread-safe, so one
+    client can be shared by every worker.
+
+    Args:
+        func: Function to call for each item
+        items: Inputs to func
+        max_workers: Maximum number of concurrent calls
+
+    Returns:
+        Results of func, in the same order as items
+    """
+    items = list(items)
+    if len(items) <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
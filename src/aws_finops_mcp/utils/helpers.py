@@ -1,6 +1,7 @@
 """Helper functions for AWS FinOps operations."""
 
 import re
+from collections.abc import Callable, Iterator
 from typing import Any
 
 
@@ -85,3 +86,30 @@ def safe_float(value: Any, default: float = 0.0) -> float:
         return float(value)
     except (ValueError, TypeError):
         return default
+
+
+def iter_token_pages(
+    operation: Callable[..., dict[str, Any]], token_key: str = "NextPageToken", **params: Any
+) -> Iterator[dict[str, Any]]:
+    """Yield every page of an API call that is paginated with a next-page token.
+    
+    For operations without a boto3 paginator (e.g. Cost Explorer's
+    get_cost_and_usage), the token from each response is passed back in the
+    next request until the API stops returning one.
+    
+    Args:
+        operation: Bound client method (e.g. ce_client.get_cost_and_usage)
+        token_key: Name of the token in both the request and the response
+        **params: Request parameters
+        
+    Returns:
+        Iterator over the raw responses
+    """
+    while True:
+        response = operation(**params)
+        yield response
+        
+        token = response.get(token_key)
+        if not token:
+            return
+        params[token_key] = token
@@ -1,8 +1,10 @@
 """CloudWatch metrics utilities."""
 
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Any
 
+from .concurrency import thread_map
+
 
 def calculate_metrics(datapoints: list[dict[str, Any]]) -> tuple[str, str, str]:
     """Calculate average, minimum, and maximum from CloudWatch datapoints.
@@ -80,3 +82,118 @@ def get_metric_statistics(
         Statistics=["Average", "Minimum", "Maximum"],
     )
     return response.get("Datapoints", [])
+
+
+# Largest number of queries GetMetricData accepts in one request
+MAX_METRIC_DATA_QUERIES = 500
+
+# ListMetrics only returns metrics that received data within this window
+LIST_METRICS_WINDOW = timedelta(days=14)
+
+
+def metric_stat_query(
+    query_id: str,
+    namespace: str,
+    metric_name: str,
+    dimensions: list[dict[str, str]],
+    stat: str,
+    period: int = 86400,
+) -> dict[str, Any]:
+    """Build a GetMetricData query for a single metric statistic.
+    
+    Args:
+        query_id: Query ID (must start with a lowercase letter)
+        namespace: CloudWatch namespace
+        metric_name: Metric name
+        dimensions: List of dimension dictionaries
+        stat: Statistic to return (e.g. "Sum", "Average")
+        period: Period in seconds (default: 86400 = 1 day)
+        
+    Returns:
+        MetricDataQuery dictionary
+    """
+    return {
+        "Id": query_id,
+        "MetricStat": {
+            "Metric": {
+                "Namespace": namespace,
+                "MetricName": metric_name,
+                "Dimensions": dimensions,
+            },
+            "Period": period,
+            "Stat": stat,
+        },
+        "ReturnData": True,
+    }
+
+
+def get_metric_data_values(
+    cloudwatch_client: Any,
+    queries: list[dict[str, Any]],
+    start_time: datetime,
+    end_time: datetime,
+) -> dict[str, list[float]]:
+    """Run GetMetricData queries in batches and collect the values per query.
+    
+    Queries are sent in chunks of MAX_METRIC_DATA_QUERIES and every page of
+    each chunk is read, so one request replaces up to 500
+    get_metric_statistics calls. Chunks are fetched concurrently.
+    
+    Args:
+        cloudwatch_client: Boto3 CloudWatch client
+        queries: MetricDataQuery dictionaries (see metric_stat_query)
+        start_time: Start time for metrics
+        end_time: End time for metrics
+        
+    Returns:
+        Dictionary mapping each query ID to its datapoint values
+    """
+    paginator = cloudwatch_client.get_paginator("get_metric_data")
+    
+    def fetch(chunk: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        pages = paginator.paginate(
+            MetricDataQueries=chunk,
+            StartTime=start_time,
+            EndTime=end_time,
+        )
+        return [result for page in pages for result in page["MetricDataResults"]]
+    
+    chunks = [
+        queries[offset:offset + MAX_METRIC_DATA_QUERIES]
+        for offset in range(0, len(queries), MAX_METRIC_DATA_QUERIES)
+    ]
+    
+    values: dict[str, list[float]] = {query["Id"]: [] for query in queries}
+    for results in thread_map(fetch, chunks):
+        for result in results:
+            values[result["Id"]].extend(result["Values"])
+    
+    return values
+
+
+def list_metric_dimension_values(
+    cloudwatch_client: Any, namespace: str, metric_name: str, dimension_name: str
+) -> set[str]:
+    """Get the values of a dimension for which a metric has recent data.
+    
+    ListMetrics only covers the last LIST_METRICS_WINDOW, so a resource
+    missing from the result can only be treated as idle for lookback
+    periods no longer than that.
+    
+    Args:
+        cloudwatch_client: Boto3 CloudWatch client
+        namespace: CloudWatch namespace
+        metric_name: Metric name
+        dimension_name: Dimension identifying the resource (e.g. "QueueName")
+        
+    Returns:
+        Dimension values that have datapoints for the metric
+    """
+    paginator = cloudwatch_client.get_paginator("list_metrics")
+    return {
+        dimension["Value"]
+        for page in paginator.paginate(Namespace=namespace, MetricName=metric_name)
+        for metric in page["Metrics"]
+        for dimension in metric.get("Dimensions", [])
+        if dimension["Name"] == dimension_name
+    }
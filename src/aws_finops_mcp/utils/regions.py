@@ -0,0 +1,131 @@
+"""Helpers for running region-scoped tools across several regions."""
+
+import logging
+from collections.abc import Callable, Iterable
+from math import fsum
+from typing import Any
+
+from .aws_clients import get_client
+from .concurrency import thread_map
+from .helpers import fields_to_headers
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on regions scanned at once; each region has its own clients
+MAX_REGION_WORKERS = 32
+
+
+def get_enabled_regions(session: Any) -> list[str]:
+    """Get the regions enabled for the session's account.
+
+    Args:
+        session: Boto3 session
+
+    Returns:
+        Region names, excluding opt-in regions that are not enabled
+    """
+    ec2_client = get_client(session, "ec2", "us-east-1")
+    return [region["RegionName"] for region in ec2_client.describe_regions()["Regions"]]
+
+
+def _merge_region_results(
+    regions: list[str], results: list[dict[str, Any]]
+) -> dict[str, Any]:
+    """Merge per-region tool results into one result with a Region column.
+
+    Counts are added together, as are top-level dollar totals such as
+    total_monthly_cost; other top-level values are taken from the first result.
+
+    Args:
+        regions: Region names, in the same order as results
+        results: Results returned by the tool for each region
+
+    Returns:
+        Combined result dictionary
+    """
+    merged = dict(results[0])
+    fields = {
+        str(index): name
+        for index, name in enumerate(("Region", *results[0]["fields"].values()), start=1)
+    }
+
+    merged["fields"] = fields
+    merged["headers"] = fields_to_headers(fields)
+    merged["resource"] = [
+        {"Region": region, **row}
+        for region, result in zip(regions, results)
+        for row in result["resource"]
+    ]
+    merged["count"] = len(merged["resource"])
+
+    for key, value in results[0].items():
+        if isinstance(value, str) and value.startswith("$"):
+            total = fsum(float(result[key][1:].replace(",", "")) for result in results)
+            merged[key] = f"${total:.2f}"
+
+    return merged
+
+
+def run_across_regions(
+    func: Callable[..., dict[str, Any]],
+    session: Any,
+    regions: Iterable[str] | None = None,
+    *args: Any,
+    **kwargs: Any,
+) -> dict[str, Any]:
+    """Run a region-scoped tool in several regions concurrently.
+
+    Each region is scanned on its own thread, so the wall time is that of
+    the slowest region rather than the sum of all of them. A region that
+    raises is logged and reported instead of failing the whole run.
+
+    Args:
+        func: Tool function taking (session, region_name, ...)
+        session: Boto3 session
+        regions: Region names to scan (default: all enabled regions)
+        *args: Extra positional arguments passed to func
+        **kwargs: Extra keyword arguments passed to func
+
+    Returns:
+        Combined result with a Region column prepended to each row, plus a
+        failed_regions mapping of region name to error for regions that
+        raised
+
+    Raises:
+        Exception: The first region's error if every region failed
+    """
+    regions = list(regions) if regions is not None else get_enabled_regions(session)
+    if not regions:
+        raise ValueError("At least one region is required")
+
+    logger.info(f"Running {func.__name__} across {len(regions)} regions")
+
+    def run_region(region: str) -> tuple[dict[str, Any] | None, Exception | None]:
+        # One region failing (e.g. an SCP denying it) must not discard the rest
+        try:
+            return func(session, region, *args, **kwargs), None
+        except Exception as e:
+            logger.error(f"{func.__name__} failed in {region}: {e}")
+            return None, e
+
+    outcomes = thread_map(run_region, regions, max_workers=MAX_REGION_WORKERS)
+
+    succeeded = [
+        (region, result)
+        for region, (result, _) in zip(regions, outcomes)
+        if result is not None
+    ]
+    failed_regions = {
+        region: str(error)
+        for region, (_, error) in zip(regions, outcomes)
+        if error is not None
+    }
+    if not succeeded:
+        # Nothing to merge; surface the first region's error as the tools do
+        raise outcomes[0][1]
+
+    merged = _merge_region_results(
+        [region for region, _ in succeeded], [result for _, result in succeeded]
+    )
+    merged["failed_regions"] = failed_regions
+    return merged
@@ -0,0 +1,54 @@
+"""JSON serialization helpers for tool responses and cached results.
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise, so orjson stays an optional speed-up rather than a requirement.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Serialize values the standard library encoder does not understand."""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def dumps_json(data: Any, indent: bool = False) -> bytes:
+    """Serialize data to UTF-8 encoded JSON.
+
+    Args:
+        data: JSON-compatible data (datetimes are written in ISO 8601 format)
+        indent: Pretty-print with two-space indentation
+
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_default, option=option)
+
+    return json.dumps(data, indent=2 if indent else None, default=_default).encode()
+
+
+def loads_json(data: bytes | str) -> Any:
+    """Deserialize a JSON document.
+
+    Args:
+        data: Encoded JSON document
+
+    Returns:
+        Decoded data
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
@@ -0,0 +1,59 @@
+"""Short-lived cache of Resource Groups Tagging API inventories.
+
+Several governance tools read the same get_resources inventory, so the
+resource tag mappings for an account and region are kept on disk for a few
+minutes and shared between them. Entries live next to the other cached
+results (see utils.cache) and MCP_CACHE_TTL=0 disables this cache as well.
+"""
+
+import logging
+from typing import Any
+
+from .aws_clients import get_account_id, get_client
+from .cache import cache_key, cache_ttl, read_cache, write_cache
+
+logger = logging.getLogger(__name__)
+
+# Tag inventories change as resources are created, so they are kept briefly
+DEFAULT_TAGGING_CACHE_TTL = 300
+
+
+def get_all_tagged_resources(
+    session: Any, region_name: str, ttl: int = DEFAULT_TAGGING_CACHE_TTL
+) -> list[dict[str, Any]]:
+    """Get every resource tag mapping in a region, reusing a recent scan.
+
+    Args:
+        session: Boto3 session
+        region_name: AWS region name
+        ttl: Lifetime of the cached inventory in seconds
+
+    Returns:
+        ResourceTagMappingList entries from all get_resources pages
+    """
+    key = None
+    if ttl > 0 and cache_ttl() > 0:
+        try:
+            key = cache_key(
+                "tagged_resources", get_account_id(session), (region_name,), {}
+            )
+        except Exception as e:
+            logger.warning(f"Caching disabled for tagged resources: {e}")
+
+    if key is not None:
+        cached = read_cache(key)
+        if cached is not None:
+            logger.info(f"Using cached tagged resources for {region_name}")
+            return cached
+
+    tagging_client = get_client(session, "resourcegroupstaggingapi", region_name)
+    paginator = tagging_client.get_paginator("get_resources")
+    resources = [
+        resource
+        for page in paginator.paginate(PaginationConfig={"PageSize": 100})
+        for resource in page.get("ResourceTagMappingList", [])
+    ]
+
+    if key is not None:
+        write_cache(key, resources, ttl)
+    return resources
@@ -0,0 +1,35 @@
+"""Tests for shared boto3 client construction."""
+
+from unittest.mock import Mock
+
+from aws_finops_mcp.utils.aws_clients import DEFAULT_CLIENT_CONFIG, get_client
+
+
+def test_get_client_reuses_client_per_session():
+    """Test that a session builds each service/region client once."""
+    session = Mock()
+    session.client.side_effect = lambda *args, **kwargs: Mock()
+
+    first = get_client(session, "ce", "us-east-1")
+    second = get_client(session, "ce", "us-east-1")
+    other_region = get_client(session, "ce", "eu-west-1")
+
+    assert first is second
+    assert other_region is not first
+    assert session.client.call_count == 2
+
+
+def test_get_client_is_scoped_to_session():
+    """Test that clients are not shared between sessions."""
+    session_a = Mock()
+    session_b = Mock()
+
+    get_client(session_a, "ce", "us-east-1")
+    get_client(session_b, "ce", "us-east-1")
+
+    session_a.client.assert_called_once_with(
+        "ce", region_name="us-east-1", config=DEFAULT_CLIENT_CONFIG
+    )
+    session_b.client.assert_called_once_with(
+        "ce", region_name="us-east-1", config=DEFAULT_CLIENT_CONFIG
+    )
@@ -0,0 +1,90 @@
+"""Tests for the on-disk result cache."""
+
+from unittest.mock import Mock, patch
+
+from aws_finops_mcp.utils.cache import disk_cached
+
+
+def _cached_tool():
+    """Create a cached tool whose calls are counted by a mock."""
+    impl = Mock(side_effect=lambda session, region_name: {"region": region_name})
+
+    @disk_cached
+    def tool(session, region_name):
+        return impl(session, region_name)
+
+    return tool, impl
+
+
+def test_disk_cached_reuses_result(tmp_path, monkeypatch):
+    """Test that a repeated call is served from the cache."""
+    monkeypatch.setenv("MCP_CACHE_DIR", str(tmp_path))
+    tool, impl = _cached_tool()
+
+    with patch("aws_finops_mcp.utils.cache.get_account_id", return_value="123456789012"):
+        assert tool(Mock(), "us-east-1") == {"region": "us-east-1"}
+        assert tool(Mock(), "us-east-1") == {"region": "us-east-1"}
+        tool(Mock(), "eu-west-1")
+
+    assert impl.call_count == 2
+
+
+def test_disk_cached_bust_cache_and_ttl(tmp_path, monkeypatch):
+    """Test that bust_cache and a zero TTL bypass the cache."""
+    monkeypatch.setenv("MCP_CACHE_DIR", str(tmp_path))
+    tool, impl = _cached_tool()
+
+    with patch("aws_finops_mcp.utils.cache.get_account_id", return_value="123456789012"):
+        tool(Mock(), "us-east-1")
+        tool(Mock(), "us-east-1", bust_cache=True)
+        monkeypatch.setenv("MCP_CACHE_TTL", "0")
+        tool(Mock(), "us-east-1")
+
+    assert impl.call_count == 3
+
+
+def test_disk_cached_skips_failed_queries(tmp_path, monkeypatch):
+    """Test that a result with failed sub-queries is not cached."""
+    monkeypatch.setenv("MCP_CACHE_DIR", str(tmp_path))
+    impl = Mock(side_effect=[
+        {"resource": [], "failed_queries": {"COMPUTE_SP": "Throttling"}},
+        {"resource": [1], "failed_queries": {}},
+    ])
+
+    @disk_cached
+    def tool(session, region_name):
+        return impl(session, region_name)
+
+    with patch("aws_finops_mcp.utils.cache.get_account_id", return_value="123456789012"):
+        assert tool(Mock(), "us-east-1")["failed_queries"] == {"COMPUTE_SP": "Throttling"}
+        assert tool(Mock(), "us-east-1")["resource"] == [1]
+        assert tool(Mock(), "us-east-1")["resource"] == [1]
+
+    assert impl.call_count == 2
+
+
+def test_savings_plans_failed_type_not_cached(tmp_path, monkeypatch):
+    """Test that a failed Savings Plans type query is retried on the next call."""
+    from aws_finops_mcp.tools.cost_savings import get_savings_plans_recommendations
+
+    monkeypatch.setenv("MCP_CACHE_DIR", str(tmp_path))
+    session = Mock()
+    recommend = session.client.return_value.get_savings_plans_purchase_recommendation
+    throttled = {"COMPUTE_SP"}
+
+    def purchase_recommendation(SavingsPlansType, **kwargs):
+        if SavingsPlansType in throttled:
+            raise RuntimeError("Throttling")
+        return {}
+
+    recommend.side_effect = purchase_recommendation
+
+    with patch("aws_finops_mcp.utils.cache.get_account_id", return_value="123456789012"):
+        first = get_savings_plans_recommendations(session)
+        throttled.clear()
+        second = get_savings_plans_recommendations(session)
+        third = get_savings_plans_recommendations(session)
+
+    assert first["failed_queries"] == {"COMPUTE_SP": "Throttling"}
+    assert second["failed_queries"] == third["failed_queries"] == {}
+    assert recommend.call_count == 6
@@ -0,0 +1,27 @@
+"""Tests for concurrency helpers."""
+
+import pytest
+
+from aws_finops_mcp.utils.concurrency import prefetch, thread_map
+
+
+def test_prefetch_preserves_order():
+    """Test that prefetched items are yielded in order."""
+    assert list(prefetch(range(10), depth=2)) == list(range(10))
+
+
+def test_prefetch_reraises_errors():
+    """Test that errors from the source iterator reach the consumer."""
+    def pages():
+        yield {"items": [1]}
+        raise RuntimeError("throttled")
+
+    iterator = prefetch(pages())
+    assert next(iterator) == {"items": [1]}
+    with pytest.raises(RuntimeError, match="throttled"):
+        next(iterator)
+
+
+def test_thread_map_preserves_order():
+    """Test that thread_map returns results in input order."""
+    assert thread_map(lambda x: x * 2, range(20), max_workers=4) == [x * 2 for x in range(20)]
@@ -0,0 +1,59 @@
+"""Tests for multi-region helpers."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from aws_finops_mcp.utils.regions import run_across_regions
+
+
+def fake_tool(session, region_name, scale=1):
+    """Return one row per region with a regional cost."""
+    cost = len(region_name) * scale
+    return {
+        "id": 999,
+        "name": "Fake Tool",
+        "fields": {"1": "ResourceId", "2": "Cost"},
+        "headers": {},
+        "count": 1,
+        "total_monthly_cost": f"${cost:.2f}",
+        "resource": [{"ResourceId": f"r-{region_name}", "Cost": cost}],
+    }
+
+
+def test_run_across_regions_merges_results():
+    """Test that rows, counts and dollar totals are combined in region order."""
+    result = run_across_regions(fake_tool, MagicMock(), ["us-east-1", "eu-west-1"], scale=2)
+
+    assert result["count"] == 2
+    assert [row["Region"] for row in result["resource"]] == ["us-east-1", "eu-west-1"]
+    assert result["fields"] == {"1": "Region", "2": "ResourceId", "3": "Cost"}
+    assert result["total_monthly_cost"] == "$36.00"
+
+
+def test_run_across_regions_requires_regions():
+    """Test that an empty region list is rejected."""
+    with pytest.raises(ValueError):
+        run_across_regions(fake_tool, MagicMock(), [])
+
+
+def test_run_across_regions_reports_failed_regions():
+    """Test that a failing region is reported without losing the others."""
+    def flaky_tool(session, region_name):
+        if region_name == "eu-west-1":
+            raise RuntimeError("AccessDenied")
+        return fake_tool(session, region_name)
+
+    result = run_across_regions(flaky_tool, MagicMock(), ["us-east-1", "eu-west-1"])
+
+    assert [row["Region"] for row in result["resource"]] == ["us-east-1"]
+    assert result["failed_regions"] == {"eu-west-1": "AccessDenied"}
+
+
+def test_run_across_regions_raises_when_all_regions_fail():
+    """Test that the error is raised when no region succeeds."""
+    def failing_tool(session, region_name):
+        raise RuntimeError("AccessDenied")
+
+    with pytest.raises(RuntimeError):
+        run_across_regions(failing_tool, MagicMock(), ["us-east-1"])
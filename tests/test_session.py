@@ -2,9 +2,18 @@
 
 import pytest
 from unittest.mock import Mock, patch
+from aws_finops_mcp import session as session_module
 from aws_finops_mcp.session import get_aws_session
 
 
+@pytest.fixture(autouse=True)
+def clear_shared_sessions():
+    """Keep shared sessions from leaking between tests."""
+    session_module._shared_sessions.clear()
+    yield
+    session_module._shared_sessions.clear()
+
+
 def test_get_aws_session_with_profile():
     """Test session creation with profile name."""
     with patch("boto3.Session") as mock_session:
@@ -51,3 +60,30 @@ def test_get_aws_session_default():
     with patch("boto3.Session") as mock_session:
         get_aws_session(region_name="ap-southeast-1")
         mock_session.assert_called_once_with(region_name="ap-southeast-1")
+
+
+def _session_with_key(access_key):
+    """Create a mock session whose credentials resolve to access_key."""
+    session = Mock()
+    session.get_credentials.return_value.get_frozen_credentials.return_value.access_key = access_key
+    return session
+
+
+def test_get_aws_session_reuses_profile_session():
+    """Test that repeated profile lookups with unchanged credentials share one session."""
+    with patch("boto3.Session", side_effect=[_session_with_key("AKIA1"), _session_with_key("AKIA1")]):
+        first = get_aws_session(profile_name="shared-profile", region_name="us-east-2")
+        second = get_aws_session(profile_name="shared-profile", region_name="us-east-2")
+
+    assert first is second
+
+
+def test_get_aws_session_replaces_session_after_rotation():
+    """Test that a changed access key gets a new session."""
+    rotated = _session_with_key("AKIA2")
+    with patch("boto3.Session", side_effect=[_session_with_key("AKIA1"), rotated]):
+        first = get_aws_session(region_name="us-east-2")
+        second = get_aws_session(region_name="us-east-2")
+
+    assert first is not second
+    assert second is rotated
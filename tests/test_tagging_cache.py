@@ -0,0 +1,42 @@
+"""Tests for the shared tagged resource inventory cache."""
+
+from unittest.mock import Mock, patch
+
+from aws_finops_mcp.utils.tagging_cache import get_all_tagged_resources
+
+
+def _session():
+    """Create a session whose tagging client returns two pages of resources."""
+    session = Mock()
+    paginator = session.client.return_value.get_paginator.return_value
+    paginator.paginate.return_value = [
+        {"ResourceTagMappingList": [{"ResourceARN": "arn:aws:s3:::a", "Tags": []}]},
+        {"ResourceTagMappingList": [{"ResourceARN": "arn:aws:s3:::b", "Tags": []}]},
+    ]
+    return session, paginator
+
+
+def test_get_all_tagged_resources_reuses_scan(tmp_path, monkeypatch):
+    """Test that a second lookup in the same account and region is cached."""
+    monkeypatch.setenv("MCP_CACHE_DIR", str(tmp_path))
+    session, paginator = _session()
+
+    with patch("aws_finops_mcp.utils.tagging_cache.get_account_id", return_value="123456789012"):
+        first = get_all_tagged_resources(session, "us-east-1")
+        second = get_all_tagged_resources(Mock(), "us-east-1")
+
+    assert [resource["ResourceARN"] for resource in first] == ["arn:aws:s3:::a", "arn:aws:s3:::b"]
+    assert second == first
+    assert paginator.paginate.call_count == 1
+
+
+def test_get_all_tagged_resources_zero_ttl(tmp_path, monkeypatch):
+    """Test that a zero TTL always scans."""
+    monkeypatch.setenv("MCP_CACHE_DIR", str(tmp_path))
+    session, paginator = _session()
+
+    with patch("aws_finops_mcp.utils.tagging_cache.get_account_id", return_value="123456789012"):
+        get_all_tagged_resources(session, "us-east-1", ttl=0)
+        get_all_tagged_resources(session, "us-east-1", ttl=0)
+
+    assert paginator.paginate.call_count == 2